@@ -0,0 +1 @@
+# benchmarks/__init__.py - Headless benchmarks (Agg backend, no Kivy)
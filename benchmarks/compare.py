@@ -0,0 +1,68 @@
+# benchmarks/compare.py - Compare two benchmarks.run result files
+"""
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 0.10]
+
+Matches benchmarks by name, sample count and parameters and prints the
+best times side by side. Exits with 1 when any benchmark is slower than
+the baseline by more than --threshold (a fraction), so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def key(entry):
+    return entry["name"], entry["samples"], json.dumps(entry.get("params", {}), sort_keys=True)
+
+
+def compare(baseline, candidate, threshold=0.10):
+    """(rows, regressions); a row is (key, baseline s, candidate s, ratio) for shared benchmarks"""
+    before = {key(e): e["min_s"] for e in baseline["results"]}
+    rows = []
+    regressions = []
+    for entry in candidate["results"]:
+        k = key(entry)
+        if k not in before:
+            continue
+        old, new = before[k], entry["min_s"]
+        ratio = new / old if old > 0 else float("inf")
+        rows.append((k, old, new, ratio))
+        if ratio > 1 + threshold:
+            regressions.append(k)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare",
+                                     description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slow-down fraction reported as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    rows, regressions = compare(baseline, candidate, args.threshold)
+
+    print(f"baseline {baseline['meta'].get('commit')}  candidate {candidate['meta'].get('commit')}")
+    print(f"{'benchmark':<28} {'samples':>10} {'params':<14} {'before':>10} {'after':>10} {'ratio':>7}")
+    for k, old, new, ratio in rows:
+        name, samples, params = k
+        params = " ".join(f"{p}={v}" for p, v in json.loads(params).items())
+        flag = "  slower" if k in regressions else ""
+        print(f"{name:<28} {samples:>10,} {params:<14} {old:10.4f} {new:10.4f} {ratio:6.2f}x{flag}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmarks slower than the baseline by more than "
+              f"{args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# benchmarks/parallel_export.py - PDF export time against worker process count
+"""
+    python -m benchmarks.parallel_export [--samples N] [--page-meters M] [--workers 1,2,4]
+
+Renders the same depth-paginated report with 1..N worker processes and
+prints the wall time and speed-up of each run.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")
+
+from benchmarks.synthetic_las import synthetic_frame
+
+
+def synthetic_report(samples, null_fraction=0.0, seed=0):
+    """ReportData for a synthetic well with every track of the reservoir screen"""
+    from utils.batch import BATCH_TRACKS, interpret
+    from utils.report_renderer import ReportData
+
+    df = synthetic_frame(samples, null_fraction=null_fraction, seed=seed)
+    cut_off, intervals, curves = interpret(df)
+    return ReportData(df, BATCH_TRACKS, intervals, cut_off, curves=curves,
+                      params={"m": 2.0, "n": 2.0})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.parallel_export",
+                                     description="PDF export time against worker count")
+    parser.add_argument("--samples", type=int, default=50_000)
+    parser.add_argument("--page-meters", type=float, default=100)
+    parser.add_argument("--workers", default=None,
+                        help="comma-separated worker counts (default: 1, 2, 4, ... up to the CPU count)")
+    args = parser.parse_args(argv)
+
+    from utils.report_parallel import render_report_parallel
+
+    if args.workers:
+        counts = [int(w) for w in args.workers.split(",")]
+    else:
+        cpus = os.cpu_count() or 1
+        counts = sorted({1, cpus} | {2 ** k for k in range(1, cpus.bit_length()) if 2 ** k <= cpus})
+
+    report = synthetic_report(args.samples)
+    well_info = {"well_name": "Synthetic", "location": "-", "depth_range": "-"}
+    print(f"{args.samples} samples, {args.page_meters:g} m pages, {os.cpu_count()} CPUs")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in counts:
+            stats = render_report_parallel(os.path.join(tmp, f"report_{workers}.pdf"), report,
+                                           well_info, workers=workers,
+                                           page_meters=args.page_meters)
+            baseline = baseline or stats["seconds"]
+            print(f"  {workers:3d} workers: {stats['pages']} pages in {stats['seconds']:7.2f} s"
+                  f"  speed-up {baseline / stats['seconds']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+# benchmarks/run.py - Timed micro-benchmarks of the parse, compute, render and export paths
+"""
+    python -m benchmarks.run [--sizes 1000,100000,1000000] [--repeat 3]
+        [--only parse,compute] [--null-fraction 0.02] [--out results.json]
+        [--cache-dir DIR | --no-cache]
+
+Every benchmark runs on the same deterministic synthetic well
+(benchmarks.synthetic_las) for each sample count and reports the best,
+median and mean of --repeat runs. Results are written as JSON with the
+git commit and library versions, for benchmarks.compare to diff two runs.
+Runs headless: matplotlib is forced onto the Agg backend. The parsed-LAS
+cache lives in the run's temporary directory, or in a temporary
+subdirectory of --cache-dir, so benchmarks never fill or empty the
+user's cache.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+
+from benchmarks.synthetic_las import synthetic_frame, write_las
+
+GROUPS = ["parse", "compute", "render", "export"]
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+# Same scale as the reservoir screen, which draws every track
+PIXELS_PER_METER = 1.8
+
+
+# ========== TIMING ==========
+
+@contextlib.contextmanager
+def quiet():
+    """Keep parse output out of the results: read_las_file and friends print
+    progress, and lasio logs a warning for every wrapped file"""
+    lasio_logger = logging.getLogger("lasio")
+    level = lasio_logger.level
+    lasio_logger.setLevel(logging.ERROR)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        lasio_logger.setLevel(level)
+
+
+def time_call(run, repeat):
+    """Seconds of repeat calls of run(); each call may first run its own untimed setup"""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        with quiet():
+            times.append(run())
+    return times
+
+
+def timed(func, setup=None):
+    """run() for time_call: setup() untimed, then func(setup result) timed"""
+    def run():
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(arg)
+        return time.perf_counter() - start
+    return run
+
+
+def result(name, samples, times, **params):
+    best = min(times)
+    return {
+        "name": name,
+        "samples": samples,
+        "params": params,
+        "repeat": len(times),
+        "min_s": round(best, 6),
+        "median_s": round(statistics.median(times), 6),
+        "mean_s": round(statistics.fmean(times), 6),
+        "samples_per_s": round(samples / best) if best > 0 else None,
+    }
+
+
+# ========== BENCHMARKS ==========
+
+def bench_parse(samples, repeat, tmp, null_fraction):
+    """LAS parsing: the pure-Python reader, then read_las_file with a cold and a warm cache"""
+    from utils import las_cache
+    from utils.android_file_utils import read_las_file, read_las_pure_python
+
+    # Single-spaced, wrapped, then right-aligned columns (the pure-Python fast path)
+    for wrapped, aligned in ((False, False), (True, False), (False, True)):
+        layout = "aligned" if aligned else "wrapped" if wrapped else "unwrapped"
+        path = os.path.join(tmp, f"well_{samples}_{layout}.las")
+        write_las(path, samples, null_fraction=null_fraction, wrapped=wrapped, aligned=aligned)
+
+        params = {"wrapped": wrapped, "aligned": True} if aligned else {"wrapped": wrapped}
+        yield result("parse.pure_python", samples,
+                     time_call(timed(lambda _: read_las_pure_python(path)), repeat), **params)
+        if aligned:
+            os.remove(path)
+            continue
+        if not las_cache.is_enabled():
+            os.remove(path)
+            continue
+        yield result("parse.read_las_file.cold", samples,
+                     time_call(timed(lambda _: read_las_file(path), setup=las_cache.clear), repeat),
+                     wrapped=wrapped)
+        with quiet():
+            read_las_file(path)
+        yield result("parse.read_las_file.warm", samples,
+                     time_call(timed(lambda _: read_las_file(path)), repeat),
+                     wrapped=wrapped)
+        las_cache.clear()
+        os.remove(path)
+
+
+def bench_compute(samples, repeat, tmp, null_fraction):
+    """Interval detection and the porosity, Vshale and Archie Sw formulas"""
+    from utils import petrophysics
+    from utils.intervals import detect_reservoir_intervals
+
+    df = synthetic_frame(samples, null_fraction=null_fraction)
+    gr = df["Gamma Ray"]
+    cut_off = float(gr.median())
+    gr_clean, gr_shale = petrophysics.gr_clean_shale(gr)
+    porosity = petrophysics.total_porosity(df["Density"], df["Neutron"])
+
+    yield result("compute.intervals", samples, time_call(
+        timed(lambda _: detect_reservoir_intervals(df["Depth"], gr, cut_off)), repeat))
+    yield result("compute.porosity", samples, time_call(
+        timed(lambda _: petrophysics.total_porosity(df["Density"], df["Neutron"])), repeat))
+    yield result("compute.vshale", samples, time_call(
+        timed(lambda _: petrophysics.vshale_linear(gr, gr_clean, gr_shale)), repeat))
+    yield result("compute.water_saturation", samples, time_call(
+        timed(lambda _: petrophysics.archie_sw(porosity, df["Resistivity"], 2.0, 2.0)), repeat))
+
+
+def interpreted_well(samples, null_fraction):
+    """(df, cut_off, intervals, curves) of the synthetic well as the reservoir screen has them"""
+    from utils.batch import interpret
+
+    df = synthetic_frame(samples, null_fraction=null_fraction)
+    cut_off, intervals, curves = interpret(df)
+    return df, cut_off, intervals, curves
+
+
+def draw_reservoir_figure(df, cut_off, intervals, curves):
+    """The reservoir screen's full-height track figure; returns (layout, height px)"""
+    from utils.batch import BATCH_TRACKS
+    from utils.plot_utils import (
+        draw_density_neutron_track, draw_depth_track, draw_gamma_ray_track,
+        draw_porosity_track, draw_resistivity_track, draw_vshale_track,
+        draw_water_saturation_track,
+    )
+    from utils.track_layout import TrackFigure
+
+    depth = df["Depth"]
+    depth_min, depth_max = depth.min(), depth.max()
+    height_px = max(800, int((depth_max - depth_min) * PIXELS_PER_METER))
+
+    layout = TrackFigure(BATCH_TRACKS, height_px / 100)
+    rows = layout.lod_rows
+    draw_depth_track(layout["depth"], depth_min, depth_max, intervals, minor_step=None)
+    draw_gamma_ray_track(layout["gamma_ray"], depth, df["Gamma Ray"], depth_min, depth_max,
+                         rows, cut_off=cut_off, intervals=intervals)
+    draw_density_neutron_track(layout["density_neutron"], depth, df["Density"], df["Neutron"],
+                               depth_min, depth_max, rows, intervals=intervals)
+    draw_resistivity_track(layout["resistivity"], depth, df["Resistivity"], depth_min, depth_max,
+                           rows, intervals=intervals)
+    draw_porosity_track(layout["porosity"], depth, curves["porosity"], depth_min, depth_max,
+                        rows, intervals=intervals)
+    draw_vshale_track(layout["vshale"], depth, curves["vshale"], depth_min, depth_max,
+                      rows, intervals=intervals)
+    draw_water_saturation_track(layout["water_saturation"], depth, curves["water_saturation"],
+                                depth_min, depth_max, rows, label="Sw (m=2.0, n=2.0)",
+                                intervals=intervals)
+    layout.finish(depth_min, depth_max)
+    return layout, height_px
+
+
+def bench_render(samples, repeat, tmp, null_fraction):
+    """Building the reservoir track figure, rasterizing one tile of it, and the overview plots"""
+    import matplotlib.pyplot as plt
+    from utils.plot_utils import create_consistent_plot
+    from utils.tile_renderer import FigureTiler
+
+    df, cut_off, intervals, curves = interpreted_well(samples, null_fraction)
+    depth_min, depth_max = df["Depth"].min(), df["Depth"].max()
+
+    yield result("render.track_figure", samples, time_call(
+        timed(lambda _: draw_reservoir_figure(df, cut_off, intervals, curves)), repeat))
+
+    def new_tiler():
+        layout, height_px = draw_reservoir_figure(df, cut_off, intervals, curves)
+        return FigureTiler(layout.figure, height_px)
+
+    yield result("render.tile", samples, time_call(
+        timed(lambda tiler: tiler.render_tile(0), setup=new_tiler), repeat))
+
+    def overview(_):
+        figures = create_consistent_plot(df, depth_min, depth_max, 8, cut_off=cut_off,
+                                         intervals=intervals)
+        for fig in figures[::2]:
+            fig.canvas.draw()
+            plt.close(fig)
+
+    yield result("render.consistent_plot", samples, time_call(timed(overview), repeat))
+
+
+def bench_export(samples, repeat, tmp, null_fraction):
+    """The PDF report of the reservoir screen"""
+    from benchmarks.parallel_export import synthetic_report
+    from utils.report_renderer import render_report
+
+    report = synthetic_report(samples, null_fraction)
+    well_info = {"well_name": "Synthetic", "location": "-", "depth_range": "-"}
+    path = os.path.join(tmp, "report.pdf")
+
+    yield result("export.pdf", samples, time_call(
+        timed(lambda _: render_report(path, report, well_info)), repeat))
+    os.remove(path)
+
+
+BENCHMARKS = {
+    "parse": bench_parse,
+    "compute": bench_compute,
+    "render": bench_render,
+    "export": bench_export,
+}
+
+
+# ========== RESULTS ==========
+
+def git_commit():
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root,
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_metadata():
+    import pandas as pd
+    return {
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(sizes, groups, repeat, null_fraction=0.0, cache_dir=None, use_cache=True):
+    """Run the benchmark groups at every size; returns the JSON-ready results"""
+    from utils import las_cache
+
+    results = []
+    tmp = tempfile.mkdtemp(prefix="welllog_bench_")
+    # The parse benchmarks empty the cache: under --cache-dir they get a
+    # subdirectory of their own, so the entries already there are left alone
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        bench_cache = tempfile.mkdtemp(prefix="welllog_bench_", dir=cache_dir)
+    else:
+        bench_cache = os.path.join(tmp, "las_cache")
+    previous = las_cache.get_cache_dir(), las_cache.is_enabled()
+    las_cache.configure(cache_dir=bench_cache, enabled=use_cache)
+    try:
+        for samples in sizes:
+            for group in groups:
+                for entry in BENCHMARKS[group](samples, repeat, tmp, null_fraction):
+                    results.append(entry)
+                    params = " ".join(f"{k}={v}" for k, v in entry["params"].items())
+                    print(f"{entry['name']:<28} {samples:>10,} {entry['min_s']:10.4f} s  "
+                          f"{entry['median_s']:10.4f} s  {params}")
+    finally:
+        las_cache.configure(cache_dir=previous[0], enabled=previous[1])
+        shutil.rmtree(bench_cache, ignore_errors=True)
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {"meta": dict(run_metadata(), repeat=repeat, null_fraction=null_fraction),
+            "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run",
+                                     description="Time the parse, compute, render and export paths")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated sample counts (1000 up to 10000000)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default=",".join(GROUPS),
+                        help=f"comma-separated groups out of {', '.join(GROUPS)}")
+    parser.add_argument("--null-fraction", type=float, default=0.02)
+    parser.add_argument("--out", default=None, help="write the results as JSON to this file")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--cache-dir", default=None,
+                       help="directory for the parsed-LAS cache; the benchmarks use a "
+                            "temporary subdirectory of it, removed after (default: a "
+                            "temporary directory)")
+    cache.add_argument("--no-cache", action="store_true",
+                       help="skip the parsed-LAS cache and its cold/warm benchmarks")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = [g for g in groups if g not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark groups: {', '.join(unknown)}")
+
+    print(f"{'benchmark':<28} {'samples':>10} {'best':>12}  {'median':>12}")
+    results = run(sizes, groups, max(1, args.repeat), args.null_fraction,
+                  cache_dir=args.cache_dir, use_cache=not args.no_cache)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# benchmarks/startup.py - Time from process start to the app's first frame
+"""
+    python -m benchmarks.startup [--repeat 5] [--out results.json]
+
+Launches `python main.py` --repeat times with WELLLOG_STARTUP_EXIT=1, so
+the app quits right after drawing its first frame, and reads the
+"Startup: first frame after N ms" line each launch prints. Reports the
+best, median and mean in the same format as benchmarks.run, so two runs
+can be diffed with benchmarks.compare. Needs a display (or a virtual one
+such as xvfb-run) and the app's Kivy dependencies.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+from benchmarks.run import result, run_metadata
+
+_FIRST_FRAME = re.compile(r"Startup: first frame after (\d+) ms")
+
+
+def launch(app_dir, timeout=120):
+    """Seconds from process start to first frame of one app launch"""
+    env = dict(os.environ, WELLLOG_STARTUP_EXIT="1", WELLLOG_PREWARM="0",
+               KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1")
+    proc = subprocess.run([sys.executable, "main.py"], cwd=app_dir, env=env,
+                          capture_output=True, text=True, timeout=timeout)
+    match = _FIRST_FRAME.search(proc.stdout)
+    if match is None:
+        raise RuntimeError(f"app exited with {proc.returncode} before its first frame:\n"
+                           + "\n".join(proc.stderr.splitlines()[-10:]))
+    return int(match.group(1)) / 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup",
+                                     description="Time app launches up to the first frame")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default=None, help="write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # One untimed launch so every timed one starts with warm bytecode and disk caches
+    try:
+        launch(app_dir)
+        times = [launch(app_dir) for _ in range(args.repeat)]
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        print(e)
+        return 2
+
+    entry = result("startup_first_frame", 0, times)
+    print(f"first frame: best {entry['min_s'] * 1000:.0f} ms, "
+          f"median {entry['median_s'] * 1000:.0f} ms, mean {entry['mean_s'] * 1000:.0f} ms "
+          f"over {len(times)} launches")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"meta": dict(run_metadata(), repeat=args.repeat), "results": [entry]},
+                      f, indent=2)
+        print(f"Results written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
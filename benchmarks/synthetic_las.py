@@ -0,0 +1,135 @@
+# benchmarks/synthetic_las.py - Deterministic synthetic well logs and LAS files
+"""
+Synthetic wells for benchmarks: the same seed and parameters always give
+the same curves and the same LAS file, from 1k up to 10M samples.
+
+    python -m benchmarks.synthetic_las OUT.las --samples 100000 [--curves 8]
+        [--null-fraction 0.02] [--wrapped | --aligned] [--seed 0]
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+NULL_VALUE = -999.25
+DEPTH_STEP = 0.1524   # m (half-foot sampling)
+TOP_DEPTH = 1000.0
+
+# LAS mnemonic, unit, column name after read_las_file renames it
+BASE_CURVES = [
+    ("DEPT", "M", "Depth"),
+    ("GR", "GAPI", "Gamma Ray"),
+    ("RHOB", "G/CC", "Density"),
+    ("NPHI", "V/V", "Neutron"),
+    ("RES", "OHMM", "Resistivity"),
+]
+
+# Samples written per chunk, so 10M-sample files never need one huge string
+WRITE_CHUNK = 200_000
+
+
+def curve_mnemonics(curves=len(BASE_CURVES)):
+    """(mnemonic, unit) of the first curves curves; extra ones are generic"""
+    names = [(mnemonic, unit) for mnemonic, unit, _ in BASE_CURVES]
+    for index in range(len(BASE_CURVES), curves):
+        names.append((f"CRV{index - len(BASE_CURVES) + 1:02d}", "UNIT"))
+    return names[:max(curves, len(BASE_CURVES))]
+
+
+def synthetic_values(samples, curves=len(BASE_CURVES), null_fraction=0.0, seed=0):
+    """(curves, samples) float array: depth first, then GR, RHOB, NPHI, RES and extras"""
+    curves = max(curves, len(BASE_CURVES))
+    rng = np.random.default_rng(seed)
+    depth = TOP_DEPTH + np.arange(samples) * DEPTH_STEP
+
+    values = np.empty((curves, samples))
+    values[0] = depth
+    # Sand/shale cycles of a few metres, so intervals are realistic in number
+    values[1] = 75 + 40 * np.sin(depth / 7) + rng.normal(0, 8, samples)
+    values[2] = 2.35 + 0.15 * np.sin(depth / 11) + rng.normal(0, 0.03, samples)
+    values[3] = 0.22 + 0.08 * np.cos(depth / 9) + rng.normal(0, 0.01, samples)
+    values[4] = np.exp(rng.normal(2, 1, samples))
+    for row in range(len(BASE_CURVES), curves):
+        values[row] = rng.normal(100, 20, samples)
+
+    if null_fraction > 0:
+        # Nulls in every curve but depth
+        mask = rng.random((curves - 1, samples)) < null_fraction
+        values[1:][mask] = np.nan
+    return values
+
+
+def synthetic_frame(samples, curves=len(BASE_CURVES), null_fraction=0.0, seed=0):
+    """DataFrame with the columns read_las_file returns (nulls as NaN)"""
+    values = synthetic_values(samples, curves, null_fraction, seed)
+    columns = [column for _, _, column in BASE_CURVES]
+    columns += [mnemonic for mnemonic, _ in curve_mnemonics(curves)[len(BASE_CURVES):]]
+    return pd.DataFrame(values.T, columns=columns)
+
+
+def write_las(path, samples, curves=len(BASE_CURVES), null_fraction=0.0, wrapped=False, seed=0,
+              aligned=False):
+    """
+    Write a LAS 2.0 file; wrapped files put depth on its own line, as LAS
+    requires. aligned right-aligns each curve in its own columns, as
+    lasio and most logging software write them
+    """
+    values = synthetic_values(samples, curves, null_fraction, seed)
+    values = np.where(np.isnan(values), NULL_VALUE, values)
+    mnemonics = curve_mnemonics(len(values))
+
+    with open(path, "w", encoding="ascii") as f:
+        f.write("~Version Information\n")
+        f.write(" VERS.   2.0 : CWLS LOG ASCII STANDARD - VERSION 2.0\n")
+        f.write(f" WRAP.   {'YES' if wrapped else 'NO'} : {'Multiple' if wrapped else 'One'} line per depth step\n")
+        f.write("~Well Information\n")
+        f.write(f" STRT.M  {values[0, 0]:.4f} : START DEPTH\n")
+        f.write(f" STOP.M  {values[0, -1]:.4f} : STOP DEPTH\n")
+        f.write(f" STEP.M  {DEPTH_STEP:.4f} : STEP\n")
+        f.write(f" NULL.   {NULL_VALUE} : NULL VALUE\n")
+        f.write(f" WELL.   SYNTHETIC-{seed} : WELL\n")
+        f.write("~Curve Information\n")
+        for mnemonic, unit in mnemonics:
+            f.write(f" {mnemonic}.{unit} : {mnemonic}\n")
+        f.write("~A\n")
+
+        if wrapped:
+            # Depth line, then the other curves at most 6 per line
+            rows = ["%.4f\n"]
+            rest = len(values) - 1
+            for start in range(0, rest, 6):
+                rows.append(" ".join(["%.4f"] * min(6, rest - start)) + "\n")
+            row_format = "".join(rows)
+        elif aligned:
+            widths = [max(len(f"{value:.4f}") for value in (row.min(), row.max())) for row in values]
+            row_format = "".join(f" %{width + 1}.4f" for width in widths) + "\n"
+        else:
+            row_format = " ".join(["%.4f"] * len(values)) + "\n"
+
+        for start in range(0, samples, WRITE_CHUNK):
+            chunk = values[:, start:start + WRITE_CHUNK].T
+            f.write((row_format * len(chunk)) % tuple(chunk.ravel()))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic_las",
+                                     description="Write a deterministic synthetic LAS file")
+    parser.add_argument("path")
+    parser.add_argument("--samples", type=int, default=100_000)
+    parser.add_argument("--curves", type=int, default=len(BASE_CURVES))
+    parser.add_argument("--null-fraction", type=float, default=0.0)
+    parser.add_argument("--wrapped", action="store_true")
+    parser.add_argument("--aligned", action="store_true", help="right-aligned fixed columns")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    write_las(args.path, args.samples, args.curves, args.null_fraction, args.wrapped, args.seed,
+              args.aligned)
+    print(f"Wrote {args.samples} samples x {max(args.curves, len(BASE_CURVES))} curves to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
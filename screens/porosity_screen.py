@@ -1,15 +1,31 @@
 # screens/porosity_screen.py
 from kivy.uix.screenmanager import Screen
-from kivy_garden.matplotlib import FigureCanvasKivyAgg
 from kivymd.app import MDApp
 from kivymd.toast import toast
 
-import numpy as np
 import matplotlib.pyplot as plt
 
-from utils.android_file_utils import read_las_file
-from utils.plot_utils import create_depth_track
-from utils.constants import COLORS
+from utils import petrophysics
+from utils.dataset_cache import input_fingerprint
+from utils.intervals import detect_reservoir_intervals
+from utils.plot_utils import (
+    draw_density_neutron_track, draw_depth_track, draw_gamma_ray_track,
+    draw_porosity_track,
+)
+from utils.render_pipeline import run_with_spinner
+from utils.report_renderer import ReportData
+from utils.tiled_view import TiledTrackView
+from utils.track_layout import TrackFigure
+from utils.tracing import span, traced
+
+POROSITY_TRACKS = [
+    ("depth", 0.15),
+    ("gamma_ray", 0.25),
+    ("density_neutron", 0.30),
+    ("porosity", 0.30),
+]
+
+PIXELS_PER_METER = 2
 
 
 class PorosityScreen(Screen):
@@ -17,6 +33,10 @@ class PorosityScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.current_figures = []   # ✅ REQUIRED FOR PDF
+        self.current_canvases = []
+        self.current_tracks = []
+        self.report_data = None
+        self.fingerprint = None
         self.intervals = []
 
     def on_enter(self):
@@ -34,25 +54,51 @@ class PorosityScreen(Screen):
 
         self.plot_porosity(app.selected_file)
 
+    def release_plots(self):
+        """Drop the figure, tiles and report data; the next visit rebuilds them from the dataset cache"""
+        MDApp.get_running_app().render_pipeline.cancel(self.name)
+        self.ids.box_area.clear_widgets()
+        for canvas in self.current_canvases:
+            canvas.release()
+        for fig in self.current_figures:
+            try:
+                plt.close(fig)
+            except Exception:
+                pass
+        self.current_figures = []
+        self.current_canvases = []
+        self.current_tracks = []
+        self.report_data = None
+        self.fingerprint = None
+
     def plot_porosity(self, file_path):
         if not file_path:
             toast("No LAS file selected")
             return
 
-        df = read_las_file(file_path)
-        if df is None:
+        # Same file and settings as the last visit: keep the canvas as is
+        fingerprint = input_fingerprint(file_path, PIXELS_PER_METER)
+        if fingerprint is not None and fingerprint == self.fingerprint and self.current_figures:
             return
 
         # ========= CLEAR OLD =========
+        self.release_plots()
         box = self.ids.box_area
-        box.clear_widgets()
 
-        for fig in self.current_figures:
-            try:
-                plt.close(fig)
-            except Exception:
-                pass
-        self.current_figures = []
+        # Load, compute and plot on the render worker; spinner meanwhile
+        def show(result):
+            self.show_porosity(result)
+            self.fingerprint = fingerprint
+
+        run_with_spinner(box, lambda: self.build_porosity(file_path), show, self.name)
+
+    @traced("porosity.build")
+    def build_porosity(self, file_path):
+        """Read the LAS file, compute the curves and draw the tracks (render worker)"""
+        dataset = MDApp.get_running_app().load_dataset(file_path)
+        if dataset is None:
+            return None
+        df = dataset.df
 
         # ========= DEPTH =========
         depth = df["Depth"]
@@ -60,202 +106,65 @@ class PorosityScreen(Screen):
         depth_max = depth.max()
         depth_range = depth_max - depth_min
 
-        pixels_per_meter = 2
-        canvas_height = int(depth_range * pixels_per_meter)
-        canvas_height = max(800, min(canvas_height, 20000))
-        fig_height = max(8, min(canvas_height / 100, 100))
+        canvas_height = int(depth_range * PIXELS_PER_METER)
+        canvas_height = max(800, canvas_height)
+        fig_height = canvas_height / 100
 
         # ========= GR CUTOFF =========
-        gr_series = df["Gamma Ray"].dropna()
-        if gr_series.empty:
-            toast("No Gamma Ray data")
-            return
+        with span("intervals.cut_off"):
+            gr_series = df["Gamma Ray"].dropna()
+            if gr_series.empty:
+                raise ValueError("No Gamma Ray data")
 
-        gr_min = gr_series.min()
-        gr_max = gr_series.max()
-        cut_off = (gr_max - gr_min) / 2 + gr_min
+            gr_min = gr_series.min()
+            gr_max = gr_series.max()
+            cut_off = (gr_max - gr_min) / 2 + gr_min
 
         # ========= INTERVALS =========
-        intervals = []
-        in_zone = False
-        start_depth = None
-        min_gr = max_gr = None
-        prev_depth = None
-
-        for _, row in df.iterrows():
-            d = row["Depth"]
-            gr = row["Gamma Ray"]
-
-            if np.isnan(gr):
-                if in_zone:
-                    intervals.append((start_depth, prev_depth, min_gr, max_gr))
-                    in_zone = False
-                prev_depth = d
-                continue
-
-            if gr < cut_off:
-                if not in_zone:
-                    in_zone = True
-                    start_depth = d
-                    min_gr = max_gr = gr
-                else:
-                    min_gr = min(min_gr, gr)
-                    max_gr = max(max_gr, gr)
-            else:
-                if in_zone:
-                    intervals.append((start_depth, prev_depth, min_gr, max_gr))
-                    in_zone = False
-
-            prev_depth = d
-
-        if in_zone:
-            intervals.append((start_depth, prev_depth, min_gr, max_gr))
-
-        self.intervals = intervals
+        intervals = detect_reservoir_intervals(df["Depth"], df["Gamma Ray"], cut_off)
 
         # ========= POROSITY =========
         porosity = None
         if "Density" in df.columns:
-            rho_matrix = 2.65
-            rho_fluid = 1.0
-            phi_d = (rho_matrix - df["Density"]) / (rho_matrix - rho_fluid)
-            phi_d = np.clip(phi_d, 0, 1)
-
-            if "Neutron" in df.columns:
-                neutron = df["Neutron"]
-                if neutron.max() > 1:
-                    neutron = neutron / 100
-                porosity = (phi_d + neutron) / 2
-            else:
-                porosity = phi_d
-
-        # ========= DEPTH TRACK =========
-        fig_depth, ax_depth = create_depth_track(
-            depth_min, depth_max, fig_height, intervals
-        )
-
-         # ========= GR TRACK =========
-        fig_gr, ax_gr = plt.subplots(figsize=(3.5, fig_height))
-
-        ax_gr.plot(
-            df["Gamma Ray"], depth,
-            color=COLORS["gamma_ray"],
-            linewidth=1.5,
-            label="Gamma Ray"
-        )
-
-        ax_gr.axvline(
-            cut_off,
-            color=COLORS["cutoff_line"],
-            linestyle="--",
-            linewidth=2,
-            label=f"Cut-off: {cut_off:.1f} gAPI"
-        )
-
-        for idx, (top, bottom, _, _) in enumerate(intervals):
-            ax_gr.axhspan(
-                top, bottom,
-                color=COLORS["sand"],
-                alpha=0.4,
-                label="Reservoir" if idx == 0 else ""
-            )
-
-        ax_gr.set_ylim(depth_max, depth_min)
-        ax_gr.set_xlim(0, 200)
-        ax_gr.set_xticks([0, 50, 100, 150, 200])
-        ax_gr.set_title("Gamma Ray\n(gAPI)", fontsize=10, fontweight="bold")
-
-        ax_gr.legend(loc="upper right", fontsize=7, framealpha=0.9)
-
-
-         # ========= NEUTRON–DENSITY =========
-        fig_nd, ax_nd = plt.subplots(figsize=(3.5, fig_height))
-
-        ax_nd.plot(
-            df["Density"], depth,
-            color=COLORS["density"],
-            linewidth=1.5,
-            label="Density (RHOB)"
-        )
-
-        for top, bottom, _, _ in intervals:
-            ax_nd.axhspan(top, bottom, color=COLORS["sand"], alpha=0.4)
-
-        twin = ax_nd.twiny()
-        twin.plot(
-            df["Neutron"], depth,
-            color=COLORS["neutron"],
-            linewidth=1.5,
-            label="Neutron (NPHI)"
-        )
-
-        ax_nd.set_ylim(depth_max, depth_min)
-        ax_nd.set_xlim(1.85, 2.85)
-        twin.set_xlim(0, 0.45)
-
-        ax_nd.set_title("Density / Neutron\n(g/cm³)    (v/v)",
-                        fontsize=10, fontweight="bold")
-
-        # ---- COMBINED LEGEND (IMPORTANT) ----
-        h1, l1 = ax_nd.get_legend_handles_labels()
-        h2, l2 = twin.get_legend_handles_labels()
-        ax_nd.legend(h1 + h2, l1 + l2,
-                     loc="upper right", fontsize=7, framealpha=0.9)
-
-
-         # ========= POROSITY TRACK =========
-        fig_phi, ax_phi = plt.subplots(figsize=(3.5, fig_height))
-
-        if porosity is not None:
-            ax_phi.plot(
-                porosity * 100, depth,
-                color=COLORS["porosity"],
-                linewidth=1.5,
-                label="Porosity (Φ)"
-            )
-
-            for top, bottom, _, _ in intervals:
-                ax_phi.axhspan(top, bottom, color=COLORS["sand"], alpha=0.4)
-
-            ax_phi.axvline(
-                10, color="green", linestyle=":",
-                linewidth=1, alpha=0.5,
-                label="Good (>10%)"
-            )
-            ax_phi.axvline(
-                5, color="orange", linestyle=":",
-                linewidth=1, alpha=0.5,
-                label="Fair (5–10%)"
-            )
-
-            ax_phi.legend(loc="upper right", fontsize=7, framealpha=0.9)
-
-        ax_phi.set_ylim(depth_max, depth_min)
-        ax_phi.set_xlim(0, 40)
-        ax_phi.set_xticks([0, 10, 20, 30, 40])
-        ax_phi.set_title("Porosity\n(%)", fontsize=10, fontweight="bold")
-
+            nphi = df["Neutron"] if "Neutron" in df.columns else None
+            porosity = petrophysics.total_porosity(df["Density"], nphi)
+
+        # ========= TRACKS (one figure, shared depth axis) =========
+        layout = TrackFigure(POROSITY_TRACKS, fig_height)
+
+        draw_depth_track(layout["depth"], depth_min, depth_max, intervals, minor_step=None)
+        draw_gamma_ray_track(layout["gamma_ray"], depth, df["Gamma Ray"], depth_min, depth_max,
+                             layout.lod_rows, cut_off=cut_off, intervals=intervals, style='plain')
+        draw_density_neutron_track(layout["density_neutron"], depth, df["Density"], df["Neutron"],
+                                   depth_min, depth_max, layout.lod_rows, intervals=intervals,
+                                   style='plain')
+        draw_porosity_track(layout["porosity"], depth, porosity, depth_min, depth_max,
+                            layout.lod_rows, intervals=intervals, style='plain')
+        layout.finish(depth_min, depth_max)
+        layout.share_base_tracks(dataset_key=dataset.key, style='plain', cut_off=cut_off,
+                                 intervals=intervals)
+
+        report_data = ReportData(df, POROSITY_TRACKS, intervals, cut_off,
+                                 curves={"porosity": porosity})
+        return layout, canvas_height, intervals, report_data
+
+    def show_porosity(self, result):
+        """Put the finished tracks on screen (main thread)"""
+        layout, canvas_height, intervals, report_data = result
+        self.intervals = intervals
+        self.report_data = report_data
 
         # ========= STORE FIGURES (🔥 FIX) =========
-        self.current_figures = [
-            fig_depth,
-            fig_gr,
-            fig_nd,
-            fig_phi
-        ]
+        self.current_figures = [layout.figure]
+        self.current_tracks = layout.data_tracks()
 
-        # ========= ADD CANVASES =========
-        for fig, width in [
-            (fig_depth, 0.15),
-            (fig_gr, 0.25),
-            (fig_nd, 0.30),
-            (fig_phi, 0.30),
-        ]:
-            canvas = FigureCanvasKivyAgg(fig)
-            canvas.size_hint_y = None
-            canvas.height = canvas_height
-            canvas.size_hint_x = width
-            box.add_widget(canvas)
+        # ========= ADD CANVAS =========
+        app = MDApp.get_running_app()
+        canvas = TiledTrackView(layout.figure, canvas_height, pipeline=app.render_pipeline,
+                                track_cache=app.track_cache,
+                                shared_tracks=layout.shared_tracks)
+        self.current_canvases = [canvas]
+        self.ids.box_area.add_widget(canvas)
 
     def navigate_back(self):
         MDApp.get_running_app().change_screen("interpretation")
@@ -1,11 +1,28 @@
 # screens/viewlog_screen.py - View log screen implementation
 from kivy.uix.screenmanager import Screen
-from kivy_garden.matplotlib import FigureCanvasKivyAgg
-from utils.android_file_utils import read_las_file
 import matplotlib.pyplot as plt
 from kivymd.app import MDApp
 from kivymd.toast import toast
-import importlib
+
+from utils.dataset_cache import input_fingerprint
+from utils.plot_utils import (
+    draw_density_neutron_track, draw_depth_track, draw_gamma_ray_track,
+    draw_resistivity_track,
+)
+from utils.render_pipeline import run_with_spinner
+from utils.report_renderer import ReportData
+from utils.tiled_view import TiledTrackView
+from utils.track_layout import TrackFigure
+from utils.tracing import traced
+
+PIXELS_PER_METER = 2
+
+VIEWLOG_TRACKS = [
+    ("depth", 0.15),
+    ("gamma_ray", 0.28),
+    ("density_neutron", 0.28),
+    ("resistivity", 0.28),
+]
 
 class ViewLogScreen(Screen):
     def __init__(self, **kwargs):
@@ -13,6 +30,9 @@ class ViewLogScreen(Screen):
         self.current_figures = []
         self.current_axes = []
         self.current_canvases = []
+        self.current_tracks = []
+        self.report_data = None
+        self.fingerprint = None
 
     def on_enter(self):
         """Update info when entering screen"""
@@ -28,36 +48,52 @@ class ViewLogScreen(Screen):
 
         self.plot_logs(app.selected_file)
 
-    def plot_logs(self, file_path):
-        """Plot well logs from LAS file"""
-        # Force reload of plot_utils to get latest changes
-        import utils.plot_utils
-        importlib.reload(utils.plot_utils)
-        
-        # Now import the functions
-        from utils.plot_utils import create_welllog_plots, create_depth_track
-        
-        box = self.ids.box_area
-        box.clear_widgets()
+    def release_plots(self):
+        """Drop the figure, tiles and report data; the next visit rebuilds them from the dataset cache"""
+        MDApp.get_running_app().render_pipeline.cancel(self.name)
+        self.ids.box_area.clear_widgets()
+        for canvas in self.current_canvases:
+            canvas.release()
+        for fig in self.current_figures:
+            try:
+                plt.close(fig)
+            except Exception:
+                pass
         self.current_figures = []
         self.current_axes = []
         self.current_canvases = []
+        self.current_tracks = []
+        self.report_data = None
+        self.fingerprint = None
+
+    def plot_logs(self, file_path):
+        """Plot well logs from LAS file"""
+        # Same file and settings as the last visit: keep the canvas as is
+        fingerprint = input_fingerprint(file_path, PIXELS_PER_METER)
+        if fingerprint is not None and fingerprint == self.fingerprint and self.current_canvases:
+            return
+        self.release_plots()
+        box = self.ids.box_area
 
         if not file_path:
             toast("No file selected")
             return
 
-        # Read LAS file
-        df = read_las_file(file_path)
-        if df is None:
-            return
+        # Load, plot and rasterize on the render worker; spinner meanwhile
+        def show(result):
+            self.show_logs(result)
+            self.fingerprint = fingerprint
+
+        run_with_spinner(box, lambda: self.build_logs(file_path), show, self.name)
 
-        # DEBUG: Print data ranges
-        print("=== DEBUG: Data Ranges ===")
-        print(f"Gamma Ray min: {df['Gamma Ray'].min():.2f}, max: {df['Gamma Ray'].max():.2f}")
-        print(f"Density min: {df['Density'].min():.2f}, max: {df['Density'].max():.2f}")
-        print(f"Neutron min: {df['Neutron'].min():.2f}, max: {df['Neutron'].max():.2f}")
-        print(f"Resistivity min: {df['Resistivity'].min():.2f}, max: {df['Resistivity'].max():.2f}")
+    @traced("viewlog.build")
+    def build_logs(self, file_path):
+        """Read the LAS file and draw its tracks (runs on the render worker)"""
+        # Read LAS file
+        dataset = MDApp.get_running_app().load_dataset(file_path)
+        if dataset is None:
+            return None
+        df = dataset.df
 
         # Prepare depth and range
         depth_min = df["Depth"].min()
@@ -65,60 +101,41 @@ class ViewLogScreen(Screen):
         depth_range = depth_max - depth_min
 
         # Calculate figure size
-        pixels_per_meter = 2
-        canvas_height = int(depth_range * pixels_per_meter)
-        canvas_height = max(800, min(canvas_height, 20000))
+        canvas_height = int(depth_range * PIXELS_PER_METER)
+        canvas_height = max(800, canvas_height)
         fig_height_inches = canvas_height / 100
-        fig_height_inches = max(8, min(fig_height_inches, 100))
-
-        # Create plots
-        print("=== DEBUG: Creating plots ===")
-        fig_gr, ax_gr, fig_nd, ax_nd, fig_res, ax_res = create_welllog_plots(
-            df, depth_min, depth_max, fig_height_inches
-        )
-        
-        # DEBUG: Print axis limits
-        print(f"Gamma Ray xlim: {ax_gr.get_xlim()}")
-        print(f"Density xlim: {ax_nd.get_xlim()}")
-        
-        if len(fig_nd.axes) > 1:
-            twin_ax = fig_nd.axes[1]
-            print(f"Neutron xlim: {twin_ax.get_xlim()}")
-        
-        print(f"Resistivity xlim: {ax_res.get_xlim()}")
-        
-        fig_depth, ax_depth = create_depth_track(depth_min, depth_max, fig_height_inches)
+
+        # Create plots (timed per track when WELLLOG_TRACE is set)
+        layout = TrackFigure(VIEWLOG_TRACKS, fig_height_inches)
+        depth = df["Depth"]
+
+        draw_depth_track(layout["depth"], depth_min, depth_max, minor_step=None)
+        draw_gamma_ray_track(layout["gamma_ray"], depth, df["Gamma Ray"], depth_min, depth_max,
+                             layout.lod_rows, low_gr_fill=True, style='overview')
+        draw_density_neutron_track(layout["density_neutron"], depth, df["Density"], df["Neutron"],
+                                   depth_min, depth_max, layout.lod_rows, style='overview')
+        draw_resistivity_track(layout["resistivity"], depth, df["Resistivity"], depth_min, depth_max,
+                               layout.lod_rows, style='overview')
+        layout.finish(depth_min, depth_max)
+        layout.share_base_tracks(dataset_key=dataset.key, style='overview', low_gr_fill=True)
+
+        return layout, canvas_height, ReportData(df, VIEWLOG_TRACKS, low_gr_fill=True)
+
+    def show_logs(self, result):
+        """Put the finished tracks on screen (main thread)"""
+        layout, canvas_height, report_data = result
+        self.report_data = report_data
 
         # Store figures
-        self.current_figures = [fig_depth, fig_gr, fig_nd, fig_res]
-        self.current_axes = [ax_depth, ax_gr, ax_nd, ax_res]
-
-        # Create canvases
-        canvas_depth = FigureCanvasKivyAgg(fig_depth)
-        canvas_depth.size_hint_y = None
-        canvas_depth.height = canvas_height
-        canvas_depth.size_hint_x = 0.15
-
-        canvas_gr = FigureCanvasKivyAgg(fig_gr)
-        canvas_gr.size_hint_y = None
-        canvas_gr.height = canvas_height
-        canvas_gr.size_hint_x = 0.28
-
-        canvas_nd = FigureCanvasKivyAgg(fig_nd)
-        canvas_nd.size_hint_y = None
-        canvas_nd.height = canvas_height
-        canvas_nd.size_hint_x = 0.28
-
-        canvas_res = FigureCanvasKivyAgg(fig_res)
-        canvas_res.size_hint_y = None
-        canvas_res.height = canvas_height
-        canvas_res.size_hint_x = 0.28
-
-        self.current_canvases = [canvas_depth, canvas_gr, canvas_nd, canvas_res]
-
-        # Add widgets
-        box.clear_widgets()
-        box.add_widget(canvas_depth)
-        box.add_widget(canvas_gr)
-        box.add_widget(canvas_nd)
-        box.add_widget(canvas_res)
\ No newline at end of file
+        self.current_figures = [layout.figure]
+        self.current_axes = layout.all_axes()
+        self.current_tracks = layout.data_tracks()
+
+        # One canvas for all tracks, rasterized tile by tile on the worker
+        app = MDApp.get_running_app()
+        canvas = TiledTrackView(layout.figure, canvas_height, pipeline=app.render_pipeline,
+                                track_cache=app.track_cache,
+                                shared_tracks=layout.shared_tracks)
+
+        self.current_canvases = [canvas]
+        self.ids.box_area.add_widget(canvas)
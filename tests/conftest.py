@@ -0,0 +1,5 @@
+# tests/conftest.py - Make the app's packages importable when pytest runs from anywhere
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
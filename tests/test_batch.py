@@ -0,0 +1,115 @@
+# tests/test_batch.py - Batch CLI output folders and worker start-up
+import csv
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.synthetic_las import write_las
+from utils import batch
+from utils.batch import OutputCollision, process_well, well_dirs
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def las(path, samples=500, seed=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_las(str(path), samples, seed=seed)
+    return str(path)
+
+
+def test_well_dirs_keep_relative_paths(tmp_path):
+    files = [str(tmp_path / "a" / "WELL1.las"), str(tmp_path / "b" / "WELL1.las"),
+             str(tmp_path / "b" / "deep" / "WELL2.LAS")]
+    assert well_dirs(files) == {
+        files[0]: os.path.join("a", "WELL1"),
+        files[1]: os.path.join("b", "WELL1"),
+        files[2]: os.path.join("b", "deep", "WELL2"),
+    }
+    assert well_dirs([files[2]]) == {files[2]: "WELL2"}
+
+
+def test_well_dirs_reject_collisions(tmp_path):
+    with pytest.raises(OutputCollision, match="WELL1"):
+        well_dirs([str(tmp_path / "WELL1.las"), str(tmp_path / "well1.LAS")])
+
+
+def test_main_reports_collisions(tmp_path, capsys):
+    las(tmp_path / "in" / "WELL1.las")
+    las(tmp_path / "in" / "well1.LAS")
+    assert batch.main([str(tmp_path / "in"), "--out", str(tmp_path / "out"), "--no-cache"]) == 2
+    assert "Output folder collision" in capsys.readouterr().out
+
+
+def test_worker_failures_are_reported_per_well(tmp_path, monkeypatch):
+    """Errors escaping a worker, not only those process_well catches, land in the well's row"""
+    class Future:
+        def __init__(self, fn, args, kwargs):
+            self.fn, self.args, self.kwargs = fn, args, kwargs
+
+        def result(self):
+            if self.args[0].endswith("BAD.las"):
+                raise ValueError("could not convert string to float: 'abc'")
+            return self.fn(*self.args, **self.kwargs)
+
+    class Executor:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, *args, **kwargs):
+            return Future(fn, args, kwargs)
+
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", Executor)
+    monkeypatch.setattr(batch, "as_completed", list)
+    files = [las(tmp_path / "in" / "BAD.las"), las(tmp_path / "in" / "GOOD.las")]
+    rows, _ = batch.run_batch(files, str(tmp_path / "out"), use_cache=False, report=False)
+
+    assert [row["well"] for row in rows] == ["BAD", "GOOD"]
+    assert rows[0]["error"] == "could not convert string to float: 'abc'"
+    assert rows[1]["error"] == ""
+
+
+def test_process_well_writes_into_its_folder(tmp_path):
+    path = las(tmp_path / "in" / "a" / "WELL1.las")
+    out = tmp_path / "out"
+    row = process_well(path, str(out), os.path.join("a", "WELL1"), report=False)
+    assert row["error"] == ""
+    assert row["well"] == os.path.join("a", "WELL1")
+    assert sorted(os.listdir(out / "a" / "WELL1")) == ["curves.csv", "intervals.csv"]
+
+
+def test_process_well_reports_unreadable_files(tmp_path):
+    bad = tmp_path / "BAD.las"
+    bad.write_text("not a LAS file\n")
+    row = process_well(str(bad), str(tmp_path / "out"), report=False)
+    assert row["error"]
+    assert row["well"] == "BAD"
+
+
+def test_batch_through_main_with_spawned_workers(tmp_path):
+    """Spawned workers start from utils.worker_main, so the batch runs without Kivy"""
+    las(tmp_path / "in" / "a" / "WELL1.las", seed=1)
+    las(tmp_path / "in" / "b" / "WELL1.las", seed=2)
+    out = tmp_path / "out"
+    code = ("import multiprocessing, runpy, sys\n"
+            "multiprocessing.set_start_method('spawn')\n"
+            f"sys.argv = ['main.py', '--batch', {str(tmp_path / 'in')!r}, '--out', {str(out)!r},\n"
+            "            '--workers', '2', '--no-report', '--no-cache']\n"
+            "runpy.run_path('main.py', run_name='__main__')\n")
+    proc = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, capture_output=True,
+                          text=True, timeout=300)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert "kivy" not in proc.stderr.lower()
+
+    with open(out / "summary.csv", newline="") as f:
+        wells = sorted(row["well"] for row in csv.DictReader(f))
+    assert wells == [os.path.join("a", "WELL1"), os.path.join("b", "WELL1")]
+    for well in wells:
+        assert (out / well / "intervals.csv").is_file()
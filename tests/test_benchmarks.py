@@ -0,0 +1,25 @@
+# tests/test_benchmarks.py - Benchmark runs leave the user's cache alone
+import pytest
+
+from benchmarks import run as bench
+from utils import las_cache
+
+pytest.importorskip("lasio")
+
+
+def test_parse_benchmarks_keep_the_cache_dir_entries(tmp_path, capsys):
+    cache_dir = tmp_path / "cache"
+    entry = cache_dir / "0123abcd"
+    entry.mkdir(parents=True)
+    (entry / "header.json").write_text("{}")
+    before = las_cache.get_cache_dir(), las_cache.is_enabled()
+
+    results = bench.run([1_000], ["parse"], repeat=1, cache_dir=str(cache_dir))
+
+    assert {r["name"] for r in results["results"]} >= {"parse.read_las_file.cold",
+                                                        "parse.read_las_file.warm"}
+    assert [p.name for p in cache_dir.iterdir()] == ["0123abcd"]
+    assert (entry / "header.json").read_text() == "{}"
+    assert (las_cache.get_cache_dir(), las_cache.is_enabled()) == before
+    # lasio's warning about wrapped files stays out of the table
+    assert "wrapped files" not in capsys.readouterr().err
@@ -0,0 +1,107 @@
+# tests/test_dataset_cache.py - DatasetCache LRU eviction and locking
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.dataset_cache import DatasetCache
+
+
+def make_file(tmp_path, name, text="x"):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def frame(rows=1000):
+    return pd.DataFrame({"Depth": np.arange(rows, dtype=float), "Gamma Ray": np.ones(rows)})
+
+
+def test_hit_returns_the_same_dataset(tmp_path):
+    cache = DatasetCache()
+    path = make_file(tmp_path, "a.las")
+    loads = []
+    first = cache.get(path, lambda p: loads.append(p) or frame())
+    second = cache.get(path, lambda p: loads.append(p) or frame())
+    assert first is second
+    assert loads == [path]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_changed_file_replaces_its_stale_entry(tmp_path):
+    cache = DatasetCache()
+    path = make_file(tmp_path, "a.las")
+    old = cache.get(path, lambda p: frame())
+    with open(path, "a") as f:
+        f.write("more")
+    new = cache.get(path, lambda p: frame())
+    assert new is not old
+    assert cache.datasets() == [new]
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    one = frame().memory_usage(index=True, deep=False).sum()
+    cache = DatasetCache(max_bytes=int(one * 2.5))
+    a, b, c = (make_file(tmp_path, f"{name}.las") for name in "abc")
+    cache.get(a, lambda p: frame())
+    cache.get(b, lambda p: frame())
+    cache.get(a, lambda p: frame())   # a is now the most recent
+    cache.get(c, lambda p: frame())
+    assert [os.path.basename(d.path) for d in cache.datasets()] == ["a.las", "c.las"]
+    assert cache.total_bytes() <= cache.max_bytes
+
+
+def test_size_checks_do_not_wait_for_a_load(tmp_path):
+    cache = DatasetCache()
+    cache.get(make_file(tmp_path, "a.las"), lambda p: frame())
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_loader(path):
+        loading.set()
+        release.wait(5)
+        return frame()
+
+    worker = threading.Thread(target=cache.get, args=(make_file(tmp_path, "b.las"), slow_loader))
+    worker.start()
+    try:
+        assert loading.wait(5)
+        done = []
+        checker = threading.Thread(target=lambda: done.append((cache.total_bytes(), cache.stats())))
+        checker.start()
+        checker.join(1)
+        assert done, "total_bytes/stats blocked while another thread was loading"
+    finally:
+        release.set()
+        worker.join(5)
+    assert len(cache.datasets()) == 2
+
+
+def test_concurrent_gets_and_size_checks(tmp_path):
+    cache = DatasetCache(max_bytes=int(frame().memory_usage().sum() * 3))
+    paths = [make_file(tmp_path, f"{i}.las") for i in range(8)]
+    errors = []
+    stop = threading.Event()
+
+    def fill():
+        try:
+            for _ in range(20):
+                for path in paths:
+                    cache.get(path, lambda p: frame())
+        except Exception as e:
+            errors.append(e)
+        finally:
+            stop.set()
+
+    worker = threading.Thread(target=fill)
+    worker.start()
+    try:
+        while not stop.is_set():
+            cache.total_bytes()
+            cache.stats()
+            cache.datasets()
+    except Exception as e:
+        errors.append(e)
+    worker.join()
+    assert errors == []
@@ -0,0 +1,51 @@
+# tests/test_decimation.py - Min/max envelope keeps what every pixel row shows
+import numpy as np
+import pytest
+
+from utils.decimation import MIN_SAMPLES_PER_ROW, envelope_indices
+
+
+def rows_of(depth, n_rows):
+    d0, d1 = depth[0], depth[-1]
+    return np.clip(((depth - d0) * (n_rows / (d1 - d0))).astype(int), 0, n_rows - 1)
+
+
+@pytest.mark.parametrize("decreasing", [False, True])
+def test_envelope_keeps_each_rows_extremes_ends_and_gaps(decreasing):
+    rng = np.random.default_rng(0)
+    depth = 1000 + 0.1524 * np.arange(50_000)
+    if decreasing:
+        depth = depth[::-1]
+    values = np.cumsum(rng.normal(size=depth.size))
+    values[rng.random(depth.size) < 0.01] = np.nan
+    n_rows = 800
+
+    keep = envelope_indices(depth, values, n_rows)
+    assert np.all(np.diff(keep) > 0)
+    assert len(keep) <= 5 * n_rows
+
+    rows = rows_of(depth, n_rows)
+    kept = np.zeros(depth.size, dtype=bool)
+    kept[keep] = True
+    for row in range(n_rows):
+        members = np.flatnonzero(rows == row)
+        if members.size == 0:
+            continue
+        assert kept[members[0]] and kept[members[-1]]
+        row_values = values[members]
+        if np.isnan(row_values).any():
+            assert kept[members[np.isnan(row_values)][0]]
+        if not np.isnan(row_values).all():
+            assert np.nanmin(values[members[kept[members]]]) == np.nanmin(row_values)
+            assert np.nanmax(values[members[kept[members]]]) == np.nanmax(row_values)
+
+
+def test_short_curves_are_not_decimated():
+    n_rows = 100
+    depth = np.arange(float(MIN_SAMPLES_PER_ROW * n_rows))
+    assert envelope_indices(depth, np.ones(depth.size), n_rows) is None
+
+
+def test_non_monotonic_depth_is_not_decimated():
+    depth = np.concatenate((np.arange(5000.0), np.arange(5000.0)))
+    assert envelope_indices(depth, np.ones(depth.size), 100) is None
@@ -0,0 +1,38 @@
+# tests/test_import_report.py - Parsing and verdicts of the startup import report
+from utils.import_report import STARTUP, format_report, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   encodings.utf_8
+import time:      2000 |       2000 |     kivy.clock
+import time:      3000 |       5000 |   kivy
+import time:       500 |       5500 | main
+import time:      4000 |       4000 |   utils.dataset_cache
+import time:      1000 |       5000 | utils.memory_budget
+"""
+
+
+def test_parse_importtime():
+    records = parse_importtime(IMPORTTIME)
+    assert ("main", 500, 5500, 0) in records
+    assert ("kivy.clock", 2000, 2000, 2) in records
+    assert len(records) == 6
+
+
+def test_startup_counts_imports_after_main():
+    text, ok = format_report(parse_importtime(IMPORTTIME), STARTUP, budget_ms=100)
+    # main plus what the app's __init__ and build() imported
+    assert "Import time of app startup: 10.5 ms" in text
+    assert ok
+
+
+def test_heavy_library_fails_within_budget():
+    records = parse_importtime(IMPORTTIME + "import time:     90000 |      90000 |   numpy\n")
+    text, ok = format_report(records, STARTUP, budget_ms=10_000)
+    assert "Heavy libraries on the startup path: numpy" in text
+    assert not ok
+
+
+def test_over_budget_fails():
+    _, ok = format_report(parse_importtime(IMPORTTIME), STARTUP, budget_ms=5)
+    assert not ok
@@ -0,0 +1,53 @@
+# tests/test_intervals.py - Vectorized interval detection against the original row loop
+import numpy as np
+import pytest
+
+from utils.intervals import detect_reservoir_intervals
+
+
+def loop_intervals(depth, gamma_ray, cut_off):
+    """The per-row loop the screens used before detect_reservoir_intervals"""
+    intervals = []
+    in_zone = False
+    start_depth = min_gr = max_gr = prev_depth = None
+    for d, gr in zip(depth, gamma_ray):
+        if np.isnan(gr):
+            if in_zone:
+                intervals.append((start_depth, prev_depth, min_gr, max_gr))
+                in_zone = False
+        elif gr < cut_off:
+            if not in_zone:
+                in_zone = True
+                start_depth = d
+                min_gr = max_gr = gr
+            else:
+                min_gr = min(min_gr, gr)
+                max_gr = max(max_gr, gr)
+        elif in_zone:
+            intervals.append((start_depth, prev_depth, min_gr, max_gr))
+            in_zone = False
+        prev_depth = d
+    if in_zone:
+        intervals.append((start_depth, prev_depth, min_gr, max_gr))
+    return intervals
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_row_loop_with_nan_gaps(seed):
+    rng = np.random.default_rng(seed)
+    depth = 1000 + 0.1524 * np.arange(5_000)
+    gr = rng.uniform(10, 150, depth.size)
+    gr[rng.random(depth.size) < 0.05] = np.nan
+    assert detect_reservoir_intervals(depth, gr, 60.0) == loop_intervals(depth, gr, 60.0)
+
+
+def test_runs_touching_both_ends():
+    depth = np.arange(6.0)
+    gr = np.array([10, 20, 90, 90, 30, 40])
+    assert detect_reservoir_intervals(depth, gr, 50) == [(0.0, 1.0, 10.0, 20.0),
+                                                        (4.0, 5.0, 30.0, 40.0)]
+
+
+@pytest.mark.parametrize("gr", [[], [90.0, 80.0], [np.nan, np.nan]])
+def test_no_intervals(gr):
+    assert detect_reservoir_intervals(np.arange(float(len(gr))), gr, 50) == []
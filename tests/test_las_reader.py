@@ -0,0 +1,96 @@
+# tests/test_las_reader.py - Fallback LAS reader against lasio
+import numpy as np
+import pytest
+
+from benchmarks.synthetic_las import write_las
+from utils import android_file_utils
+from utils.android_file_utils import _parse_data_block, read_las_pure_python
+
+lasio = pytest.importorskip("lasio")
+
+
+@pytest.mark.parametrize("wrapped, aligned", [(False, False), (True, False), (False, True)])
+@pytest.mark.parametrize("curves", [5, 8])
+def test_matches_lasio(tmp_path, wrapped, aligned, curves):
+    path = str(tmp_path / "well.las")
+    write_las(path, 2_000, curves=curves, null_fraction=0.05, wrapped=wrapped, aligned=aligned)
+
+    df = read_las_pure_python(path)
+    expected = lasio.read(path).df().reset_index()
+
+    assert list(df.columns) == list(expected.columns)
+    assert len(df) == len(expected) == 2_000
+    np.testing.assert_allclose(df.to_numpy(), expected.to_numpy(), equal_nan=True)
+    assert df["GR"].isna().any()
+
+
+def test_comment_lines_are_skipped():
+    block = b"# first\n1.0 2.0 3.0\n  # indented\n4.0 5.0 6.0\n"
+    np.testing.assert_array_equal(_parse_data_block(block, 3, False),
+                                  [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]])
+
+
+@pytest.mark.parametrize("block", [
+    b"1.0 2.0 3.0\n4.0 5.0\n7.0 8.0 9.0\n",          # short row
+    b"1.0 2.0 3.0\n4.0 5.0 6.0 7.0\n7.0 8.0 9.0\n",  # long row
+    b"1.0 2.0 3.0\n4.0 abc 6.0\n7.0 8.0 9.0\n",      # non-numeric value
+])
+def test_bad_rows_are_skipped(block):
+    np.testing.assert_array_equal(_parse_data_block(block, 3, False),
+                                  [[1.0, 7.0], [2.0, 8.0], [3.0, 9.0]])
+
+
+def test_every_row_bad_gives_no_rows():
+    assert _parse_data_block(b"1.0 2.0\n3.0 4.0\n", 3, False).shape == (3, 0)
+
+
+def test_truncated_wrapped_block_keeps_complete_steps():
+    block = b"1.0\n2.0 3.0\n4.0\n5.0\n"
+    np.testing.assert_array_equal(_parse_data_block(block, 3, True), [[1.0], [2.0], [3.0]])
+
+
+def test_cut_last_row_is_dropped(tmp_path):
+    path = tmp_path / "well.las"
+    write_las(str(path), 100)
+    # Cut the file in the middle of its last row
+    path.write_bytes(path.read_bytes()[:-12])
+    assert len(read_las_pure_python(str(path))) == 99
+
+
+def _write_aligned(path, samples):
+    """lasio-written LAS: right-aligned columns, depth gaining a digit halfway"""
+    rng = np.random.default_rng(3)
+    las = lasio.LASFile()
+    las.well.NULL.value = -999.25
+    las.append_curve("DEPT", 9_990 + np.arange(samples) * 0.1524, unit="M")
+    las.append_curve("GR", rng.uniform(-20, 150, samples), unit="API")
+    las.append_curve("RT", rng.lognormal(1, 2, samples), unit="OHMM")
+    las.curves["GR"].data[::17] = np.nan
+    with open(path, "w") as f:
+        las.write(f)
+
+
+@pytest.mark.parametrize("chunk_rows", [16_384, 100])
+def test_fixed_columns_match_lasio(tmp_path, monkeypatch, chunk_rows):
+    monkeypatch.setattr(android_file_utils, "FIXED_CHUNK_ROWS", chunk_rows)
+    path = str(tmp_path / "aligned.las")
+    _write_aligned(path, 600)
+
+    df = read_las_pure_python(path)
+    expected = lasio.read(path).df().reset_index()
+
+    assert len(df) == len(expected) == 600
+    np.testing.assert_allclose(df.to_numpy(), expected.to_numpy(), equal_nan=True)
+    assert df["GR"].isna().sum() == len(range(0, 600, 17))
+
+
+def test_bad_row_in_fixed_columns_is_skipped(tmp_path):
+    path = tmp_path / "aligned.las"
+    _write_aligned(str(path), 600)
+    lines = path.read_bytes().split(b"\n")
+    row = lines.index(next(line for line in lines if line.startswith(b"~A"))) + 40
+    lines[row] = lines[row].replace(b".", b"x", 1)
+    path.write_bytes(b"\n".join(lines))
+
+    df = read_las_pure_python(str(path))
+    assert len(df) == 599
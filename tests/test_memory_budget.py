@@ -0,0 +1,116 @@
+# tests/test_memory_budget.py - Memory budget checks racing the render worker
+import os
+import subprocess
+import sys
+import threading
+import types
+
+import numpy as np
+import pandas as pd
+
+from utils.dataset_cache import DatasetCache
+from utils.memory_budget import MemoryBudget
+from utils.track_cache import TrackTileCache
+
+
+def cached_dataset(tmp_path):
+    path = tmp_path / "well.las"
+    path.write_text("x")
+    cache = DatasetCache()
+    df = pd.DataFrame({"Depth": np.arange(1000.0), "Gamma Ray": np.ones(1000)})
+    return cache, cache.get(str(path), lambda p: df)
+
+
+def screen(name, nbytes=0, figures=()):
+    curves = {"porosity": np.zeros(nbytes // 8)} if nbytes else {}
+    report = types.SimpleNamespace(curves=curves, df=pd.DataFrame({"Depth": []}))
+    return types.SimpleNamespace(name=name, current_figures=list(figures), current_canvases=[],
+                                 report_data=report if nbytes else None)
+
+
+def test_budget_check_while_worker_fills_derived(tmp_path):
+    cache, dataset = cached_dataset(tmp_path)
+    budget = MemoryBudget(max_bytes=1 << 40)
+    screens = [screen("reservoir", 8000), screen("porosity", 16000)]
+    errors = []
+    done = threading.Event()
+
+    def worker():
+        try:
+            for i in range(20_000):
+                dataset.get_derived(f"curve{i}", lambda: np.zeros(4))
+        finally:
+            done.set()
+
+    def checker():
+        try:
+            while not done.is_set():
+                budget.enforce(screens, "reservoir", cache)
+                cache.stats()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker), threading.Thread(target=checker)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(dataset.derived_values()) == 20_000
+
+
+def test_get_derived_keeps_the_first_value(tmp_path):
+    _, dataset = cached_dataset(tmp_path)
+    first = dataset.get_derived("vshale", lambda: np.ones(3))
+    assert dataset.get_derived("vshale", lambda: np.zeros(3)) is first
+
+
+def test_unmeasured_figures_use_the_last_size():
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    fig.add_subplot().plot(np.arange(1000.0), np.arange(1000.0))
+    budget = MemoryBudget()
+    screens = [screen("viewlog", figures=[fig])]
+    measured, sizes = budget.usage(screens)
+    assert measured >= 16000
+    assert budget.usage(screens, measure_figures=False) == (measured, sizes)
+    # Released screens hold no figures, whatever was measured before
+    assert budget.usage([screen("viewlog")], measure_figures=False)[0] == 0
+
+
+def test_caches_alone_over_budget_are_trimmed(tmp_path):
+    cache = DatasetCache()
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.las"
+        path.write_text(name)
+        df = pd.DataFrame({"Depth": np.arange(100_000.0), "Gamma Ray": np.ones(100_000)})
+        cache.get(str(path), lambda p, df=df: df)
+    tiles = TrackTileCache()
+    for i in range(4):
+        tiles.put(("gr", i), np.zeros((512, 256, 4), dtype=np.uint8))
+    newest = cache.datasets()[-1]
+    budget = MemoryBudget(max_bytes=2 * newest.nbytes())
+    screens = [screen("reservoir", 8000), screen("porosity", 8000)]
+    for s in screens:
+        s.release_plots = lambda s=s: setattr(s, "report_data", None)
+
+    released = budget.enforce(screens, "reservoir", cache, tiles)
+    assert released[0] == "porosity"
+    assert screens[1].report_data is None and screens[0].report_data is not None
+    assert tiles.total_bytes() == 0
+    assert cache.datasets() == [newest]
+    assert budget.usage(screens, cache, tiles)[0] <= budget.max_bytes
+    # The newest dataset stays even when it alone is over budget
+    budget.max_bytes = 1
+    budget.enforce(screens, "reservoir", cache, tiles)
+    assert cache.datasets() == [newest]
+
+
+def test_memory_budget_import_stays_light():
+    code = ("import sys, utils.memory_budget\n"
+            "sys.exit(any(m in sys.modules for m in ('numpy', 'pandas', 'matplotlib')))")
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.run([sys.executable, "-c", code], cwd=app_dir).returncode == 0
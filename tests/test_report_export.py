@@ -0,0 +1,91 @@
+# tests/test_report_export.py - PDF export writes whole files or none
+import threading
+
+import matplotlib
+matplotlib.use("Agg")
+
+import pytest
+
+from benchmarks.parallel_export import synthetic_report
+from utils.report_renderer import ExportCancelled, render_report
+
+WELL_INFO = {"well_name": "Synthetic", "location": "-", "depth_range": "-"}
+
+
+@pytest.fixture(scope="module")
+def report():
+    return synthetic_report(2_000)
+
+
+def test_export_leaves_only_the_report(tmp_path, report):
+    path = tmp_path / "report.pdf"
+    stats = render_report(str(path), report, WELL_INFO, page_meters=100)
+    assert path.read_bytes().startswith(b"%PDF")
+    assert stats["bytes"] == path.stat().st_size
+    assert [p.name for p in tmp_path.iterdir()] == ["report.pdf"]
+
+
+def test_cancelled_export_keeps_the_previous_file(tmp_path, report):
+    path = tmp_path / "report.pdf"
+    path.write_bytes(b"previous report")
+    cancel = threading.Event()
+
+    def progress(done, total):
+        if done == 2:
+            cancel.set()
+
+    with pytest.raises(ExportCancelled):
+        render_report(str(path), report, WELL_INFO, progress, cancel, page_meters=100)
+    assert path.read_bytes() == b"previous report"
+    assert [p.name for p in tmp_path.iterdir()] == ["report.pdf"]
+
+
+def test_failed_export_writes_nothing(tmp_path, report):
+    path = tmp_path / "report.pdf"
+    with pytest.raises(KeyError):
+        render_report(str(path), report, {}, page_meters=100)
+    assert list(tmp_path.iterdir()) == []
+
+
+def images(path):
+    return path.read_bytes().count(b"/Subtype /Image")
+
+
+def test_raster_depth_pages_embed_dense_curves_as_images(tmp_path, report):
+    vector, raster = tmp_path / "vector.pdf", tmp_path / "raster.pdf"
+    render_report(str(vector), report, WELL_INFO, page_meters=100)
+    render_report(str(raster), report, WELL_INFO, page_meters=100, raster_dpi=150)
+    pages = -(-(report.depth_range[1] - report.depth_range[0]) // 100)
+    assert images(vector) == 0
+    # At least one image per track on every depth page
+    assert images(raster) >= pages * len(report.tracks)
+
+
+def shaded_depths(fig):
+    """Sorted (top, bottom) of every interval shaded on a page"""
+    from utils.plot_utils import INTERVAL_GID
+    spans = set()
+    for ax in fig.axes:
+        for collection in ax.collections:
+            if collection.get_gid() == INTERVAL_GID:
+                for path in collection.get_paths():
+                    y = path.vertices[:, 1]
+                    spans.add((round(y.min(), 3), round(y.max(), 3)))
+    return sorted(spans)
+
+
+def test_depth_pages_shade_the_same_intervals_on_a_bottom_up_log(report):
+    from utils.batch import BATCH_TRACKS, interpret
+    from utils.report_renderer import ReportData, report_pages
+
+    df = report.df.iloc[::-1].reset_index(drop=True)
+    cut_off, intervals, curves = interpret(df)
+    reversed_report = ReportData(df, BATCH_TRACKS, intervals, cut_off, curves=curves,
+                                 params=report.params)
+
+    pages = list(report_pages(report, WELL_INFO, page_meters=50))
+    reversed_pages = list(report_pages(reversed_report, WELL_INFO, page_meters=50))
+    assert len(pages) == len(reversed_pages)
+    shaded = [shaded_depths(fig) for fig, _ in pages[1:-1]]
+    assert any(shaded)
+    assert shaded == [shaded_depths(fig) for fig, _ in reversed_pages[1:-1]]
@@ -0,0 +1,64 @@
+# tests/test_report_parallel.py - Parallel PDF export and its sequential fallback
+from concurrent.futures.process import BrokenProcessPool
+
+import matplotlib
+matplotlib.use("Agg")
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+from benchmarks.parallel_export import synthetic_report
+from utils import report_parallel
+
+WELL_INFO = {"well_name": "Synthetic", "location": "-", "depth_range": "-"}
+
+
+@pytest.fixture(scope="module")
+def report():
+    return synthetic_report(2_000)
+
+
+@pytest.fixture
+def two_cpus(monkeypatch):
+    """Exercise the pool even on a single-CPU machine"""
+    monkeypatch.setattr(report_parallel, "available_cpus", lambda: 2)
+
+
+def test_parallel_export_matches_page_count(tmp_path, report, two_cpus):
+    from pypdf import PdfReader
+    path = tmp_path / "report.pdf"
+    stats = report_parallel.render_report_parallel(str(path), report, WELL_INFO, workers=2,
+                                                   page_meters=100)
+    assert stats["workers"] == 2
+    assert len(PdfReader(str(path)).pages) == stats["pages"]
+    assert [p.name for p in tmp_path.iterdir()] == ["report.pdf"]
+
+
+@pytest.mark.parametrize("error", [BrokenProcessPool("worker died"), OSError("no semaphores")])
+def test_broken_pool_falls_back_to_sequential(tmp_path, report, monkeypatch, two_cpus, error):
+    def broken(*args, **kwargs):
+        raise error
+    monkeypatch.setattr(report_parallel, "render_pages", broken)
+    path = tmp_path / "report.pdf"
+    stats = report_parallel.render_report_parallel(str(path), report, WELL_INFO, workers=2,
+                                                   page_meters=100)
+    assert stats["workers"] == 1
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+def test_page_errors_are_not_swallowed(tmp_path, report, two_cpus):
+    with pytest.raises(KeyError):
+        report_parallel.render_report_parallel(str(tmp_path / "report.pdf"), report, {},
+                                               workers=2, page_meters=100)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_single_cpu_renders_sequentially(tmp_path, report, monkeypatch):
+    monkeypatch.setattr(report_parallel, "available_cpus", lambda: 1)
+    monkeypatch.setattr(report_parallel, "render_pages", None)
+    path = tmp_path / "report.pdf"
+    stats = report_parallel.render_report_parallel(str(path), report, WELL_INFO, workers=4,
+                                                   page_meters=100)
+    assert stats["workers"] == 1
+    assert path.read_bytes().startswith(b"%PDF")
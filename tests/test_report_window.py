@@ -0,0 +1,55 @@
+# tests/test_report_window.py - ReportData windows over logs of either depth direction
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.intervals import detect_reservoir_intervals, merge_close_intervals
+from utils.report_renderer import ReportData
+
+TRACKS = [("depth", None), ("gamma_ray", None)]
+
+
+def well(decreasing):
+    """1000-1100 m at 0.5 m, clean sand (GR 30) in 1010-1020, 1040-1050 and 1080-1090 m"""
+    depth = np.arange(1000.0, 1100.0, 0.5)
+    gr = np.full(depth.size, 90.0)
+    for top in (1010, 1040, 1080):
+        gr[(depth >= top) & (depth <= top + 10)] = 30.0
+    if decreasing:
+        depth, gr = depth[::-1], gr[::-1]
+    df = pd.DataFrame({"Depth": depth, "Gamma Ray": gr})
+    return ReportData(df, TRACKS, detect_reservoir_intervals(depth, gr, 60.0), cut_off=60.0)
+
+
+@pytest.mark.parametrize("decreasing", [False, True])
+def test_intervals_are_sorted_top_down(decreasing):
+    report = well(decreasing)
+    assert [iv[:2] for iv in report.intervals] == [(1010, 1020), (1040, 1050), (1080, 1090)]
+
+
+@pytest.mark.parametrize("decreasing", [False, True])
+@pytest.mark.parametrize("top, bottom, expected", [
+    (1000, 1030, [(1010, 1020)]),
+    (1015, 1045, [(1010, 1020), (1040, 1050)]),
+    (1025, 1035, []),
+    (1050, 1080, [(1040, 1050), (1080, 1090)]),
+    (1000, 1099, [(1010, 1020), (1040, 1050), (1080, 1090)]),
+])
+def test_window_keeps_overlapping_intervals(decreasing, top, bottom, expected):
+    window = well(decreasing).window(top, bottom)
+    assert [iv[:2] for iv in window.intervals] == expected
+    depth = window.df["Depth"]
+    # One sample past either end, so curves reach the page edges
+    assert depth.min() <= top and depth.max() >= bottom
+
+
+def test_window_matches_between_directions():
+    up, down = well(False), well(True)
+    for top in range(1000, 1100, 7):
+        assert up.window(top, top + 12).intervals == down.window(top, top + 12).intervals
+
+
+def test_merge_close_intervals_normalizes_reversed_input():
+    reversed_intervals = [(1090.0, 1080.0, 30, 30), (1050.0, 1040.0, 30, 30), (1020.0, 1010.0, 25, 35)]
+    assert merge_close_intervals(reversed_intervals, 25) == [
+        (1010.0, 1050.0, 25, 35), (1080.0, 1090.0, 30, 30)]
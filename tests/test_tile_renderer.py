@@ -0,0 +1,39 @@
+# tests/test_tile_renderer.py - Tiles culled to their depth range match full draws
+import matplotlib
+matplotlib.use("Agg")
+
+from benchmarks.run import draw_reservoir_figure
+from benchmarks.synthetic_las import synthetic_frame
+from utils.batch import interpret
+from utils.tile_renderer import FigureTiler
+
+
+def reservoir_tiler():
+    df = synthetic_frame(8_000)
+    cut_off, intervals, curves = interpret(df)
+    layout, height_px = draw_reservoir_figure(df, cut_off, intervals, curves)
+    return layout, FigureTiler(layout.figure, height_px)
+
+
+def test_culled_tiles_match_unculled_tiles():
+    layout, tiler = reservoir_tiler()
+    indices = [0, tiler.tile_count() // 2, tiler.tile_count() - 1]
+    culled = {index: tiler.render_tile(index) for index in indices}
+
+    tiler._cull = lambda height: []
+    for index in indices:
+        assert tiler.render_tile(index) == culled[index]
+
+
+def test_render_leaves_figure_untouched():
+    layout, tiler = reservoir_tiler()
+    ax = layout["depth"]
+    locator = ax.yaxis.get_major_locator()
+    texts = [text.get_visible() for text in ax.texts]
+    paths = {id(c): len(c.get_paths()) for a in layout.figure.axes for c in a.collections}
+
+    tiler.render_tile(tiler.tile_count() // 2)
+
+    assert ax.yaxis.get_major_locator() is locator
+    assert [text.get_visible() for text in ax.texts] == texts
+    assert {id(c): len(c.get_paths()) for a in layout.figure.axes for c in a.collections} == paths
@@ -0,0 +1,121 @@
+# tests/test_track_cache.py - Base-track tiles shared between replots and screen layouts
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+
+from benchmarks.run import PIXELS_PER_METER, draw_reservoir_figure
+from benchmarks.synthetic_las import synthetic_frame
+from utils.batch import interpret
+from utils.plot_utils import (
+    draw_density_neutron_track, draw_depth_track, draw_gamma_ray_track, draw_resistivity_track,
+    draw_water_saturation_track,
+)
+from utils.tile_renderer import FigureTiler
+from utils.track_cache import TrackTileCache, intervals_key
+from utils.track_layout import BASE_TRACKS, TrackFigure
+
+WATER_SATURATION_TRACKS = [("depth", 0.10), ("gamma_ray", 0.18), ("density_neutron", 0.18),
+                           ("resistivity", 0.18), ("water_saturation", 0.26)]
+WIDTH_PX = 1200
+
+
+@pytest.fixture(scope="module")
+def well():
+    df = synthetic_frame(4_000)
+    return (df,) + interpret(df)
+
+
+def reservoir_layout(well):
+    df, cut_off, intervals, curves = well
+    layout, height_px = draw_reservoir_figure(df, cut_off, intervals, curves)
+    layout.share_base_tracks(dataset_key="well", style="interpretation", cut_off=cut_off,
+                             intervals=intervals)
+    return layout, height_px
+
+
+def water_saturation_layout(well):
+    """The base tracks as the water saturation screen draws them, next to its Sw track"""
+    df, cut_off, intervals, curves = well
+    depth = df["Depth"]
+    depth_min, depth_max = depth.min(), depth.max()
+    height_px = max(800, int((depth_max - depth_min) * PIXELS_PER_METER))
+    layout = TrackFigure(WATER_SATURATION_TRACKS, height_px / 100)
+    rows = layout.lod_rows
+    draw_depth_track(layout["depth"], depth_min, depth_max, intervals, minor_step=None)
+    draw_gamma_ray_track(layout["gamma_ray"], depth, df["Gamma Ray"], depth_min, depth_max,
+                         rows, cut_off=cut_off, intervals=intervals)
+    draw_density_neutron_track(layout["density_neutron"], depth, df["Density"], df["Neutron"],
+                               depth_min, depth_max, rows, intervals=intervals)
+    draw_resistivity_track(layout["resistivity"], depth, df["Resistivity"], depth_min, depth_max,
+                           rows, intervals=intervals)
+    draw_water_saturation_track(layout["water_saturation"], depth, curves["water_saturation"],
+                                depth_min, depth_max, rows, label="Sw", intervals=intervals)
+    layout.finish(depth_min, depth_max)
+    layout.share_base_tracks(dataset_key="well", style="interpretation", cut_off=cut_off,
+                             intervals=intervals)
+    return layout, height_px
+
+
+def tiler(layout, height_px, cache=None):
+    tiler = FigureTiler(layout.figure, height_px, track_cache=cache,
+                        shared_tracks=layout.shared_tracks if cache is not None else None)
+    tiler.set_width(WIDTH_PX)
+    return tiler
+
+
+def pixels(tile):
+    data, width, height = tile
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 4).astype(int)
+
+
+def test_intervals_key_is_a_digest_of_the_bounds():
+    a = [(1000.0, 1010.0, 20, 30), (1040.0, 1050.0, 25, 35)]
+    assert intervals_key(a) == intervals_key([(1000, 1010, 0, 0), (1040, 1050, 0, 0)])
+    assert intervals_key(a) != intervals_key(a[:1])
+    assert intervals_key(a) != intervals_key([(1000.0, 1010.0), (1040.0, 1050.5)])
+    assert len(intervals_key(a)) == 40
+    assert intervals_key([]) == intervals_key(None) == ()
+
+
+def test_first_render_is_a_single_plain_pass(well):
+    cache = TrackTileCache()
+    layout, height_px = reservoir_layout(well)
+    shared = tiler(layout, height_px, cache)
+    plain = tiler(*reservoir_layout(well))
+    assert shared.render_tile(1) == plain.render_tile(1)
+    assert cache.stats()["entries"] == 0
+
+
+def test_replots_share_base_track_tiles(well):
+    cache = TrackTileCache()
+    first = tiler(*reservoir_layout(well), cache)
+    replot = tiler(*reservoir_layout(well), cache)
+
+    first.render_tile(1)
+    # Asked for again by a new figure of the screen: columns are rendered and cached
+    replot.render_tile(1)
+    assert cache.stats()["entries"] == len(BASE_TRACKS)
+
+    # Then reused by the first figure
+    hits = cache.hits
+    composed = pixels(first.render_tile(1))
+    assert cache.hits == hits + len(BASE_TRACKS)
+    plain = pixels(tiler(*reservoir_layout(well)).render_tile(1))
+    assert np.abs(composed - plain).max() <= 2
+
+
+def test_other_geometry_is_not_shared(well):
+    """The water saturation screen puts the same tracks in other columns"""
+    cache = TrackTileCache()
+    reservoir = tiler(*reservoir_layout(well), cache)
+    water_saturation = tiler(*water_saturation_layout(well), cache)
+
+    reservoir.render_tile(1)
+    reservoir.render_tile(1)
+    assert cache.stats()["entries"] == len(BASE_TRACKS)
+
+    hits = cache.hits
+    assert water_saturation.render_tile(1) == tiler(*water_saturation_layout(well)).render_tile(1)
+    assert cache.hits == hits
@@ -0,0 +1,276 @@
+# utils/batch.py - Headless interpretation of many LAS files
+"""
+Runs the reservoir screen's interpretation on whole folders of LAS files
+without a Kivy window:
+
+    python main.py --batch WELLS_DIR_OR_GLOB [...] --out OUT_DIR [--workers N]
+        [--cache-dir DIR | --no-cache]
+
+For every well it writes, under OUT_DIR/<well>/, where <well> is the
+file's path relative to the folder common to all inputs, without the
+extension (so a/WELL1.las and b/WELL1.las get OUT_DIR/a/WELL1 and
+OUT_DIR/b/WELL1):
+    intervals.csv  reservoir intervals from the GR cut-off
+    curves.csv     depth with porosity, Vshale and Sw
+    report.pdf     the same PDF report as the app (unless --no-report)
+and finishes with a throughput summary (wells/s, samples/s) and
+OUT_DIR/summary.csv.
+"""
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Track layout of the reservoir screen, which shows every curve
+BATCH_TRACKS = [
+    ("depth", 0.10),
+    ("gamma_ray", 0.15),
+    ("density_neutron", 0.15),
+    ("resistivity", 0.15),
+    ("porosity", 0.15),
+    ("vshale", 0.15),
+    ("water_saturation", 0.15),
+]
+
+SUMMARY_FIELDS = ["well", "file", "samples", "intervals", "net_pay_m", "cut_off", "seconds", "error"]
+
+
+def find_las_files(inputs):
+    """LAS files named by directories (searched recursively), globs or paths"""
+    found = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "**", "*"), recursive=True)
+            matches = [m for m in matches if m.lower().endswith(".las")]
+        else:
+            matches = glob.glob(item, recursive=True) or ([item] if os.path.isfile(item) else [])
+        for path in sorted(matches):
+            path = os.path.abspath(path)
+            if os.path.isfile(path) and path not in found:
+                found.append(path)
+    return found
+
+
+class OutputCollision(Exception):
+    """Raised by well_dirs when two files would be written to the same folder"""
+
+
+def well_name(file_path):
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def well_dirs(files):
+    """
+    Output folder of every file, relative to the output directory: its
+    path under the folder common to all files, without the extension.
+    Raises OutputCollision when two files would share a folder.
+    """
+    if not files:
+        return {}
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+    names = {}
+    owners = {}
+    for path in files:
+        name = os.path.splitext(os.path.relpath(os.path.abspath(path), root))[0]
+        # Case-insensitive file systems would merge WELL1 and well1
+        key = os.path.normcase(name).lower()
+        if key in owners:
+            raise OutputCollision(f"{owners[key]} and {path} would both be written to {name}")
+        owners[key] = path
+        names[path] = name
+    return names
+
+
+def interpret(df, m=2.0, n=2.0):
+    """GR cut-off, intervals, porosity, Vshale and Sw as the reservoir screen computes them"""
+    from utils import petrophysics
+    from utils.intervals import detect_reservoir_intervals
+
+    gr_series = df["Gamma Ray"].dropna()
+    if gr_series.empty:
+        raise ValueError("No valid Gamma Ray data found.")
+    cut_off = (gr_series.max() - gr_series.min()) / 2.0 + gr_series.min()
+    intervals = detect_reservoir_intervals(df["Depth"], df["Gamma Ray"], cut_off)
+
+    porosity = petrophysics.total_porosity(df["Density"], df["Neutron"])
+
+    vshale = None
+    gr_clean, gr_shale = petrophysics.gr_clean_shale(df["Gamma Ray"])
+    if gr_clean is not None:
+        vshale = petrophysics.vshale_linear(df["Gamma Ray"], gr_clean, gr_shale)
+
+    phi, rt = petrophysics.archie_inputs(porosity, df["Resistivity"])
+    water_saturation = petrophysics.archie_sw(phi, rt, m, n, phi_range=None, rt_range=None)
+
+    return cut_off, intervals, {
+        "porosity": porosity,
+        "vshale": vshale,
+        "water_saturation": water_saturation,
+    }
+
+
+def write_intervals(path, intervals):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["top_m", "bottom_m", "thickness_m", "min_gr", "max_gr"])
+        for top, bottom, min_gr, max_gr in intervals:
+            writer.writerow([f"{top:.4f}", f"{bottom:.4f}", f"{bottom - top:.4f}",
+                             f"{min_gr:.3f}", f"{max_gr:.3f}"])
+
+
+def write_curves(path, df, curves):
+    import pandas as pd
+    table = pd.DataFrame({"Depth": df["Depth"].to_numpy()})
+    for name, label in (("porosity", "PHIT"), ("vshale", "VSH"), ("water_saturation", "SW")):
+        if curves.get(name) is not None:
+            table[label] = curves[name]
+    table.to_csv(path, index=False, float_format="%.8g")
+
+
+def summary_row(file_path, well=None, error=""):
+    """Summary row of a well with nothing interpreted yet"""
+    return {"well": well or well_name(file_path), "file": file_path, "samples": 0,
+            "intervals": 0, "net_pay_m": 0.0, "cut_off": None, "seconds": 0.0, "error": error}
+
+
+def process_well(file_path, out_dir, well=None, m=2.0, n=2.0, report=True, page_meters=None,
+                 raster_dpi=None):
+    """
+    Worker: interpret one LAS file and write its outputs to out_dir/well
+    (default: the file's name); returns a summary row
+    """
+    start = time.perf_counter()
+    row = summary_row(file_path, well)
+    try:
+        from utils.android_file_utils import read_las_file
+
+        df = read_las_file(file_path)
+        if df is None:
+            raise ValueError("could not read LAS file")
+
+        cut_off, intervals, curves = interpret(df, m, n)
+        well_dir = os.path.join(out_dir, row["well"])
+        os.makedirs(well_dir, exist_ok=True)
+        write_intervals(os.path.join(well_dir, "intervals.csv"), intervals)
+        write_curves(os.path.join(well_dir, "curves.csv"), df, curves)
+
+        if report:
+            from utils.report_renderer import ReportData, render_report
+            report_data = ReportData(df, BATCH_TRACKS, intervals, cut_off, curves=curves,
+                                     params={"m": m, "n": n})
+            depth = df["Depth"]
+            well_info = {"well_name": well_name(file_path), "location": "-",
+                         "depth_range": f"{depth.min():.1f} - {depth.max():.1f} m"}
+            render_report(os.path.join(well_dir, "report.pdf"), report_data, well_info,
+                          raster_dpi=raster_dpi, page_meters=page_meters)
+
+        row.update(samples=len(df), intervals=len(intervals), cut_off=round(float(cut_off), 3),
+                   net_pay_m=round(sum(bottom - top for top, bottom, _, _ in intervals), 3))
+    except Exception as e:
+        row["error"] = str(e) or type(e).__name__
+    row["seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def run_batch(files, out_dir, workers=None, cache_dir=None, use_cache=True, **options):
+    """
+    Process files over a pool of workers; returns (summary rows, wall
+    seconds). Raises OutputCollision before any work when two files would
+    share an output folder; any other failure is reported in its well's row.
+    """
+    from utils import las_cache
+
+    names = well_dirs(files)
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    rows = []
+
+    workers = workers or os.cpu_count() or 1
+    # Workers do not inherit module state under spawn, so configure the LAS cache in each
+    with ProcessPoolExecutor(max_workers=workers, initializer=las_cache.configure,
+                             initargs=(cache_dir, None, use_cache)) as executor:
+        futures = {executor.submit(process_well, path, out_dir, names[path], **options): path
+                   for path in files}
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as e:
+                # Errors process_well cannot catch itself, such as a worker that died
+                path = futures[future]
+                row = summary_row(path, names[path], str(e) or type(e).__name__)
+            rows.append(row)
+            status = f"error: {row['error']}" if row["error"] else \
+                f"{row['samples']} samples, {row['intervals']} intervals"
+            print(f"[{len(rows)}/{len(files)}] {row['well']}: {status} ({row['seconds']:.2f} s)")
+
+    rows.sort(key=lambda r: r["file"])
+    return rows, time.perf_counter() - start
+
+
+def write_summary(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def format_throughput(rows, seconds, workers):
+    ok = [r for r in rows if not r["error"]]
+    samples = sum(r["samples"] for r in ok)
+    seconds = max(seconds, 1e-9)
+    return (f"{len(ok)} of {len(rows)} wells in {seconds:.1f} s with {workers} workers: "
+            f"{len(ok) / seconds:.2f} wells/s, {samples / seconds:,.0f} samples/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py --batch",
+                                     description="Interpret LAS files without the app window")
+    parser.add_argument("--batch", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("inputs", nargs="+", help="LAS files, directories or glob patterns")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--m", type=float, default=2.0, help="Archie cementation exponent")
+    parser.add_argument("--n", type=float, default=2.0, help="Archie saturation exponent")
+    parser.add_argument("--no-report", action="store_true", help="skip the PDF reports")
+    parser.add_argument("--page-meters", type=float, default=None,
+                        help="depth-paginated reports with pages of this many metres")
+    parser.add_argument("--raster-dpi", type=int, default=None,
+                        help="rasterize dense curves in the reports at this DPI")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--cache-dir", default=None,
+                       help="parsed-LAS cache directory (default: WELLLOG_CACHE_DIR or ~/.cache/welllogapp/las)")
+    cache.add_argument("--no-cache", action="store_true",
+                       help="always parse the LAS files and write no cache")
+    args = parser.parse_args(argv)
+
+    files = find_las_files(args.inputs)
+    if not files:
+        print("No LAS files found")
+        return 2
+
+    from utils import las_cache
+    print(f"Processing {len(files)} LAS files with {args.workers} workers")
+    if args.no_cache:
+        print("LAS cache: off")
+    else:
+        print(f"LAS cache: {args.cache_dir or las_cache.get_cache_dir()}")
+    try:
+        rows, seconds = run_batch(files, args.out, workers=args.workers, cache_dir=args.cache_dir,
+                                  use_cache=not args.no_cache, m=args.m, n=args.n,
+                                  report=not args.no_report, page_meters=args.page_meters,
+                                  raster_dpi=args.raster_dpi)
+    except OutputCollision as e:
+        print(f"Output folder collision: {e}")
+        return 2
+    write_summary(os.path.join(args.out, "summary.csv"), rows)
+
+    print(format_throughput(rows, seconds, args.workers))
+    return 1 if any(r["error"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# utils/dataset_cache.py - In-memory LRU cache of loaded well datasets
+import os
+import threading
+from collections import OrderedDict
+
+
+def input_fingerprint(file_path, *params):
+    """
+    Identity of everything a screen's plot depends on: the file on disk
+    plus the screen's parameters. None when the file cannot be read.
+    """
+    try:
+        return DatasetCache.file_key(file_path), params
+    except (OSError, TypeError):
+        return None
+
+
+class WellDataset:
+    """A loaded LAS file shared by every screen"""
+
+    def __init__(self, path, key, df):
+        self.path = path
+        self.key = key
+        self.df = df
+        self.derived = {}
+        # The render worker adds derived curves while the UI thread sizes them
+        self._lock = threading.Lock()
+
+    def get_derived(self, name, compute):
+        """Memoize a curve computed from this dataset under name"""
+        with self._lock:
+            if name in self.derived:
+                return self.derived[name]
+        # Computed outside the lock so size checks never wait on it
+        value = compute()
+        with self._lock:
+            return self.derived.setdefault(name, value)
+
+    def derived_values(self):
+        """Snapshot of the derived curves, safe to walk while more are added"""
+        with self._lock:
+            return list(self.derived.values())
+
+    def nbytes(self):
+        """Approximate memory held by the dataset and its derived curves"""
+        total = int(self.df.memory_usage(index=True, deep=False).sum())
+        for value in self.derived_values():
+            items = value if isinstance(value, tuple) else (value,)
+            total += sum(getattr(item, "nbytes", 0) for item in items)
+        return total
+
+
+class DatasetCache:
+    """LRU cache of WellDataset objects with a memory cap, shared with the render worker"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def file_key(file_path):
+        """Identity of a file on disk: path, size and mtime"""
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+    def get(self, file_path, loader):
+        """Return the dataset for file_path, calling loader(file_path) on a miss"""
+        try:
+            key = self.file_key(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            dataset = self._entries.get(key)
+            if dataset is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return dataset
+            self.misses += 1
+
+        # Parse outside the lock so the UI thread's size checks never wait on it
+        df = loader(file_path)
+        if df is None:
+            return None
+
+        with self._lock:
+            dataset = self._entries.get(key)
+            if dataset is not None:
+                # Loaded by another thread meanwhile; keep the cached one
+                self._entries.move_to_end(key)
+                return dataset
+
+            # Drop stale versions of the same file
+            for old_key in [k for k in self._entries if k[0] == key[0]]:
+                del self._entries[old_key]
+
+            dataset = WellDataset(file_path, key, df)
+            self._entries[key] = dataset
+            self._evict()
+            return dataset
+
+    def _evict(self):
+        """Drop least recently used datasets, always keeping the newest"""
+        while len(self._entries) > 1 and self.total_bytes() > self.max_bytes:
+            self._entries.popitem(last=False)
+
+    def evict_oldest(self):
+        """Drop the least recently used dataset but the newest; returns the bytes it held"""
+        with self._lock:
+            if len(self._entries) <= 1:
+                return 0
+            _, dataset = self._entries.popitem(last=False)
+            return dataset.nbytes()
+
+    def datasets(self):
+        """The cached datasets, least recently used first"""
+        with self._lock:
+            return list(self._entries.values())
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(dataset.nbytes() for dataset in self._entries.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes(),
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,65 @@
+# utils/decimation.py - Level-of-detail reduction for long log curves
+"""
+Min/max envelope (M4-style) decimation.
+A curve plotted against depth is split into one bin per pixel row; each
+bin keeps its first, last, minimum and maximum sample (and its first NaN,
+so gaps still break the line). The rasterized result is the same as
+plotting every sample, but the vertex count is bounded by the canvas
+height instead of the log length.
+"""
+import numpy as np
+
+# Below this many samples per pixel row decimation is not worth it
+MIN_SAMPLES_PER_ROW = 4
+
+
+def envelope_indices(depth, values, n_rows):
+    """
+    Indices of the samples to keep for an n_rows pixel-tall plot.
+    Returns None when the curve is short enough (or depth is not
+    monotonic) and should be plotted as is.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+    n_rows = int(n_rows)
+    if n_rows <= 0 or n <= MIN_SAMPLES_PER_ROW * n_rows:
+        return None
+
+    d0 = depth[0]
+    d1 = depth[-1]
+    if not (np.isfinite(d0) and np.isfinite(d1)) or d1 == d0:
+        return None
+
+    # Pixel row of every sample
+    bins = ((depth - d0) * (n_rows / (d1 - d0))).astype(np.intp)
+    np.clip(bins, 0, n_rows - 1, out=bins)
+    steps = np.diff(bins)
+    if steps.min() < 0:
+        return None
+
+    starts = np.flatnonzero(np.concatenate(([True], steps > 0)))
+    counts = np.diff(np.append(starts, n))
+    ends = starts + counts - 1
+    index = np.arange(n)
+
+    # fmin/fmax skip NaN, so min/max are taken over the valid samples
+    bin_min = np.repeat(np.fmin.reduceat(values, starts), counts)
+    bin_max = np.repeat(np.fmax.reduceat(values, starts), counts)
+    arg_min = np.minimum.reduceat(np.where(values == bin_min, index, n), starts)
+    arg_max = np.minimum.reduceat(np.where(values == bin_max, index, n), starts)
+    first_nan = np.minimum.reduceat(np.where(np.isnan(values), index, n), starts)
+
+    keep = np.sort(np.column_stack((starts, arg_min, arg_max, first_nan, ends)), axis=1).ravel()
+    keep = keep[keep < n]
+    return keep[np.diff(keep, prepend=-1) > 0]
+
+
+def decimate_curve(depth, values, n_rows):
+    """Return (values, depth) reduced to a per-pixel-row min/max envelope"""
+    values = np.asarray(values, dtype=np.float64)
+    depth = np.asarray(depth, dtype=np.float64)
+    keep = envelope_indices(depth, values, n_rows)
+    if keep is None:
+        return values, depth
+    return values[keep], depth[keep]
@@ -1,7 +1,4 @@
 # utils/file_utils.py
-import lasio
-import pandas as pd
-import numpy as np
 import os
 from kivymd.toast import toast
 
@@ -11,7 +8,9 @@ def read_las_file(file_path):
         if not os.path.exists(file_path):
             toast("File does not exist")
             return None
-        
+
+        # lasio (and pandas with it) is only imported once a file is opened
+        import lasio
         las = lasio.read(file_path)
         df = las.df().reset_index()
 
@@ -0,0 +1,127 @@
+# utils/import_report.py - Import-time profile of the app entry point
+"""
+Starts the app up to its first frame under `python -X importtime` in a
+subprocess - imports main, constructs WellLogApp and runs build(), which
+covers everything imported before the start screen is drawn - and
+reports where startup import time goes:
+
+    python main.py --import-report [--top N] [--budget-ms MS] [--module NAME]
+
+--module profiles a plain `import NAME` instead. Exits non-zero when the
+imports take longer than the budget, or when a heavy scientific library
+is imported before the first LAS file is opened.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = 1500
+# Libraries that must stay off the startup path
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib", "lasio", "kivy_garden.matplotlib")
+
+# Everything the app runs before its first frame: the entry point, the
+# app's __init__ and build()
+STARTUP_CODE = "import main; app = main.WellLogApp(); app.root = app.build()"
+STARTUP = "startup"
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def parse_importtime(text):
+    """List of (module, self_us, cumulative_us, depth) from -X importtime output"""
+    records = []
+    for line in text.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def profile_imports(module=STARTUP, cwd=None):
+    """
+    Run the app startup (module STARTUP) or import module in a fresh
+    interpreter under -X importtime; returns parsed records
+    """
+    env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1")
+    code = STARTUP_CODE if module == STARTUP else f"import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    records = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError(f"{code} failed:\n" + "\n".join(errors[-10:]))
+    return records
+
+
+def heavy_imports(records):
+    """Heavy library packages imported by the profiled module"""
+    found = []
+    for name, _, _, _ in records:
+        for heavy in HEAVY_MODULES:
+            if (name == heavy or name.startswith(heavy + ".")) and heavy not in found:
+                found.append(heavy)
+    return found
+
+
+def format_report(records, module=STARTUP, top=15, budget_ms=DEFAULT_BUDGET_MS):
+    """Human-readable report; returns (text, within_budget)"""
+    total_us = next((cum for name, _, cum, _ in records if name == module), None)
+    if total_us is None:
+        total_us = sum(cum for _, _, cum, depth in records if depth == 0)
+
+    what = "app startup" if module == STARTUP else f"'{module}'"
+    lines = [f"Import time of {what}: {total_us / 1000:.1f} ms (budget {budget_ms} ms)", ""]
+
+    lines.append(f"Top {top} by cumulative time:")
+    others = [r for r in records if r[0] != module]
+    for name, self_us, cumulative_us, _ in sorted(others, key=lambda r: r[2], reverse=True)[:top]:
+        lines.append(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+
+    lines.append("")
+    lines.append(f"Top {top} by self time:")
+    for name, self_us, cumulative_us, _ in sorted(records, key=lambda r: r[1], reverse=True)[:top]:
+        lines.append(f"  {self_us / 1000:9.1f} ms  {name}")
+
+    heavy = heavy_imports(records)
+    lines.append("")
+    if heavy:
+        lines.append("Heavy libraries on the startup path: " + ", ".join(heavy))
+    else:
+        lines.append("No heavy libraries on the startup path")
+
+    within_budget = total_us / 1000 <= budget_ms and not heavy
+    lines.append("PASS" if within_budget else "FAIL")
+    return "\n".join(lines), within_budget
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py --import-report",
+                                     description="Report import costs of the app entry point")
+    parser.add_argument("--import-report", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--module", default=STARTUP,
+                        help="module to import instead of starting the app up to its first frame")
+    parser.add_argument("--top", type=int, default=15, help="rows per table")
+    parser.add_argument("--budget-ms", type=float,
+                        default=float(os.environ.get("WELLLOG_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)),
+                        help="fail when the imports take longer than this")
+    args = parser.parse_args(argv)
+
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        records = profile_imports(args.module, cwd=app_dir)
+    except RuntimeError as e:
+        print(e)
+        return 2
+
+    text, within_budget = format_report(records, args.module, args.top, args.budget_ms)
+    print(text)
+    return 0 if within_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# utils/intervals.py - Reservoir interval detection from a Gamma Ray cut-off
+import numpy as np
+
+from utils.tracing import traced
+
+
+@traced("intervals.detect_reservoir_intervals")
+def detect_reservoir_intervals(depth, gamma_ray, cut_off):
+    """
+    Find runs of consecutive samples with GR below the cut-off.
+    Returns a list of (top, bottom, min_gr, max_gr) tuples; NaN GR
+    samples end a run just like a sample above the cut-off.
+    """
+    depth = np.asarray(depth, dtype=np.float64)
+    gr = np.asarray(gamma_ray, dtype=np.float64)
+    if gr.size == 0:
+        return []
+
+    # NaN compares False, so it breaks runs
+    in_zone = gr < cut_off
+
+    # Run boundaries: +1 where a run starts, -1 one past where it ends
+    edges = np.diff(in_zone.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    if starts.size == 0:
+        return []
+    ends = np.flatnonzero(edges == -1) - 1
+
+    # Samples between runs are masked out so each reduceat segment only
+    # sees its own run
+    min_gr = np.minimum.reduceat(np.where(in_zone, gr, np.inf), starts)
+    max_gr = np.maximum.reduceat(np.where(in_zone, gr, -np.inf), starts)
+
+    return list(zip(depth[starts].tolist(), depth[ends].tolist(),
+                    min_gr.tolist(), max_gr.tolist()))
+
+
+def normalize_intervals(intervals):
+    """
+    Intervals with top <= bottom, sorted by top. A log recorded bottom-up
+    (decreasing depth) yields its intervals deepest first with top > bottom.
+    """
+    return sorted((min(top, bottom), max(top, bottom)) + tuple(rest)
+                  for top, bottom, *rest in intervals)
+
+
+def merge_close_intervals(intervals, min_gap):
+    """
+    Merge consecutive intervals separated by less than min_gap (e.g. one
+    pixel row of a plot), for shading at a resolution where the gaps
+    between them cannot be seen. Same tuple layout as the input, with the
+    intervals normalized as by normalize_intervals.
+    """
+    intervals = normalize_intervals(intervals)
+    if len(intervals) < 2 or min_gap <= 0:
+        return intervals
+
+    values = np.asarray(intervals, dtype=np.float64)
+    tops, bottoms = values[:, 0], values[:, 1]
+
+    # A new group starts wherever the gap to the previous interval is visible
+    starts = np.flatnonzero(np.concatenate(([True], tops[1:] - bottoms[:-1] >= min_gap)))
+    ends = np.append(starts[1:], len(values)) - 1
+
+    min_gr = np.minimum.reduceat(values[:, 2], starts)
+    max_gr = np.maximum.reduceat(values[:, 3], starts)
+    return list(zip(tops[starts].tolist(), bottoms[ends].tolist(),
+                    min_gr.tolist(), max_gr.tolist()))
@@ -0,0 +1,177 @@
+# utils/las_cache.py - Persistent column cache for parsed LAS files
+"""
+Sidecar binary cache for parsed LAS data.
+Each curve is stored as its own .npy file next to a small header.json and
+opened with np.load(mmap_mode='r'), so reopening a log only pages in the
+curves that are actually touched.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+
+CACHE_VERSION = 1
+HASH_CHUNK_BYTES = 256 * 1024
+
+_cache_dir = os.environ.get(
+    "WELLLOG_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "welllogapp", "las"),
+)
+_max_cache_bytes = 512 * 1024 * 1024
+_enabled = True
+
+
+def configure(cache_dir=None, max_bytes=None, enabled=None):
+    """Set the cache directory, the size cap in bytes and/or whether the cache is used"""
+    global _cache_dir, _max_cache_bytes, _enabled
+    if cache_dir is not None:
+        _cache_dir = cache_dir
+    if max_bytes is not None:
+        _max_cache_bytes = int(max_bytes)
+    if enabled is not None:
+        _enabled = bool(enabled)
+
+
+def get_cache_dir():
+    return _cache_dir
+
+
+def is_enabled():
+    return _enabled
+
+
+def _entry_dir(file_path):
+    """Cache entry directory for a source path"""
+    key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+    return os.path.join(_cache_dir, key)
+
+
+def _content_hash(file_path, size):
+    """Hash the size plus head, middle and tail chunks of the file"""
+    digest = hashlib.blake2b(str(size).encode("ascii"), digest_size=16)
+    with open(file_path, "rb") as f:
+        for offset in (0, max(0, size // 2 - HASH_CHUNK_BYTES // 2), max(0, size - HASH_CHUNK_BYTES)):
+            f.seek(offset)
+            digest.update(f.read(HASH_CHUNK_BYTES))
+    return digest.hexdigest()
+
+
+def _source_key(file_path):
+    """Identity of the source file: path, size, mtime and content hash"""
+    stat = os.stat(file_path)
+    return {
+        "source": os.path.abspath(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "content_hash": _content_hash(file_path, stat.st_size),
+    }
+
+
+def load(file_path):
+    """Return the cached raw DataFrame for file_path, or None on a miss"""
+    if not _enabled:
+        return None
+    entry = _entry_dir(file_path)
+    header_path = os.path.join(entry, "header.json")
+    try:
+        with open(header_path, "r", encoding="utf-8") as f:
+            header = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        key = _source_key(file_path)
+        if header.get("version") != CACHE_VERSION or any(
+            header.get(name) != value for name, value in key.items()
+        ):
+            # Source LAS changed since it was cached
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        import numpy as np
+        import pandas as pd
+
+        columns = {}
+        for name, filename in zip(header["columns"], header["files"]):
+            columns[name] = np.load(os.path.join(entry, filename), mmap_mode="r")
+
+        # Mark as recently used for LRU eviction
+        os.utime(header_path, None)
+        return pd.DataFrame(columns, columns=header["columns"], copy=False)
+
+    except Exception as e:
+        print(f"LAS cache read failed, re-parsing: {e}")
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+
+
+def store(file_path, df):
+    """Write df (as returned by the LAS reader) to the cache"""
+    if not _enabled:
+        return
+    import numpy as np
+
+    entry = _entry_dir(file_path)
+    tmp_entry = f"{entry}.tmp{os.getpid()}"
+    try:
+        key = _source_key(file_path)
+        os.makedirs(tmp_entry, exist_ok=True)
+
+        columns = [str(col) for col in df.columns]
+        files = []
+        for idx, col in enumerate(df.columns):
+            filename = f"c{idx:03d}.npy"
+            values = np.ascontiguousarray(df[col].to_numpy(dtype=np.float64))
+            np.save(os.path.join(tmp_entry, filename), values)
+            files.append(filename)
+
+        header = dict(key, version=CACHE_VERSION, columns=columns, files=files,
+                      rows=len(df), created=time.time())
+        with open(os.path.join(tmp_entry, "header.json"), "w", encoding="utf-8") as f:
+            json.dump(header, f)
+
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp_entry, entry)
+        evict()
+
+    except Exception as e:
+        print(f"LAS cache write failed: {e}")
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+
+
+def _dir_size(path):
+    total = 0
+    for name in os.listdir(path):
+        try:
+            total += os.path.getsize(os.path.join(path, name))
+        except OSError:
+            pass
+    return total
+
+
+def evict(max_bytes=None):
+    """Drop least recently used entries until the cache fits under max_bytes"""
+    limit = _max_cache_bytes if max_bytes is None else max_bytes
+    if not os.path.isdir(_cache_dir):
+        return
+
+    entries = []
+    for name in os.listdir(_cache_dir):
+        path = os.path.join(_cache_dir, name)
+        header_path = os.path.join(path, "header.json")
+        if not os.path.isdir(path) or not os.path.exists(header_path):
+            continue
+        entries.append((os.path.getmtime(header_path), _dir_size(path), path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def clear():
+    """Remove every cached entry"""
+    shutil.rmtree(_cache_dir, ignore_errors=True)
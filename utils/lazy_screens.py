@@ -0,0 +1,112 @@
+# utils/lazy_screens.py - ScreenManager that imports and builds screens on first use
+import importlib
+import sys
+import threading
+import time
+
+from kivy.clock import Clock
+from kivy.lang import Builder
+from kivy.uix.screenmanager import ScreenManager
+
+# Screen name -> (module, class, KV file)
+SCREENS = {
+    "start": ("screens.start_screen", "StartScreen", "kv_files/start_screen.kv"),
+    "welllog": ("screens.welllog_screen", "WellLogScreen", "kv_files/welllog_screen.kv"),
+    "viewlog": ("screens.viewlog_screen", "ViewLogScreen", "kv_files/viewlog_screen.kv"),
+    "reservoir": ("screens.reservoir_screen", "ReservoirScreen", "kv_files/reservoir_screen.kv"),
+    "interpretation": ("screens.interpretation_screen", "InterpretationScreen",
+                       "kv_files/interpretation_screen.kv"),
+    "vshale": ("screens.vshale_screen", "VshaleScreen", "kv_files/vshale_screen.kv"),
+    "porosity": ("screens.porosity_screen", "PorosityScreen", "kv_files/porosity_screen.kv"),
+    "water_saturation": ("screens.water_saturation_screen", "WaterSaturationScreen",
+                         "kv_files/water_saturation_screen.kv"),
+}
+
+# Screens whose modules import matplotlib/pandas/numpy; they are only
+# prewarmed once a LAS file has been selected
+PLOT_SCREENS = ("viewlog", "reservoir", "vshale", "porosity", "water_saturation")
+
+# What the plot screens import besides Kivy; none of it loads KV rules,
+# so prewarm imports it on a thread
+BACKGROUND_IMPORTS = (
+    "numpy", "pandas", "matplotlib.pyplot", "matplotlib.backends.backend_agg",
+    "utils.petrophysics", "utils.intervals", "utils.decimation", "utils.plot_utils",
+    "utils.track_layout", "utils.track_cache", "utils.tile_renderer", "utils.report_renderer",
+)
+
+
+class LazyScreenManager(ScreenManager):
+    """
+    ScreenManager whose screens are registered by name only. A screen's
+    module import, KV rules and widget tree are created the first time it
+    is looked up, which covers change_screen, root.current = ... and
+    get_screen alike.
+    """
+
+    def __init__(self, registry=SCREENS, **kwargs):
+        self.registry = dict(registry)
+        self.build_times = {}
+        self._loaded_kv = set()
+        super().__init__(**kwargs)
+
+    def get_screen(self, name):
+        if not self.has_screen(name) and name in self.registry:
+            self.build_screen(name)
+        return super().get_screen(name)
+
+    def build_screen(self, name):
+        """Import, load KV for and construct the screen registered under name"""
+        start = time.perf_counter()
+        module_name, class_name, kv_file = self.registry[name]
+        screen_class = getattr(importlib.import_module(module_name), class_name)
+
+        if kv_file not in self._loaded_kv:
+            Builder.load_file(kv_file)
+            self._loaded_kv.add(kv_file)
+
+        screen = screen_class(name=name)
+        self.add_widget(screen)
+
+        self.build_times[name] = time.perf_counter() - start
+        print(f"Built screen '{name}' in {self.build_times[name] * 1000:.0f} ms")
+        return screen
+
+    def prewarm(self, names=None):
+        """
+        Build the remaining screens in the background after the first frame.
+        Only libraries that do not touch Kivy are imported on a thread, since
+        the screen modules pull in KivyMD widgets that load KV rules and
+        Builder is not thread-safe; each screen module is then imported on
+        the main thread and its screen constructed in the following frame.
+        """
+        pending = [name for name in (names or self.registry) if not self.has_screen(name)]
+        if not pending:
+            return
+
+        def build_next(dt):
+            while pending and self.has_screen(pending[0]):
+                pending.pop(0)
+            if not pending:
+                return
+            module_name = self.registry[pending[0]][0]
+            if module_name not in sys.modules:
+                try:
+                    importlib.import_module(module_name)
+                except Exception as e:
+                    print(f"Prewarm import failed for '{pending.pop(0)}': {e}")
+            else:
+                self.build_screen(pending.pop(0))
+            Clock.schedule_once(build_next, 0)
+
+        def import_libraries():
+            for module_name in BACKGROUND_IMPORTS:
+                try:
+                    importlib.import_module(module_name)
+                except Exception as e:
+                    print(f"Prewarm import failed for '{module_name}': {e}")
+            Clock.schedule_once(build_next, 0)
+
+        if any(name in PLOT_SCREENS for name in pending):
+            threading.Thread(target=import_libraries, name="prewarm", daemon=True).start()
+        else:
+            Clock.schedule_once(build_next, 0)
@@ -0,0 +1,98 @@
+# utils/memory_budget.py - Memory ceiling for plot screens with LRU eviction
+"""
+Every plot screen keeps its figure and tile textures after it is left, so
+visiting all of them on a long well adds up. MemoryBudget tracks when
+each screen was last shown and, while the estimated memory of the
+screens plus the dataset and track caches exceeds the ceiling, releases
+the plots of screens that are not current, least recently shown first,
+then the oldest cached track tiles and datasets. A released screen
+rebuilds its tracks from the dataset cache on its next on_enter; the
+newest dataset is always kept, as the current screen draws from it.
+
+Sizes are the estimates of utils.memory_report: RSS itself does not drop
+promptly when Python frees memory, so it cannot steer eviction. Figures
+are only walked while the render worker is idle; otherwise a screen's
+last measured figure size stands in.
+"""
+import itertools
+
+from utils.memory_report import cached_ids, format_bytes, screen_memory
+
+
+class MemoryBudget:
+    """Least-recently-shown eviction of screen plots above max_bytes"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._over = False
+        self._clock = itertools.count(1)
+        self._last_shown = {}
+        self._figure_bytes = {}
+
+    def touch(self, name):
+        """Record that screen name is being shown"""
+        self._last_shown[name] = next(self._clock)
+
+    def usage(self, screens, dataset_cache=None, track_cache=None, measure_figures=True):
+        """(total bytes, {screen name: bytes}) of the screens and the caches"""
+        shared = cached_ids(dataset_cache)
+        sizes = {}
+        for screen in screens:
+            entry = screen_memory(screen, shared, measure_figures)
+            if entry["figure"] is not None:
+                self._figure_bytes[screen.name] = entry["figure"]
+            elif entry["figures"]:
+                entry["total"] += self._figure_bytes.get(screen.name, 0)
+            sizes[screen.name] = entry["total"]
+        total = sum(sizes.values())
+        if dataset_cache is not None:
+            total += dataset_cache.total_bytes()
+        if track_cache is not None:
+            total += track_cache.total_bytes()
+        return total, sizes
+
+    def enforce(self, screens, current, dataset_cache=None, track_cache=None,
+                measure_figures=True):
+        """Release non-current screens, then old cache entries, until under budget; returns what was released"""
+        total, sizes = self.usage(screens, dataset_cache, track_cache, measure_figures)
+        if total <= self.max_bytes:
+            self._over = False
+            return []
+
+        released = []
+        candidates = [s for s in screens
+                      if s.name != current and sizes[s.name] > 0 and hasattr(s, "release_plots")]
+        for screen in sorted(candidates, key=lambda s: self._last_shown.get(s.name, 0)):
+            if total <= self.max_bytes:
+                break
+            screen.release_plots()
+            total -= sizes[screen.name]
+            released.append(screen.name)
+            self.evictions += 1
+
+        # Screens alone may not get there: the caches are budgeted too
+        for cache, label in ((track_cache, "track tiles"), (dataset_cache, "datasets")):
+            freed = 0
+            while cache is not None and total > self.max_bytes:
+                nbytes = cache.evict_oldest()
+                if not nbytes:
+                    break
+                total -= nbytes
+                freed += nbytes
+                self.evictions += 1
+            if freed:
+                released.append(f"{label} ({format_bytes(freed)})")
+
+        if released:
+            print(f"Memory budget: released {', '.join(released)}; "
+                  f"{format_bytes(total)} of {format_bytes(self.max_bytes)} in use")
+        elif total > self.max_bytes and not self._over:
+            # Said once until usage drops again; enforce runs periodically
+            self._over = True
+            print(f"Memory budget: {format_bytes(total)} in use, over "
+                  f"{format_bytes(self.max_bytes)} with nothing left to release")
+        return released
+
+    def stats(self):
+        return {"max_bytes": self.max_bytes, "evictions": self.evictions}
@@ -0,0 +1,78 @@
+# utils/memory_overlay.py - Debug overlay with live memory totals per screen
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp
+from kivy.uix.label import Label
+
+from utils import memory_report
+
+REFRESH_SECONDS = 2.0
+GROWTH_LINES = 3
+
+
+class MemoryOverlay(Label):
+    """
+    Semi-transparent text box over every screen with RSS, the dataset
+    cache and what each screen keeps alive (see utils.memory_report).
+    With tracemalloc running it also lists the lines that allocated the
+    most since the overlay was opened, and the RSS change since then.
+    """
+
+    def __init__(self, app, tracemalloc=False, **kwargs):
+        kwargs.setdefault("font_size", dp(11))
+        kwargs.setdefault("halign", "left")
+        kwargs.setdefault("valign", "top")
+        kwargs.setdefault("size_hint", (None, None))
+        super().__init__(**kwargs)
+        self.app = app
+        self.tracemalloc = tracemalloc
+        self._event = None
+        self._start_rss = None
+
+        with self.canvas.before:
+            Color(0, 0, 0, 0.65)
+            self._background = Rectangle(pos=self.pos, size=self.size)
+        self.bind(texture_size=self._fit, pos=self._redraw, size=self._redraw)
+
+    def _fit(self, *args):
+        self.size = self.texture_size[0] + dp(12), self.texture_size[1] + dp(8)
+        self.pos = (dp(4), Window.height - self.height - dp(4))
+
+    def _redraw(self, *args):
+        self._background.pos = self.pos
+        self._background.size = self.size
+
+    def show(self):
+        if self.parent is None:
+            Window.add_widget(self)
+        if self.tracemalloc:
+            memory_report.start_tracemalloc()
+        self._start_rss = memory_report.process_rss()
+        self.refresh()
+        self._event = Clock.schedule_interval(self.refresh, REFRESH_SECONDS)
+
+    def hide(self):
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        if self.tracemalloc:
+            memory_report.stop_tracemalloc()
+        if self.parent is not None:
+            Window.remove_widget(self)
+
+    def is_shown(self):
+        return self.parent is not None
+
+    def refresh(self, *args):
+        report = memory_report.app_memory_report(self.app)
+        lines = memory_report.format_report(report)
+        if report["rss"] is not None and self._start_rss is not None:
+            lines[0] += f"  ({memory_report.format_bytes(report['rss'] - self._start_rss)} since open)"
+        for size, count, where in memory_report.top_growth(GROWTH_LINES):
+            lines.append(f"+{memory_report.format_bytes(size)} ({count:+d}) {where}")
+        self.text = "\n".join(lines)
+        if self.parent is not None:
+            # Stay on top of screens added after the overlay
+            Window.remove_widget(self)
+            Window.add_widget(self)
@@ -0,0 +1,224 @@
+# utils/memory_report.py - Live memory per screen: figures, Agg buffers, textures, data
+"""
+Estimates of what each screen keeps alive after it is left:
+    figure   line/collection/image data of its matplotlib figures
+    agg      the Agg render buffer of its tiled canvases
+    textures the GPU tile textures of its tiled canvases
+    data     derived curves held by its report data (dataset columns and
+             cached curves are counted once, under the dataset cache)
+plus the shared track tile cache, the process RSS and, when started, tracemalloc totals and the
+source lines whose allocations grew since a baseline snapshot.
+
+No Kivy imports: the report is built from plain attributes, so it also
+works on screens of the headless tools.
+"""
+import os
+import tracemalloc
+
+TRACEMALLOC_FRAMES = 1
+
+
+# ========== ESTIMATES ==========
+
+def array_bytes(value):
+    """nbytes of an array or Series (0 for anything else)"""
+    if value is None:
+        return 0
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    return 0
+
+
+def figure_bytes(fig):
+    """Data arrays held by the artists of a matplotlib figure"""
+    import numpy as np
+
+    total = 0
+    for ax in fig.axes:
+        for line in ax.lines:
+            total += array_bytes(np.asarray(line.get_xdata(orig=False)))
+            total += array_bytes(np.asarray(line.get_ydata(orig=False)))
+        for collection in ax.collections:
+            for path in collection.get_paths():
+                total += array_bytes(path.vertices)
+        for image in ax.images:
+            total += array_bytes(image.get_array())
+    return total
+
+
+def agg_bytes(tiler):
+    """Size of the RGBA buffer of a FigureTiler's Agg renderer, once it has drawn"""
+    renderer = getattr(tiler.canvas, "renderer", None)
+    if renderer is None:
+        return 0
+    return int(renderer.width) * int(renderer.height) * 4
+
+
+def texture_bytes(view):
+    """(count, bytes) of the RGBA tile textures held by a TiledTrackView"""
+    textures = list(getattr(view, "_textures", {}).values())
+    textures += list(getattr(view, "_previous", {}).values())
+    return len(textures), sum(int(t.width) * int(t.height) * 4 for t in textures)
+
+
+def curve_bytes(curves, exclude_ids=()):
+    """Bytes of the derived curves in a ReportData.curves dict, skipping shared arrays"""
+    seen = set(exclude_ids)
+    total = 0
+    for value in (curves or {}).values():
+        if value is None or id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += array_bytes(value)
+    return total
+
+
+def cached_ids(dataset_cache):
+    """ids of every DataFrame and derived array held by the dataset cache"""
+    ids = set()
+    if dataset_cache is None:
+        return ids
+    for dataset in dataset_cache.datasets():
+        ids.add(id(dataset.df))
+        for value in dataset.derived_values():
+            for item in (value if isinstance(value, tuple) else (value,)):
+                ids.add(id(item))
+    return ids
+
+
+def screen_memory(screen, shared_ids=(), measure_figures=True):
+    """
+    Estimated live bytes held by one screen, by kind. Without
+    measure_figures the figures are only counted: their artists may be
+    changing on the render worker, so "figure" is None and left out of
+    the total.
+    """
+    entry = {"screen": screen.name, "figures": 0, "figure": 0, "agg": 0,
+             "textures": 0, "texture": 0, "data": 0}
+
+    figures = list(getattr(screen, "current_figures", []) or [])
+    entry["figures"] = len(figures)
+    entry["figure"] = sum(figure_bytes(fig) for fig in figures) if measure_figures else None
+
+    for view in list(getattr(screen, "current_canvases", []) or []):
+        tiler = getattr(view, "tiler", None)
+        if tiler is not None:
+            entry["agg"] += agg_bytes(tiler)
+        count, nbytes = texture_bytes(view)
+        entry["textures"] += count
+        entry["texture"] += nbytes
+
+    report = getattr(screen, "report_data", None)
+    if report is not None:
+        entry["data"] = curve_bytes(report.curves, shared_ids)
+        if id(report.df) not in shared_ids:
+            entry["data"] += int(report.df.memory_usage(index=True, deep=False).sum())
+
+    entry["total"] = (entry["figure"] or 0) + entry["agg"] + entry["texture"] + entry["data"]
+    return entry
+
+
+def process_rss():
+    """Resident set size of this process in bytes (None where unknown)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is the peak, in KiB on Linux; better than nothing elsewhere
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def memory_report(screens, dataset_cache=None, track_cache=None, measure_figures=True):
+    """Per-screen estimates plus dataset and track caches, RSS and tracemalloc totals"""
+    shared = cached_ids(dataset_cache)
+    entries = [screen_memory(screen, shared, measure_figures) for screen in screens]
+    report = {
+        "screens": entries,
+        "screens_total": sum(e["total"] for e in entries),
+        "datasets": dataset_cache.total_bytes() if dataset_cache is not None else 0,
+        "track_tiles": track_cache.total_bytes() if track_cache is not None else 0,
+        "rss": process_rss(),
+        "tracemalloc": None,
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        report["tracemalloc"] = {"current": current, "peak": peak}
+    return report
+
+
+def app_memory_report(app):
+    """
+    memory_report for every screen the app's LazyScreenManager has built;
+    figures are measured only while the render worker is idle
+    """
+    pipeline = getattr(app, "render_pipeline", None)
+    return memory_report(list(app.root.screens), getattr(app, "dataset_cache", None),
+                         getattr(app, "track_cache", None),
+                         measure_figures=pipeline is None or pipeline.is_idle())
+
+
+# ========== TRACEMALLOC ==========
+
+_baseline = None
+
+
+def start_tracemalloc(frames=TRACEMALLOC_FRAMES):
+    """Start tracing Python and NumPy allocations and take the baseline snapshot"""
+    global _baseline
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    _baseline = tracemalloc.take_snapshot()
+
+
+def stop_tracemalloc():
+    global _baseline
+    _baseline = None
+    tracemalloc.stop()
+
+
+def top_growth(limit=10):
+    """(size diff, count diff, 'file:line') of the lines that grew most since the baseline"""
+    if _baseline is None or not tracemalloc.is_tracing():
+        return []
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ])
+    stats = snapshot.compare_to(_baseline, "lineno")
+    return [(stat.size_diff, stat.count_diff, str(stat.traceback[0]))
+            for stat in stats[:limit] if stat.size_diff > 0]
+
+
+# ========== FORMATTING ==========
+
+def format_bytes(nbytes):
+    if nbytes is None:
+        return "?"
+    for unit in ("B", "KB", "MB"):
+        if abs(nbytes) < 1024:
+            return f"{nbytes:.0f} {unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f} GB"
+
+
+def format_report(report):
+    """Text lines of a memory_report: totals first, then the screens holding memory"""
+    lines = [f"RSS {format_bytes(report['rss'])}  screens {format_bytes(report['screens_total'])}"
+             f"  datasets {format_bytes(report['datasets'])}"
+             f"  track tiles {format_bytes(report['track_tiles'])}"]
+    if report["tracemalloc"] is not None:
+        lines.append(f"tracemalloc {format_bytes(report['tracemalloc']['current'])}"
+                     f" (peak {format_bytes(report['tracemalloc']['peak'])})")
+    for e in sorted(report["screens"], key=lambda e: e["total"], reverse=True):
+        if e["total"] == 0:
+            continue
+        lines.append(f"{e['screen']}: {format_bytes(e['total'])} = fig {format_bytes(e['figure'])}"
+                     f" ({e['figures']}) agg {format_bytes(e['agg'])}"
+                     f" tex {format_bytes(e['texture'])} ({e['textures']})"
+                     f" data {format_bytes(e['data'])}")
+    return lines
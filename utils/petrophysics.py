@@ -0,0 +1,124 @@
+# utils/petrophysics.py - Petrophysics engine (no Kivy, NumPy arrays in/out)
+"""
+Array kernels for porosity, shale volume and Archie water saturation.
+Every kernel takes 1-D float arrays and accepts an optional preallocated
+out= buffer so repeated calls do not allocate.
+"""
+import numpy as np
+
+from utils.tracing import traced
+
+RHO_MATRIX = 2.65   # g/cm³ (sandstone matrix)
+RHO_FLUID = 1.0     # g/cm³ (fresh water)
+ARCHIE_A = 0.62
+ARCHIE_RW = 0.1     # ohm.m
+GR_CLEAN_QUANTILE = 0.10
+GR_SHALE_QUANTILE = 0.90
+
+
+def as_array(values):
+    """Return values as a contiguous float64 array (no copy when possible)"""
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+
+
+def _output(values, out):
+    if out is None:
+        return np.empty_like(values)
+    return out
+
+
+def nan_max(values):
+    """Max ignoring NaN; NaN when there is no valid sample"""
+    if values.size == 0:
+        return np.nan
+    return np.fmax.reduce(values)
+
+
+def density_porosity(rhob, rho_matrix=RHO_MATRIX, rho_fluid=RHO_FLUID, lower=0.0, out=None):
+    """Density porosity clipped to [lower, 1]"""
+    rhob = as_array(rhob)
+    out = _output(rhob, out)
+    np.subtract(rho_matrix, rhob, out=out)
+    np.divide(out, rho_matrix - rho_fluid, out=out)
+    np.clip(out, lower, 1, out=out)
+    return out
+
+
+def neutron_fraction(nphi, out=None):
+    """Neutron porosity as v/v, converting from percent when needed"""
+    nphi = as_array(nphi)
+    if nan_max(nphi) > 1:
+        out = _output(nphi, out)
+        np.divide(nphi, 100, out=out)
+        return out
+    if out is not None:
+        out[...] = nphi
+        return out
+    return nphi
+
+
+@traced("petrophysics.total_porosity")
+def total_porosity(rhob, nphi=None, rho_matrix=RHO_MATRIX, rho_fluid=RHO_FLUID,
+                   density_lower=0.0, out=None):
+    """Density-neutron average porosity (density only when nphi is None)"""
+    out = density_porosity(rhob, rho_matrix, rho_fluid, lower=density_lower, out=out)
+    if nphi is not None:
+        np.add(out, neutron_fraction(nphi), out=out)
+        np.divide(out, 2, out=out)
+    return out
+
+
+@traced("petrophysics.gr_clean_shale")
+def gr_clean_shale(gr, clean_quantile=GR_CLEAN_QUANTILE, shale_quantile=GR_SHALE_QUANTILE):
+    """Clean sand and shale GR picks from quantiles of the valid samples"""
+    gr = as_array(gr)
+    valid = gr[~np.isnan(gr)]
+    if valid.size == 0:
+        return None, None
+    gr_clean, gr_shale = np.quantile(valid, [clean_quantile, shale_quantile])
+    return float(gr_clean), float(gr_shale)
+
+
+@traced("petrophysics.vshale_linear")
+def vshale_linear(gr, gr_clean, gr_shale, out=None):
+    """Linear GR index shale volume clipped to [0, 1]"""
+    gr = as_array(gr)
+    out = _output(gr, out)
+    np.subtract(gr, gr_clean, out=out)
+    np.divide(out, gr_shale - gr_clean, out=out)
+    np.clip(out, 0, 1, out=out)
+    return out
+
+
+@traced("petrophysics.archie_inputs")
+def archie_inputs(phi, rt, phi_range=(0.01, 1.0), rt_range=(0.1, 10000)):
+    """Clipped porosity and resistivity, reusable across Archie m/n changes"""
+    return (np.clip(as_array(phi), phi_range[0], phi_range[1]),
+            np.clip(as_array(rt), rt_range[0], rt_range[1]))
+
+
+@traced("petrophysics.archie_sw")
+def archie_sw(phi, rt, m, n, rw=ARCHIE_RW, a=ARCHIE_A,
+              phi_range=(0.01, 1.0), rt_range=(0.1, 10000), out=None):
+    """
+    Archie water saturation Sw = (a*Rw / (phi^m * Rt))^(1/n), clipped to [0, 1].
+    phi_range/rt_range clip the inputs first; pass None to skip.
+    """
+    phi = as_array(phi)
+    rt = as_array(rt)
+    out = _output(phi, out)
+
+    if phi_range is not None:
+        np.clip(phi, phi_range[0], phi_range[1], out=out)
+        np.power(out, m, out=out)
+    else:
+        np.power(phi, m, out=out)
+
+    if rt_range is not None:
+        rt = np.clip(rt, rt_range[0], rt_range[1])
+    np.multiply(out, rt, out=out)
+
+    np.divide(a * rw, out, out=out)
+    np.power(out, 1 / n, out=out)
+    np.clip(out, 0, 1, out=out)
+    return out
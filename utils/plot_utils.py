@@ -2,7 +2,55 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from matplotlib.collections import PolyCollection
 from utils.constants import COLORS
+from utils.decimation import decimate_curve
+from utils.tracing import traced
+
+# Per-screen look of the data tracks: the reservoir and water saturation
+# screens share the reservoir style, the log viewer keeps its larger fonts
+# and minor grid, the porosity and Vshale screens their plain matplotlib axes
+TRACK_STYLES = {
+    'interpretation': {
+        'title_size': 10,
+        'title_pad': 8,
+        'title_color': COLORS['text'],
+        'label_size': 9,
+        'legend_size': 7,
+        'frame': True,
+        'grid': 'major',
+        'density_neutron_ticks': True,
+        'neutron_color': True,
+        'shale_fill': True,
+    },
+    'overview': {
+        'title_size': 11,
+        'title_pad': 10,
+        'title_color': COLORS['text'],
+        'label_size': 10,
+        'legend_size': 8,
+        'frame': True,
+        'grid': 'minor',
+        'density_neutron_ticks': True,
+        'neutron_color': True,
+        'shale_fill': True,
+    },
+    'plain': {
+        'title_size': 10,
+        'title_pad': None,
+        'title_color': None,
+        'label_size': 9,
+        'legend_size': 7,
+        'frame': False,
+        'grid': None,
+        'density_neutron_ticks': False,
+        'neutron_color': False,
+        'shale_fill': False,
+    },
+}
+
+# gid of the PolyCollection holding a track's reservoir interval shading
+INTERVAL_GID = 'reservoir_intervals'
 
 # ========== HELPER FUNCTIONS FOR CONSISTENT STYLING ==========
 
@@ -10,206 +58,372 @@ def apply_consistent_grid(ax):
     """Apply consistent grid styling to an axis"""
     ax.grid(True, which='both', linestyle='--', linewidth=0.5, alpha=0.7, color=COLORS['grid'])
     ax.set_axisbelow(True)  # Grid behind data
-    
+
     # Add minor grid
     ax.minorticks_on()
     ax.grid(True, which='minor', linestyle=':', linewidth=0.3, alpha=0.4, color=COLORS['grid'])
-    
+
     return ax
 
 def apply_consistent_style(ax):
     """Apply consistent styling to an axis"""
     # Set background
     ax.set_facecolor(COLORS['background'])
-    
+
     # Add border
     for spine in ax.spines.values():
         spine.set_linewidth(1)
         spine.set_color('#333333')
-    
+
     return ax
 
-# ========== MAIN PLOTTING FUNCTIONS ==========
+def set_track_title(ax, title, style='interpretation'):
+    params = TRACK_STYLES[style]
+    kwargs = {'fontsize': params['title_size'], 'fontweight': 'bold'}
+    if params['title_pad'] is not None:
+        kwargs['pad'] = params['title_pad']
+    if params['title_color'] is not None:
+        kwargs['color'] = params['title_color']
+    ax.set_title(title, **kwargs)
 
-def create_consistent_plot(df, depth_min, depth_max, fig_height_inches, show_reservoir=False, cut_off=None, intervals=None):
-    """Create plots with consistent styling"""
-    fig_gr, ax_gr = plt.subplots(figsize=(4, fig_height_inches))
-    fig_nd, ax_nd = plt.subplots(figsize=(4, fig_height_inches))
-    fig_res, ax_res = plt.subplots(figsize=(4, fig_height_inches))
+def style_track(ax, title, depth_min, depth_max, style='interpretation'):
+    """Background, grid, title, depth axis and border shared by every data track"""
+    params = TRACK_STYLES[style]
+
+    if params['frame']:
+        apply_consistent_style(ax)
+    if params['grid'] == 'minor':
+        apply_consistent_grid(ax)
+    elif params['grid'] == 'major':
+        ax.grid(True, which='both', linestyle='--',
+               linewidth=0.5, alpha=0.7, color=COLORS['grid'])
+        ax.set_axisbelow(True)
+
+    ax.set_xlabel("")
+    set_track_title(ax, title, style)
+    if params['frame']:
+        ax.set_ylabel("Depth (m)", fontsize=params['label_size'], fontweight='bold')
+    ax.set_ylim(depth_max, depth_min)
+    return ax
+
+def set_track_scale(ax, xmin, xmax, ticks, labels=None):
+    """Fix the x range and bottom tick labels of a track"""
+    ax.set_xlim(xmin, xmax)
+    ax.set_xticks(ticks)
+    ax.set_xticklabels(labels if labels is not None else [f"{t:g}" for t in ticks])
+
+def shade_intervals(ax, intervals, label=None, color=None, alpha=0.4):
+    """
+    Shade reservoir intervals across the full track width as a single
+    PolyCollection (x in axes fraction, y in depth), so a track has one
+    shading artist however many intervals there are
+    """
+    if not intervals:
+        return None
+    bounds = np.asarray([(top, bottom) for top, bottom, *_ in intervals], dtype=np.float64)
+    top = bounds[:, 0]
+    bottom = bounds[:, 1]
+    verts = np.empty((len(bounds), 4, 2))
+    verts[:, :, 0] = (0, 1, 1, 0)
+    verts[:, 0, 1] = top
+    verts[:, 1, 1] = top
+    verts[:, 2, 1] = bottom
+    verts[:, 3, 1] = bottom
+
+    shading = PolyCollection(verts, transform=ax.get_yaxis_transform(),
+                             facecolors=color or COLORS['sand'], edgecolors='none',
+                             alpha=alpha, label=label or "_nolegend_", zorder=1)
+    shading.set_gid(INTERVAL_GID)
+    ax.add_collection(shading, autolim=False)
+    return shading
+
+def unavailable_track(ax, message, title, style='interpretation'):
+    """Placeholder for a track whose curve could not be computed"""
+    ax.text(0.5, 0.5, message, transform=ax.transAxes,
+           ha='center', va='center', fontsize=10)
+    set_track_title(ax, title, style)
+    if TRACK_STYLES[style]['frame']:
+        apply_consistent_style(ax)
+
+# ========== TRACK DRAWERS ==========
+# Each drawer renders one track into an existing axis, so the same code
+# serves one-figure-per-track plots and the shared multi-track figure.
+
+@traced("figure.draw_gamma_ray_track")
+def draw_gamma_ray_track(ax, depth, gamma_ray, depth_min, depth_max, lod_rows,
+                         cut_off=None, intervals=None, low_gr_fill=False, style='interpretation'):
+    """Gamma Ray track with optional cut-off line and reservoir shading"""
+    gr_x, gr_y = decimate_curve(depth, gamma_ray, lod_rows)
+    ax.plot(gr_x, gr_y,
+           color=COLORS['gamma_ray'],
+           linewidth=1.5,
+           label="Gamma Ray")
 
-    plt.style.use('default')
-    
-    # ========== GAMMA RAY PLOT ==========
-    ax_gr.plot(df["Gamma Ray"], df["Depth"], 
-              color=COLORS['gamma_ray'], 
-              linewidth=1.5, 
-              label="Gamma Ray")
-    
     if cut_off is not None:
-        ax_gr.axvline(x=cut_off, color=COLORS['cutoff_line'], 
-                     linestyle='--', linewidth=2, 
-                     label=f"Cut-off: {cut_off:.1f} gAPI")
-    
-    if intervals:
-        for top, bottom, min_g, max_g in intervals:
-            ax_gr.axhspan(top, bottom, color=COLORS['sand'], alpha=0.4, 
-                         label='Reservoir' if top == intervals[0][0] else "")
-    
-    ax_gr.set_xlabel("")
-    ax_gr.set_title("Gamma Ray\n(gAPI)", fontsize=11, fontweight='bold', pad=10, color=COLORS['text'])
-    ax_gr.set_ylabel("Depth (m)", fontsize=10, fontweight='bold')
-    ax_gr.set_ylim(depth_max, depth_min)
-    
-    # Set Gamma Ray axis range and ticks
-    ax_gr.set_xlim(0, 200)
-    ax_gr.set_xticks([0, 50, 100, 150, 200])
-    ax_gr.set_xticklabels(["0", "50", "100", "150", "200"])
-    
-    # Apply consistent styling
-    ax_gr = apply_consistent_style(ax_gr)
-    ax_gr = apply_consistent_grid(ax_gr)
-    
-    if not show_reservoir and not intervals:
-        gr_median = df["Gamma Ray"].median()
-        ax_gr.fill_betweenx(df["Depth"], 0, df["Gamma Ray"], 
-                          where=df["Gamma Ray"] < gr_median,
-                          color=COLORS['sand'], alpha=0.3, 
-                          label='Low GR (Potential Sand)')
-    
-    ax_gr.legend(loc="upper right", fontsize=8, framealpha=0.9)
-
-    # ========== NEUTRON-DENSITY PLOT ==========
-    ax_nd.plot(df["Density"], df["Depth"], 
-              color=COLORS['density'], 
-              linewidth=1.5, 
-              label="Density (RHOB)")
-    
-    if intervals:
-        for top, bottom, min_g, max_g in intervals:
-            ax_nd.axhspan(top, bottom, color=COLORS['sand'], alpha=0.4)
-    
-    ax_nd.set_xlabel("")
-    ax_nd.set_title("Density / Neutron\n(g/cm³)    (v/v)", 
-                   fontsize=11, fontweight='bold', pad=10, color=COLORS['text'])
-    ax_nd.set_ylim(depth_max, depth_min)
-    
-    # Set Density axis range and ticks
-    ax_nd.set_xlim(1.85, 2.85)
-    ax_nd.set_xticks([1.85, 2.0, 2.2, 2.4, 2.6, 2.85])
-    ax_nd.set_xticklabels(["1.85", "2.0", "2.2", "2.4", "2.6", "2.85"])
-    
-    ax_nd.set_ylabel("Depth (m)", fontsize=10, fontweight='bold')
-    
-    # Apply consistent styling
-    ax_nd = apply_consistent_style(ax_nd)
-    ax_nd = apply_consistent_grid(ax_nd)
+        ax.axvline(x=cut_off, color=COLORS['cutoff_line'],
+                  linestyle='--', linewidth=2,
+                  label=f"Cut-off: {cut_off:.1f} gAPI")
+
+    shade_intervals(ax, intervals, label='Reservoir')
+
+    style_track(ax, "Gamma Ray\n(gAPI)", depth_min, depth_max, style)
+    set_track_scale(ax, 0, 200, [0, 50, 100, 150, 200])
+
+    if low_gr_fill:
+        gr_median = np.nanmedian(np.asarray(gamma_ray, dtype=np.float64))
+        ax.fill_betweenx(gr_y, 0, gr_x,
+                        where=gr_x < gr_median,
+                        color=COLORS['sand'], alpha=0.3,
+                        label='Low GR (Potential Sand)')
+
+    ax.legend(loc="upper right", fontsize=TRACK_STYLES[style]['legend_size'], framealpha=0.9)
+    return ax
+
+@traced("figure.draw_density_neutron_track")
+def draw_density_neutron_track(ax, depth, density, neutron, depth_min, depth_max, lod_rows,
+                               intervals=None, style='interpretation'):
+    """Density track with Neutron on a twin x axis; returns the twin axis"""
+    rhob_x, rhob_y = decimate_curve(depth, density, lod_rows)
+    nphi_x, nphi_y = decimate_curve(depth, neutron, lod_rows)
+
+    ax.plot(rhob_x, rhob_y,
+           color=COLORS['density'],
+           linewidth=1.5,
+           label="Density (RHOB)")
+
+    shade_intervals(ax, intervals)
+
+    params = TRACK_STYLES[style]
+    style_track(ax, "Density / Neutron\n(g/cm³)    (v/v)", depth_min, depth_max, style)
+    if params['density_neutron_ticks']:
+        set_track_scale(ax, 1.85, 2.85, [1.85, 2.0, 2.2, 2.4, 2.6, 2.85],
+                        ["1.85", "2.0", "2.2", "2.4", "2.6", "2.85"])
+    else:
+        ax.set_xlim(1.85, 2.85)
 
     # Neutron plot on twin axis
-    twin_ax = ax_nd.twiny()
-    twin_ax.plot(df["Neutron"], df["Depth"], 
-                color=COLORS['neutron'], 
-                linewidth=1.5, 
-                linestyle="-", 
+    twin_ax = ax.twiny()
+    twin_ax.plot(nphi_x, nphi_y,
+                color=COLORS['neutron'],
+                linewidth=1.5,
+                linestyle="-",
                 label="Neutron (NPHI)")
-    
+
     twin_ax.set_xlabel("")
-    
-    # Set Neutron axis range and ticks
-    twin_ax.set_xlim(0, 0.45)
-    twin_ax.set_xticks([0, 0.1, 0.2, 0.3, 0.4, 0.45])
-    twin_ax.set_xticklabels(["0", "0.1", "0.2", "0.3", "0.4", "0.45"])
-    
-    # Style the twin axis
-    twin_ax.spines['top'].set_color(COLORS['neutron'])
-    twin_ax.xaxis.label.set_color(COLORS['neutron'])
-    twin_ax.tick_params(axis='x', colors=COLORS['neutron'])
+    if params['density_neutron_ticks']:
+        set_track_scale(twin_ax, 0, 0.45, [0, 0.1, 0.2, 0.3, 0.4, 0.45])
+    else:
+        twin_ax.set_xlim(0, 0.45)
+
+    if params['neutron_color']:
+        twin_ax.spines['top'].set_color(COLORS['neutron'])
+        twin_ax.xaxis.label.set_color(COLORS['neutron'])
+        twin_ax.tick_params(axis='x', colors=COLORS['neutron'])
     twin_ax.grid(False)  # Don't grid the twin axis
 
-    handles1, labels1 = ax_nd.get_legend_handles_labels()
+    handles1, labels1 = ax.get_legend_handles_labels()
     handles2, labels2 = twin_ax.get_legend_handles_labels()
-    all_handles = handles1 + handles2
-    all_labels = labels1 + labels2
-    ax_nd.legend(all_handles, all_labels, loc="upper right", fontsize=8, framealpha=0.9)
-
-    # ========== RESISTIVITY PLOT ==========
-    ax_res.semilogx(df["Resistivity"], df["Depth"], 
-                   color=COLORS['resistivity'], 
-                   linewidth=1.5, 
-                   label="Resistivity")
-    
-    if intervals:
-        for top, bottom, min_g, max_g in intervals:
-            ax_res.axhspan(top, bottom, color=COLORS['sand'], alpha=0.4)
-    
-    ax_res.set_xscale("log")
-    ax_res.set_xlabel("")
-    ax_res.set_title("Resistivity\n(ohm.m)", fontsize=11, fontweight='bold', pad=10, color=COLORS['text'])
-    ax_res.set_ylabel("Depth (m)", fontsize=10, fontweight='bold')
-    ax_res.set_ylim(depth_max, depth_min)
-    
-    # Set Resistivity axis range and ticks
-    ax_res.set_xlim(0.2, 200)
-    ax_res.set_xticks([0.2, 1, 10, 100, 200])
-    ax_res.set_xticklabels(["0.2", "1", "10", "100", "200"])
-    
-    # Apply consistent styling
-    ax_res = apply_consistent_style(ax_res)
-    ax_res = apply_consistent_grid(ax_res)
-    
-    # Add resistivity reference lines with consistent style
-    ax_res.axvline(x=10, color='blue', linestyle=':', 
-                  linewidth=1, alpha=0.5, label='Water Baseline')
-    ax_res.axvline(x=50, color='green', linestyle=':', 
-                  linewidth=1, alpha=0.5, label='Pay Indicator')
-    
-    ax_res.legend(loc="upper right", fontsize=8, framealpha=0.9)
+    ax.legend(handles1 + handles2, labels1 + labels2,
+             loc="upper right", fontsize=TRACK_STYLES[style]['legend_size'], framealpha=0.9)
+    return twin_ax
 
-    return fig_gr, ax_gr, fig_nd, ax_nd, fig_res, ax_res
+@traced("figure.draw_resistivity_track")
+def draw_resistivity_track(ax, depth, resistivity, depth_min, depth_max, lod_rows,
+                           intervals=None, style='interpretation'):
+    """Log-scale Resistivity track with water/pay reference lines"""
+    res_x, res_y = decimate_curve(depth, resistivity, lod_rows)
+    ax.semilogx(res_x, res_y,
+               color=COLORS['resistivity'],
+               linewidth=1.5,
+               label="Resistivity")
+
+    shade_intervals(ax, intervals)
+
+    style_track(ax, "Resistivity\n(ohm.m)", depth_min, depth_max, style)
+    ax.set_xscale("log")
+    set_track_scale(ax, 0.2, 200, [0.2, 1, 10, 100, 200])
+
+    ax.axvline(x=10, color='blue', linestyle=':',
+              linewidth=1, alpha=0.5, label='Water Baseline')
+    ax.axvline(x=50, color='green', linestyle=':',
+              linewidth=1, alpha=0.5, label='Pay Indicator')
+    ax.legend(loc="upper right", fontsize=TRACK_STYLES[style]['legend_size'], framealpha=0.9)
+    return ax
+
+@traced("figure.draw_porosity_track")
+def draw_porosity_track(ax, depth, porosity, depth_min, depth_max, lod_rows,
+                        intervals=None, style='interpretation'):
+    """Porosity track in percent with quality reference lines"""
+    title = "Porosity\n(%)"
+    if porosity is None:
+        unavailable_track(ax, "Porosity\nData\nUnavailable", title, style)
+        return ax
+
+    phi_x, phi_y = decimate_curve(depth, np.asarray(porosity) * 100, lod_rows)
+    ax.plot(phi_x, phi_y,
+           color=COLORS['porosity'],
+           linewidth=1.5,
+           label="Porosity (Φ)")
+
+    shade_intervals(ax, intervals)
+
+    style_track(ax, title, depth_min, depth_max, style)
+    set_track_scale(ax, 0, 40, [0, 10, 20, 30, 40])
+
+    ax.axvline(x=10, color='green', linestyle=':',
+              linewidth=1, alpha=0.5, label='Good Porosity (>10%)')
+    ax.axvline(x=5, color='orange', linestyle=':',
+              linewidth=1, alpha=0.5, label='Fair Porosity (5-10%)')
+    ax.legend(loc="upper right", fontsize=TRACK_STYLES[style]['legend_size'], framealpha=0.9)
+    return ax
+
+@traced("figure.draw_vshale_track")
+def draw_vshale_track(ax, depth, vshale, depth_min, depth_max, lod_rows,
+                      intervals=None, style='interpretation'):
+    """Shale volume track in percent with shale zone fill"""
+    title = "Shale Volume\n(%)"
+    if vshale is None:
+        unavailable_track(ax, "Vshale\nData\nUnavailable", title, style)
+        return ax
+
+    vsh_x, vsh_y = decimate_curve(depth, np.asarray(vshale) * 100, lod_rows)
+    ax.plot(vsh_x, vsh_y,
+           color=COLORS['vshale'],
+           linewidth=1.5,
+           label="Vshale (Vsh)")
+
+    shade_intervals(ax, intervals)
+
+    style_track(ax, title, depth_min, depth_max, style)
+    set_track_scale(ax, 0, 100, [0, 20, 40, 60, 80, 100])
+
+    ax.axvline(x=50, color='red', linestyle=':',
+              linewidth=1, alpha=0.5, label='Shale (>50%)')
+    ax.axvline(x=30, color='orange', linestyle=':',
+              linewidth=1, alpha=0.5, label='Sandy Shale (30-50%)')
+    ax.axvline(x=10, color='green', linestyle=':',
+              linewidth=1, alpha=0.5, label='Clean Sand (<10%)')
+
+    if TRACK_STYLES[style]['shale_fill']:
+        ax.fill_betweenx(vsh_y, 0, vsh_x,
+                        where=vsh_x > 50,
+                        color=COLORS['shale_zone'], alpha=0.3,
+                        label='Shale Zone')
+    ax.legend(loc="upper right", fontsize=TRACK_STYLES[style]['legend_size'], framealpha=0.9)
+    return ax
+
+@traced("figure.draw_water_saturation_track")
+def draw_water_saturation_track(ax, depth, water_saturation, depth_min, depth_max, lod_rows,
+                                label, intervals=None, unavailable="Sw\nData\nUnavailable",
+                                style='interpretation'):
+    """Water saturation track; returns (line, fill) so Sw can be updated in place"""
+    title = "Water Saturation\n(%)"
+    if water_saturation is None:
+        unavailable_track(ax, unavailable, title, style)
+        return None, None
+
+    sw_x, sw_y = decimate_curve(depth, np.asarray(water_saturation) * 100, lod_rows)
+    line, = ax.plot(sw_x, sw_y,
+                    color=COLORS['water_saturation'],
+                    linewidth=1.5,
+                    label=label)
+
+    shade_intervals(ax, intervals)
+
+    style_track(ax, title, depth_min, depth_max, style)
+    set_track_scale(ax, 0, 100, [0, 20, 40, 60, 80, 100])
+
+    ax.axvline(x=50, color='green', linestyle=':',
+              linewidth=1, alpha=0.5, label='Hydrocarbon (Sw<50%)')
+    ax.axvline(x=70, color='orange', linestyle=':',
+              linewidth=1, alpha=0.5, label='Transition (50-70%)')
+    ax.axvline(x=90, color='red', linestyle=':',
+              linewidth=1, alpha=0.5, label='Water (Sw>90%)')
+
+    fill = draw_hydrocarbon_fill(ax, sw_x, sw_y)
+    ax.legend(loc="upper right", fontsize=TRACK_STYLES[style]['legend_size'], framealpha=0.9)
+    return line, fill
+
+def draw_hydrocarbon_fill(ax, sw_percent, depth):
+    """Shade Sw < 50% as the hydrocarbon zone"""
+    return ax.fill_betweenx(depth, 0, sw_percent,
+                           where=sw_percent < 50,
+                           color='lightgreen', alpha=0.3,
+                           label='Hydrocarbon Zone')
+
+@traced("figure.draw_depth_track")
+def draw_depth_track(ax, depth_min, depth_max, intervals=None, minor_step=5):
+    """Depth track with units and consistent styling"""
+    ax.set_ylim(depth_max, depth_min)
+    ax.set_xlim(0, 1)
+    ax.set_ylabel("")
+    ax.yaxis.tick_right()
+    ax.yaxis.set_label_position("right")
+    ax.set_xticks([])
+    ax.set_xticklabels([])
 
-def create_depth_track(depth_min, depth_max, fig_height_inches, intervals=None):
-    """Create depth track with units and consistent styling"""
-    fig_depth, ax_depth = plt.subplots(figsize=(1.5, fig_height_inches))
-    
-    ax_depth.set_ylim(depth_max, depth_min)
-    ax_depth.set_xlim(0, 1)
-    ax_depth.set_ylabel("")
-    ax_depth.yaxis.tick_right()
-    ax_depth.yaxis.set_label_position("right")
-    ax_depth.set_xticks([])
-    ax_depth.set_xticklabels([])
-    
     # Apply consistent styling
-    ax_depth = apply_consistent_style(ax_depth)
-    
+    apply_consistent_style(ax)
+
     # Set specific grid for depth track (vertical only)
-    ax_depth.grid(True, axis='y', which='major', 
-                 linestyle='--', linewidth=0.5, alpha=0.3)
-    ax_depth.grid(True, axis='y', which='minor', 
-                 linestyle=':', linewidth=0.3, alpha=0.2)
-    
+    ax.grid(True, axis='y', which='major',
+           linestyle='--', linewidth=0.5, alpha=0.3)
+    ax.grid(True, axis='y', which='minor',
+           linestyle=':', linewidth=0.3, alpha=0.2)
+
     # Shade reservoir intervals if provided
-    if intervals:
-        for top, bottom, min_g, max_g in intervals:
-            ax_depth.axhspan(top, bottom, color=COLORS['sand'], alpha=0.4)
-    
-    ax_depth.set_title("Depth\n(m)", fontsize=12, fontweight='bold', pad=15, color=COLORS['text'])
-    
+    shade_intervals(ax, intervals)
+
+    ax.set_title("Depth\n(m)", fontsize=12, fontweight='bold', pad=15, color=COLORS['text'])
+
     # Add depth markers every 20m
     depth_interval = 20
     for depth_marker in range(int(depth_min), int(depth_max) + 1, depth_interval):
         if depth_min <= depth_marker <= depth_max:
-            ax_depth.text(0.5, depth_marker, f"{depth_marker}", 
-                        ha='center', va='center', 
-                        fontsize=8, color=COLORS['depth_marker'],
-                        fontweight='bold')
-    
+            ax.text(0.5, depth_marker, f"{depth_marker}",
+                   ha='center', va='center',
+                   fontsize=8, color=COLORS['depth_marker'],
+                   fontweight='bold')
+
     # Set y-axis minor ticks every 5m
-    ax_depth.yaxis.set_minor_locator(plt.MultipleLocator(5))
+    if minor_step:
+        ax.yaxis.set_minor_locator(plt.MultipleLocator(minor_step))
+
+    return ax
+
+# ========== MAIN PLOTTING FUNCTIONS ==========
+
+@traced("figure.create_consistent_plot")
+def create_consistent_plot(df, depth_min, depth_max, fig_height_inches, show_reservoir=False, cut_off=None, intervals=None):
+    """Create plots with consistent styling"""
+    plt.style.use('default')
 
+    fig_gr, ax_gr = plt.subplots(figsize=(4, fig_height_inches))
+    fig_nd, ax_nd = plt.subplots(figsize=(4, fig_height_inches))
+    fig_res, ax_res = plt.subplots(figsize=(4, fig_height_inches))
+
+    # Reduce every curve to a min/max envelope per pixel row of the canvas
+    lod_rows = int(fig_height_inches * fig_gr.dpi)
+    depth = df["Depth"]
+
+    draw_gamma_ray_track(ax_gr, depth, df["Gamma Ray"], depth_min, depth_max, lod_rows,
+                         cut_off=cut_off, intervals=intervals,
+                         low_gr_fill=not show_reservoir and not intervals, style='overview')
+    draw_density_neutron_track(ax_nd, depth, df["Density"], df["Neutron"], depth_min, depth_max,
+                               lod_rows, intervals=intervals, style='overview')
+    draw_resistivity_track(ax_res, depth, df["Resistivity"], depth_min, depth_max, lod_rows,
+                           intervals=intervals, style='overview')
+
+    return fig_gr, ax_gr, fig_nd, ax_nd, fig_res, ax_res
+
+def create_depth_track(depth_min, depth_max, fig_height_inches, intervals=None):
+    """Create depth track with units and consistent styling"""
+    fig_depth, ax_depth = plt.subplots(figsize=(1.5, fig_height_inches))
+    draw_depth_track(ax_depth, depth_min, depth_max, intervals)
     return fig_depth, ax_depth
 
 # ========== BACKWARD COMPATIBILITY FUNCTIONS ==========
 
 def create_welllog_plots(df, depth_min, depth_max, fig_height_inches, show_reservoir=False, cut_off=None, intervals=None):
     """Legacy function - uses new consistent styling"""
-    return create_consistent_plot(df, depth_min, depth_max, fig_height_inches, show_reservoir, cut_off, intervals)
\ No newline at end of file
+    return create_consistent_plot(df, depth_min, depth_max, fig_height_inches, show_reservoir, cut_off, intervals)
@@ -0,0 +1,107 @@
+# utils/render_pipeline.py - Background worker for loading, computing and rasterizing
+"""
+One worker thread runs every slow step of a screen (LAS parsing,
+petrophysics, figure building, tile rasterization) so the Kivy main
+thread only ever receives finished results. A single worker also
+serializes all access to a screen's matplotlib figure, which is not
+thread-safe.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivy.uix.anchorlayout import AnchorLayout
+
+
+class RenderPipeline:
+    """Run jobs off the main thread and deliver results through Clock.schedule_once"""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+        self._generations = {}
+        self._outstanding = 0
+        self._outstanding_lock = threading.Lock()
+
+    def submit(self, job, on_done, owner=None, on_error=None):
+        """
+        Run job() on the worker and call on_done(result) on the main thread.
+        A newer submit (or cancel) for the same owner makes older results
+        stale; they are dropped instead of delivered.
+        """
+        token = None
+        if owner is not None:
+            token = self._generations.get(owner, 0) + 1
+            self._generations[owner] = token
+
+        def finished(future):
+            with self._outstanding_lock:
+                self._outstanding -= 1
+            Clock.schedule_once(lambda dt: self._deliver(owner, token, future, on_done, on_error))
+
+        with self._outstanding_lock:
+            self._outstanding += 1
+        future = self._executor.submit(job)
+        future.add_done_callback(finished)
+        return future
+
+    def _deliver(self, owner, token, future, on_done, on_error):
+        if future.cancelled():
+            return
+        if owner is not None and self._generations.get(owner) != token:
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"Render job failed: {error}")
+            if on_error is not None:
+                on_error(error)
+            return
+        on_done(future.result())
+
+    def is_idle(self):
+        """
+        True when no job is queued or running, so the worker is not drawing
+        into any figure. Jobs are submitted from the main thread, so this
+        holds for the rest of a main-thread callback.
+        """
+        with self._outstanding_lock:
+            return self._outstanding == 0
+
+    def cancel(self, owner):
+        """Drop any result still pending for owner"""
+        self._generations[owner] = self._generations.get(owner, 0) + 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_with_spinner(box, build, show, owner):
+    """
+    Replace box's content with a spinner, run build() on the app's render
+    worker and hand a non-None result to show(result) on the main thread.
+    ValueErrors raised by build are user-facing and shown as a toast.
+    """
+    from kivymd.app import MDApp
+    from kivymd.toast import toast
+
+    box.clear_widgets()
+    box.add_widget(busy_indicator())
+
+    def done(result):
+        box.clear_widgets()
+        if result is not None:
+            show(result)
+
+    def failed(error):
+        box.clear_widgets()
+        toast(str(error) if isinstance(error, ValueError) else f"Error plotting logs: {error}")
+
+    return MDApp.get_running_app().render_pipeline.submit(build, done, owner=owner, on_error=failed)
+
+
+def busy_indicator():
+    """Spinner shown in a plot box while its tracks are being prepared"""
+    from kivymd.uix.spinner import MDSpinner
+    holder = AnchorLayout(size_hint_y=None, height=dp(120))
+    holder.add_widget(MDSpinner(size_hint=(None, None), size=(dp(46), dp(46)), active=True))
+    return holder
@@ -0,0 +1,121 @@
+# utils/report_export.py - Background PDF export with a progress dialog
+import threading
+
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.button import MDFlatButton
+from kivymd.uix.dialog import MDDialog
+from kivymd.uix.label import MDLabel
+from kivymd.uix.progressbar import MDProgressBar
+
+
+class ReportExport:
+    """
+    Writes one PDF report on its own thread, so neither the UI nor the
+    render worker waits for it. Progress, completion and errors are
+    delivered on the main thread; cancel() stops before the next page and
+    the partial file is removed. The PDF is written to a temporary file
+    and moved into place when complete, and the thread is not a daemon,
+    so quitting mid-export (on_stop cancels it) never leaves a truncated
+    report. Each finished export's size and render time are appended to
+    stats_path.
+    """
+
+    def __init__(self, filepath, report, well_info, on_progress=None, on_done=None,
+                 on_error=None, on_cancelled=None, raster_dpi=None, page_meters=None, workers=1,
+                 stats_path=None):
+        self.filepath = filepath
+        self.report = report
+        self.well_info = well_info
+        self.raster_dpi = raster_dpi
+        self.page_meters = page_meters
+        self.workers = workers
+        self.stats_path = stats_path
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self._cancel = threading.Event()
+        self._thread = None
+
+    def start(self):
+        # Not a daemon: at exit the interpreter waits for the cancelled
+        # export to remove its temporary file
+        self._thread = threading.Thread(target=self._run, name="pdf-export")
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        from utils.report_renderer import ExportCancelled, record_export_stats, render_report
+        try:
+            options = dict(progress=self._progress, cancel_event=self._cancel,
+                           raster_dpi=self.raster_dpi, page_meters=self.page_meters)
+            if self.workers > 1:
+                from utils.report_parallel import render_report_parallel
+                stats = render_report_parallel(self.filepath, self.report, self.well_info,
+                                               workers=self.workers, **options)
+            else:
+                stats = render_report(self.filepath, self.report, self.well_info, **options)
+            print(f"PDF export: {stats['pages']} pages, {stats['bytes'] / 1024:.0f} KB "
+                  f"in {stats['seconds']:.1f} s (raster dpi: {stats['raster_dpi']}, "
+                  f"workers: {stats['workers']})")
+            if self.stats_path:
+                try:
+                    record_export_stats(self.stats_path, stats)
+                except OSError as e:
+                    print(f"Could not record PDF export stats: {e}")
+        except ExportCancelled:
+            self._post(self.on_cancelled)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self._post(self.on_error, e)
+        else:
+            self._post(self.on_done, stats)
+
+    def _progress(self, done, total):
+        self._post(self.on_progress, done, total)
+
+    def _post(self, callback, *args):
+        if callback is not None:
+            Clock.schedule_once(lambda dt: callback(*args))
+
+
+class ExportProgressDialog:
+    """Modal page counter with a Cancel button for a ReportExport"""
+
+    def __init__(self, on_cancel):
+        self.bar = MDProgressBar(value=0, max=1)
+        self.label = MDLabel(text="Preparing report...", halign="center",
+                             size_hint_y=None, height=dp(32))
+
+        content = MDBoxLayout(orientation="vertical", spacing=dp(12), padding=(0, dp(8)),
+                              size_hint_y=None, height=dp(72))
+        content.add_widget(self.label)
+        content.add_widget(self.bar)
+
+        self.dialog = MDDialog(
+            title="Exporting PDF",
+            type="custom",
+            content_cls=content,
+            auto_dismiss=False,
+            buttons=[MDFlatButton(text="CANCEL", on_release=lambda *args: on_cancel())],
+        )
+
+    def open(self):
+        self.dialog.open()
+
+    def update(self, done, total):
+        self.bar.max = total
+        self.bar.value = done
+        self.label.text = f"Page {done} of {total}"
+
+    def dismiss(self):
+        self.dialog.dismiss()
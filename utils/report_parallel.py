@@ -0,0 +1,171 @@
+# utils/report_parallel.py - Render PDF report pages in a process pool
+"""
+Track and depth pages are independent and CPU-bound, so a multi-page
+report can be rendered one page per process and merged afterwards.
+Each worker receives only what its page draws: a depth window of the
+dataset for depth pages, the page's columns for track pages. Every page
+is written to its own single-page PDF; the parent merges them in page
+order with pypdf.
+
+pypdf is optional: without it, on a single CPU, or where processes
+cannot be started or the pool breaks, the report is rendered
+sequentially by render_report. The app exports with one worker unless
+WELLLOG_PDF_WORKERS asks for more.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from matplotlib.backends.backend_pdf import PdfPages
+
+from utils.report_renderer import (
+    TRACKS_PER_PAGE, ExportCancelled, atomic_output, depth_page_count, depth_window,
+    export_stats, page_count, render_depth_page, render_report, render_summary_page,
+    render_title_page, render_track_page, track_page_options,
+)
+from utils.tracing import traced
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
+# Pages queued per worker; bounds the page data held in flight
+PAGES_IN_FLIGHT_PER_WORKER = 2
+
+
+@traced("pdf.save_page")
+def save_page(fig, path, options=None):
+    """Write one figure as a single-page PDF"""
+    with PdfPages(path) as pdf:
+        pdf.savefig(fig, **(options or {}))
+    return path
+
+
+def render_page_file(kind, page_index, report, well_info, raster_dpi, page_meters, path):
+    """Worker: render one track or depth page of report to path"""
+    if kind == "depth":
+        fig = render_depth_page(report, page_index, page_meters, well_info, raster_dpi)
+    else:
+        fig = render_track_page(report, page_index, well_info, raster_dpi)
+    return save_page(fig, path, track_page_options(raster_dpi))
+
+
+def page_jobs(report, page_meters=None):
+    """(kind, page index, page data) for every track or depth page, built lazily"""
+    if page_meters:
+        for page_index in range(depth_page_count(report, page_meters)):
+            top, bottom = depth_window(report, page_index, page_meters)
+            yield "depth", page_index, report.window(top, bottom)
+    else:
+        for page_index in range(page_count(report)):
+            first = page_index * TRACKS_PER_PAGE
+            yield "track", page_index, report.columns_for(report.tracks[first:first + TRACKS_PER_PAGE])
+
+
+def available_cpus():
+    return os.cpu_count() or 1
+
+
+@traced("pdf.render_report_parallel")
+def render_report_parallel(filepath, report, well_info, workers=1, progress=None,
+                           cancel_event=None, raster_dpi=None, page_meters=None):
+    """
+    render_report with the track or depth pages spread over workers
+    processes; same pages, progress, cancel and statistics. Falls back to
+    sequential rendering with one worker, on a single CPU or without pypdf.
+    """
+    workers = workers or 1
+    if workers > 1 and available_cpus() <= 1:
+        # Workers would only take turns on the CPU, after paying for their start-up
+        print("Single CPU; rendering report pages sequentially")
+        workers = 1
+    if workers <= 1 or PdfWriter is None:
+        if workers > 1:
+            print("pypdf is not installed; rendering report pages sequentially")
+        return render_report(filepath, report, well_info, progress, cancel_event,
+                             raster_dpi, page_meters)
+
+    start = time.perf_counter()
+    tmp_dir = tempfile.mkdtemp(prefix="welllog_pages_")
+    try:
+        try:
+            # Spawned workers: forking a process that runs UI and render threads is unsafe
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context("spawn"))
+        except (OSError, ImportError, NotImplementedError) as e:
+            print(f"Process pool unavailable ({e}); rendering report pages sequentially")
+            return render_report(filepath, report, well_info, progress, cancel_event,
+                                 raster_dpi, page_meters)
+
+        try:
+            with executor:
+                page_paths = render_pages(executor, workers, report, well_info, progress,
+                                          cancel_event, raster_dpi, page_meters, tmp_dir)
+        except (BrokenProcessPool, OSError) as e:
+            # Workers that die or cannot start only show up once pages are submitted
+            print(f"Process pool failed ({e}); rendering report pages sequentially")
+            return render_report(filepath, report, well_info, progress, cancel_event,
+                                 raster_dpi, page_meters)
+
+        title_path = save_page(render_title_page(well_info), os.path.join(tmp_dir, "title.pdf"))
+        summary_path = save_page(render_summary_page(report, well_info),
+                                 os.path.join(tmp_dir, "summary.pdf"), {"bbox_inches": "tight"})
+
+        writer = PdfWriter()
+        for path in [title_path] + page_paths + [summary_path]:
+            writer.append(path)
+        with atomic_output(filepath) as part_path:
+            with open(part_path, "wb") as f:
+                writer.write(f)
+        total = len(page_paths) + 2
+        if progress is not None:
+            progress(total, total)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return export_stats(filepath, report, total, raster_dpi, page_meters, start, workers)
+
+
+def render_pages(executor, workers, report, well_info, progress, cancel_event,
+                 raster_dpi, page_meters, tmp_dir):
+    """Render every track or depth page in the pool; returns the page files in page order"""
+    jobs = page_jobs(report, page_meters)
+    total = (depth_page_count(report, page_meters) if page_meters else page_count(report)) + 2
+    paths = {}
+    pending = set()
+    max_pending = workers * PAGES_IN_FLIGHT_PER_WORKER
+
+    def submit_next():
+        for kind, page_index, data in jobs:
+            path = os.path.join(tmp_dir, f"page_{page_index:05d}.pdf")
+            future = executor.submit(render_page_file, kind, page_index, data, well_info,
+                                     raster_dpi, page_meters, path)
+            paths[future] = (page_index, path)
+            pending.add(future)
+            return True
+        return False
+
+    while len(pending) < max_pending and submit_next():
+        pass
+
+    finished = []
+    while pending:
+        done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+        if cancel_event is not None and cancel_event.is_set():
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise ExportCancelled()
+        for future in done:
+            pending.discard(future)
+            future.result()
+            finished.append(paths[future])
+            if progress is not None:
+                # The title and summary pages are counted at the end
+                progress(len(finished), total)
+            submit_next()
+
+    return [path for _, path in sorted(finished)]
@@ -0,0 +1,537 @@
+# utils/report_renderer.py - PDF report drawn from the loaded dataset
+"""
+The PDF report is built from what a screen plotted, not from its figure:
+the dataset, the derived curves and the reservoir intervals. Every track
+is redrawn with the same drawers the screens use, into page-sized axes,
+with envelope decimation sized to the page resolution instead of the
+full log length.
+"""
+import bisect
+import contextlib
+import copy
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from utils.intervals import merge_close_intervals, normalize_intervals
+from utils.plot_utils import (
+    draw_density_neutron_track, draw_gamma_ray_track, draw_porosity_track,
+    draw_resistivity_track, draw_vshale_track, draw_water_saturation_track,
+)
+from utils.tracing import span, traced
+
+TRACKS_PER_PAGE = 3
+# Resolution the track curves are decimated for; well above what a
+# printed A4 page can show
+REPORT_DPI = 300
+# Track axes on an A4 landscape page, in figure fractions
+TRACK_BOTTOM = 0.12
+TRACK_HEIGHT = 0.75
+TRACK_WIDTH = 0.28
+PAGE_SIZE = (11.69, 8.27)
+REPORT_STYLE = 'overview'
+# Depth-paginated pages: track area on an A4 landscape page
+DEPTH_PAGE_BOX = {"left": 0.07, "right": 0.97, "top": 0.86, "bottom": 0.12, "wspace": 0.25}
+# Narrow tracks side by side: the compact screen style
+DEPTH_PAGE_STYLE = 'interpretation'
+# Dataset columns each track is drawn from (derived curves live in ReportData.curves)
+TRACK_COLUMNS = {
+    "gamma_ray": ["Gamma Ray"],
+    "density_neutron": ["Density", "Neutron"],
+    "resistivity": ["Resistivity"],
+}
+# Lines and fills with at least this many vertices per inch of track
+# height count as dense data and are rasterized when a raster DPI is
+# given; a 100 m depth page of a log sampled every 0.1524 m has ~100
+DENSE_VERTICES_PER_INCH = 40
+
+
+class ReportData:
+    """Everything a screen plotted: dataset, track names, derived curves and intervals"""
+
+    def __init__(self, df, tracks, intervals=None, cut_off=None, curves=None,
+                 params=None, low_gr_fill=False):
+        self.df = df
+        self.tracks = [name for name, _ in tracks if name != "depth"]
+        # Detected intervals are disjoint; once sorted by top (a log may run
+        # bottom-up), both bounds are sorted for window's binary search
+        self.intervals = normalize_intervals(intervals or [])
+        self.interval_tops = [iv[0] for iv in self.intervals]
+        self.interval_bottoms = [iv[1] for iv in self.intervals]
+        # Whole-well figures, kept by windows and subsets
+        self.depth_range = (df["Depth"].min(), df["Depth"].max())
+        self.interval_count = len(self.intervals)
+        self.cut_off = cut_off
+        self.curves = dict(curves or {})
+        self.params = dict(params or {})
+        self.low_gr_fill = low_gr_fill
+
+    def depth_limits(self):
+        return self.depth_range
+
+    def window(self, top, bottom):
+        """Same report restricted to depths top..bottom; rows found by binary search"""
+        rows = depth_slice(self.df["Depth"].to_numpy(), top, bottom)
+        window = copy.copy(self)
+        window.df = self.df.iloc[rows]
+        window.curves = {name: slice_curve(curve, rows) for name, curve in self.curves.items()}
+        first = bisect.bisect_left(self.interval_bottoms, top)
+        last = bisect.bisect_right(self.interval_tops, bottom)
+        window.intervals = self.intervals[first:last]
+        window.interval_tops = self.interval_tops[first:last]
+        window.interval_bottoms = self.interval_bottoms[first:last]
+        return window
+
+    def columns_for(self, names):
+        """Same report carrying only the columns and curves of tracks names"""
+        subset = copy.copy(self)
+        columns = ["Depth"] + [c for name in names for c in TRACK_COLUMNS.get(name, [])]
+        subset.df = self.df[columns]
+        subset.curves = {name: curve for name, curve in self.curves.items() if name in names}
+        return subset
+
+
+def depth_slice(depth, top, bottom):
+    """
+    Slice of the samples between top and bottom, plus one on either side
+    so curves run to the page edges. depth must be monotonic (either way).
+    """
+    n = len(depth)
+    if n and depth[0] > depth[-1]:
+        reverse = depth[::-1]
+        start = n - np.searchsorted(reverse, bottom, side='right')
+        stop = n - np.searchsorted(reverse, top, side='left')
+    else:
+        start = np.searchsorted(depth, top, side='left')
+        stop = np.searchsorted(depth, bottom, side='right')
+    return slice(max(0, int(start) - 1), min(n, int(stop) + 1))
+
+
+def slice_curve(curve, rows):
+    if curve is None:
+        return None
+    return curve.iloc[rows] if hasattr(curve, "iloc") else curve[rows]
+
+
+# ========== TRACKS ==========
+
+def draw_report_track(ax, name, report, depth_min, depth_max, lod_rows, intervals=None,
+                      style=REPORT_STYLE):
+    """Draw track name of the report into ax, shading intervals"""
+    df = report.df
+    depth = df["Depth"]
+
+    if name == "gamma_ray":
+        draw_gamma_ray_track(ax, depth, df["Gamma Ray"], depth_min, depth_max, lod_rows,
+                             cut_off=report.cut_off, intervals=intervals,
+                             low_gr_fill=report.low_gr_fill, style=style)
+    elif name == "density_neutron":
+        draw_density_neutron_track(ax, depth, df["Density"], df["Neutron"], depth_min, depth_max,
+                                   lod_rows, intervals=intervals, style=style)
+    elif name == "resistivity":
+        draw_resistivity_track(ax, depth, df["Resistivity"], depth_min, depth_max,
+                               lod_rows, intervals=intervals, style=style)
+    elif name == "porosity":
+        draw_porosity_track(ax, depth, report.curves.get("porosity"), depth_min, depth_max,
+                            lod_rows, intervals=intervals, style=style)
+    elif name == "vshale":
+        draw_vshale_track(ax, depth, report.curves.get("vshale"), depth_min, depth_max,
+                          lod_rows, intervals=intervals, style=style)
+    elif name == "water_saturation":
+        m = report.params.get("m", 2.0)
+        n = report.params.get("n", 2.0)
+        draw_water_saturation_track(ax, depth, report.curves.get("water_saturation"),
+                                    depth_min, depth_max, lod_rows,
+                                    label=f"Sw (m={m}, n={n})", intervals=intervals,
+                                    style=style)
+    else:
+        raise ValueError(f"Unknown report track: {name}")
+
+
+def empty_track(ax):
+    """Placeholder keeping the last page's tracks aligned"""
+    ax.axis('off')
+    ax.text(0.5, 0.5, "No Data", transform=ax.transAxes,
+            ha='center', va='center', fontsize=12, style='italic', color='gray')
+
+
+# ========== PAGES ==========
+
+@traced("pdf.render_title_page")
+def render_title_page(well_info):
+    fig = Figure(figsize=(8.27, 11.69))  # A4 size in inches
+    fig.text(0.5, 0.7, "WellLog Insight Report",
+             ha='center', va='center', fontsize=24, weight='bold')
+    fig.text(0.5, 0.6, f"Well Name: {well_info['well_name']}",
+             ha='center', va='center', fontsize=16)
+    fig.text(0.5, 0.55, f"Location: {well_info['location']}",
+             ha='center', va='center', fontsize=16)
+    fig.text(0.5, 0.5, f"Depth Range: {well_info['depth_range']}",
+             ha='center', va='center', fontsize=16)
+    fig.text(0.5, 0.45, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+             ha='center', va='center', fontsize=12, style='italic')
+    return fig
+
+
+def page_count(report):
+    return -(-len(report.tracks) // TRACKS_PER_PAGE)
+
+
+def rasterize_dense_artists(fig, min_vertices_per_inch=DENSE_VERTICES_PER_INCH):
+    """
+    Mark curves and fills denser than min_vertices_per_inch along their
+    track for rasterization; axes, text and reference lines stay vector
+    """
+    for ax in fig.axes:
+        min_vertices = min_vertices_per_inch * ax.get_position().height * fig.get_figheight()
+        for line in ax.get_lines():
+            if len(line.get_xdata()) >= min_vertices:
+                line.set_rasterized(True)
+        for collection in ax.collections:
+            if sum(len(path.vertices) for path in collection.get_paths()) >= min_vertices:
+                collection.set_rasterized(True)
+
+
+@traced("pdf.render_track_page")
+def render_track_page(report, page_index, well_info, raster_dpi=None):
+    """A4 landscape page with up to TRACKS_PER_PAGE tracks over the full depth range"""
+    fig = Figure(figsize=PAGE_SIZE)
+    depth_min, depth_max = report.depth_limits()
+    lod_rows = int(PAGE_SIZE[1] * TRACK_HEIGHT * REPORT_DPI)
+
+    # Intervals closer than one row apart are shaded as one
+    intervals = merge_close_intervals(report.intervals, (depth_max - depth_min) / lod_rows) or None
+
+    first = page_index * TRACKS_PER_PAGE
+    names = report.tracks[first:first + TRACKS_PER_PAGE]
+    for i in range(TRACKS_PER_PAGE):
+        ax = fig.add_axes([0.07 + i * 0.31, TRACK_BOTTOM, TRACK_WIDTH, TRACK_HEIGHT])
+        if i < len(names):
+            draw_report_track(ax, names[i], report, depth_min, depth_max, lod_rows, intervals)
+        else:
+            empty_track(ax)
+
+    if "m" in report.params and "n" in report.params:
+        fig.text(0.5, 0.06,
+                 f"Archie Parameters: m={report.params['m']:.1f}, n={report.params['n']:.1f}",
+                 ha='center', fontsize=9, style='italic')
+    if report.interval_count and page_index == 0:
+        fig.text(0.5, 0.04, f"Reservoir Intervals Detected: {report.interval_count}",
+                 ha='center', fontsize=9, style='italic')
+
+    fig.text(0.5, 0.02, f"Page {page_index + 1} of {page_count(report)}",
+             ha='center', fontsize=10, style='italic')
+    fig.text(0.02, 0.98, f"Well: {well_info['well_name']}",
+             ha='left', fontsize=9, style='italic', fontweight='bold')
+    fig.text(0.98, 0.98, f"Tracks {first + 1}-{first + len(names)}",
+             ha='right', fontsize=9, style='italic')
+
+    if raster_dpi:
+        rasterize_dense_artists(fig)
+    return fig
+
+
+def depth_page_count(report, page_meters):
+    depth_min, depth_max = report.depth_limits()
+    return max(1, int(np.ceil((depth_max - depth_min) / page_meters)))
+
+
+def depth_window(report, page_index, page_meters):
+    """(top, bottom) depth of depth page page_index"""
+    top = report.depth_limits()[0] + page_index * page_meters
+    return top, top + page_meters
+
+
+@traced("pdf.render_depth_page")
+def render_depth_page(report, page_index, page_meters, well_info, raster_dpi=None):
+    """
+    A4 landscape page with every track over one depth window of page_meters.
+    Only the samples inside the window are sliced out of the dataset and
+    drawn, so a page costs the same however long the well is.
+    """
+    top, bottom = depth_window(report, page_index, page_meters)
+    window = report.window(top, bottom)
+
+    fig = Figure(figsize=PAGE_SIZE)
+    axes = fig.subplots(1, len(report.tracks), sharey=True, gridspec_kw=DEPTH_PAGE_BOX,
+                        squeeze=False)[0]
+    box_height = DEPTH_PAGE_BOX["top"] - DEPTH_PAGE_BOX["bottom"]
+    lod_rows = int(PAGE_SIZE[1] * box_height * REPORT_DPI)
+
+    # Intervals closer than one row apart are shaded as one
+    intervals = merge_close_intervals(window.intervals, page_meters / lod_rows) or None
+
+    for i, (ax, name) in enumerate(zip(axes, report.tracks)):
+        draw_report_track(ax, name, window, top, bottom, lod_rows, intervals, DEPTH_PAGE_STYLE)
+        if i > 0:
+            ax.set_ylabel("")
+            ax.tick_params(axis='y', which='both', labelleft=False, labelright=False)
+        # Legends are the same on every page; they only cover data after the first
+        if page_index > 0 and ax.get_legend() is not None:
+            ax.get_legend().remove()
+    axes[0].set_ylim(bottom, top)
+    for ax in fig.axes:
+        ax.tick_params(axis='x', labelsize=6)
+
+    if "m" in report.params and "n" in report.params:
+        fig.text(0.5, 0.06,
+                 f"Archie Parameters: m={report.params['m']:.1f}, n={report.params['n']:.1f}",
+                 ha='center', fontsize=9, style='italic')
+    if report.interval_count and page_index == 0:
+        fig.text(0.5, 0.04, f"Reservoir Intervals Detected: {report.interval_count}",
+                 ha='center', fontsize=9, style='italic')
+
+    fig.text(0.5, 0.02, f"Page {page_index + 1} of {depth_page_count(report, page_meters)}",
+             ha='center', fontsize=10, style='italic')
+    fig.text(0.02, 0.98, f"Well: {well_info['well_name']}",
+             ha='left', fontsize=9, style='italic', fontweight='bold')
+    fig.text(0.98, 0.98, f"Depth {top:.0f}-{bottom:.0f} m",
+             ha='right', fontsize=9, style='italic')
+
+    if raster_dpi:
+        rasterize_dense_artists(fig)
+    return fig
+
+
+@traced("pdf.render_summary_page")
+def render_summary_page(report, well_info):
+    """Petrophysical summary: well info, parameters, intervals, methodology and QC"""
+    fig = Figure(figsize=(8.5, 11))
+    intervals = report.intervals
+
+    # Title
+    fig.text(0.5, 0.95, "PETROPHYSICAL ANALYSIS REPORT",
+             ha='center', va='center', fontsize=22, weight='bold')
+
+    # Well Information Section
+    fig.text(0.1, 0.88, "WELL INFORMATION", fontsize=14, weight='bold')
+    fig.text(0.15, 0.85, f"• Well Name: {well_info['well_name']}", fontsize=11)
+    fig.text(0.15, 0.82, f"• Location: {well_info['location']}", fontsize=11)
+    fig.text(0.15, 0.79, f"• Depth Range: {well_info['depth_range']}", fontsize=11)
+    fig.text(0.15, 0.76, f"• Report Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", fontsize=11)
+
+    # Analysis Parameters Section
+    y_pos = 0.72
+    fig.text(0.1, y_pos, "ANALYSIS PARAMETERS", fontsize=14, weight='bold')
+    y_pos -= 0.03
+
+    # Archie Parameters
+    if "m" in report.params and "n" in report.params:
+        fig.text(0.15, y_pos, "Archie Equation Parameters:", fontsize=12, weight='bold')
+        y_pos -= 0.025
+        fig.text(0.2, y_pos, f"• Cementation factor (m) = {report.params['m']:.2f}", fontsize=11)
+        y_pos -= 0.025
+        fig.text(0.2, y_pos, f"• Saturation exponent (n) = {report.params['n']:.2f}", fontsize=11)
+        y_pos -= 0.025
+        fig.text(0.2, y_pos, "• Formation water resistivity (Rw) = 0.1 ohm.m", fontsize=11)
+        y_pos -= 0.04
+
+    # Cut-off Parameters
+    fig.text(0.15, y_pos, "Cut-off Values:", fontsize=12, weight='bold')
+    y_pos -= 0.025
+    fig.text(0.2, y_pos, "• Gamma Ray cut-off: Automatic (50th percentile)", fontsize=11)
+    y_pos -= 0.025
+    fig.text(0.2, y_pos, "• Porosity cut-off: >10% (Good), 5-10% (Fair)", fontsize=11)
+    y_pos -= 0.025
+    fig.text(0.2, y_pos, "• Vshale cut-off: <10% (Clean), 10-50% (Shaly), >50% (Shale)", fontsize=11)
+    y_pos -= 0.025
+    fig.text(0.2, y_pos, "• Water Saturation cut-off: <50% (Hydrocarbon)", fontsize=11)
+    y_pos -= 0.04
+
+    # Reservoir Analysis Section
+    if intervals:
+        fig.text(0.1, y_pos, "RESERVOIR ANALYSIS", fontsize=14, weight='bold')
+        y_pos -= 0.03
+
+        fig.text(0.15, y_pos, f"Total Reservoir Intervals Detected: {len(intervals)}",
+                 fontsize=12, weight='bold')
+        y_pos -= 0.03
+
+        # Show first 8 intervals
+        max_intervals = min(8, len(intervals))
+        for idx, (top, bottom, min_gr, max_gr) in enumerate(intervals[:max_intervals]):
+            thickness = bottom - top
+            gr_range = f"GR: {min_gr:.0f}-{max_gr:.0f} gAPI" if min_gr and max_gr else ""
+            fig.text(0.2, y_pos,
+                     f"{idx+1}. Depth: {top:.1f}-{bottom:.1f} m | Thickness: {thickness:.1f} m | {gr_range}",
+                     fontsize=10)
+            y_pos -= 0.025
+
+        if len(intervals) > max_intervals:
+            fig.text(0.2, y_pos, f"... and {len(intervals) - max_intervals} more intervals",
+                     fontsize=10, style='italic')
+            y_pos -= 0.03
+
+        # Calculate statistics
+        total_thickness = sum(bottom - top for top, bottom, _, _ in intervals)
+        avg_thickness = total_thickness / len(intervals)
+        fig.text(0.15, y_pos,
+                 f"Total Net Pay: {total_thickness:.1f} m | Average Thickness: {avg_thickness:.1f} m",
+                 fontsize=11, weight='bold')
+        y_pos -= 0.04
+
+    # Methodology Section
+    fig.text(0.1, y_pos, "METHODOLOGY", fontsize=14, weight='bold')
+    y_pos -= 0.03
+
+    methodology_points = [
+        "1. Gamma Ray Analysis:",
+        "   • Reservoir intervals identifiedusing statistical cut-off (50th percentile)",
+        "   • Clean sand: GR < cut-off, Shale: GR > cut-off",
+        "",
+        "2. Porosity Calculation:",
+        "   • Density-Neutron crossplot method",
+        "   • Matrix density: 2.65 g/cm³ (sandstone)",
+        "   • Fluid density: 1.0 g/cm³ (fresh water)",
+        "",
+        "3. Shale Volume (Vshale):",
+        "   • Linear method from Gamma Ray",
+        "   • GR_clean: 10th percentile, GR_shale: 90th percentile",
+        "",
+        "4. Water Saturation (Sw):",
+        "   • Archie's equation: Sw = (a*Rw/(Φ^m*Rt))^(1/n)",
+        "   • Where a=0.62, Rw=0.1 ohm.m",
+        "",
+        "5. Hydrocarbon Identification:",
+        "   • Sw < 50%: Potential hydrocarbon zone",
+        "   • Sw > 90%: Water zone",
+        "   • 50% < Sw < 90%: Transition zone"
+    ]
+
+    for point in methodology_points:
+        if point:
+            if point.startswith("   •"):
+                fig.text(0.2, y_pos, point, fontsize=9)
+            elif point.endswith(":"):
+                fig.text(0.15, y_pos, point, fontsize=10, weight='bold')
+            else:
+                fig.text(0.15, y_pos, point, fontsize=9)
+        y_pos -= 0.025
+
+    # Quality Control Section
+    y_pos -= 0.02
+    fig.text(0.1, y_pos, "QUALITY CONTROL NOTES", fontsize=14, weight='bold')
+    y_pos -= 0.03
+
+    qc_notes = [
+        "• All calculations based on provided LAS file data",
+        "• Check for missing or erroneous log data before analysis",
+    ]
+
+    for note in qc_notes:
+        fig.text(0.15, y_pos, note, fontsize=9)
+        y_pos -= 0.025
+
+    return fig
+
+
+# ========== REPORT ==========
+
+class ExportCancelled(Exception):
+    """Raised inside render_report when the export was cancelled"""
+
+
+def report_pages(report, well_info, raster_dpi=None, page_meters=None):
+    """
+    Yield (figure, savefig options) page by page, each built only when
+    requested. With page_meters, track pages cover consecutive depth
+    windows of that length instead of three tracks over the whole well.
+    """
+    yield render_title_page(well_info), {}
+    track_options = track_page_options(raster_dpi)
+    if page_meters:
+        for page_index in range(depth_page_count(report, page_meters)):
+            yield render_depth_page(report, page_index, page_meters, well_info, raster_dpi), track_options
+    else:
+        for page_index in range(page_count(report)):
+            yield render_track_page(report, page_index, well_info, raster_dpi), track_options
+    yield render_summary_page(report, well_info), {"bbox_inches": "tight"}
+
+
+def track_page_options(raster_dpi=None):
+    """savefig options of the track and depth pages"""
+    options = {"bbox_inches": "tight"}
+    if raster_dpi:
+        options["dpi"] = raster_dpi
+    return options
+
+
+def total_pages(report, page_meters=None):
+    if page_meters:
+        return depth_page_count(report, page_meters) + 2
+    return page_count(report) + 2
+
+
+@traced("pdf.render_report")
+def render_report(filepath, report, well_info, progress=None, cancel_event=None, raster_dpi=None,
+                  page_meters=None):
+    """
+    Write the title page, the track pages and the summary page to filepath.
+    progress(done, total) is called after every page; setting cancel_event
+    stops the export before the next page. A cancelled or failed export
+    leaves no partial file behind. With raster_dpi, dense curves and fills
+    are embedded as images of that resolution; with page_meters, pages are
+    depth-paginated. Returns export statistics.
+    """
+    total = total_pages(report, page_meters)
+    start = time.perf_counter()
+    with atomic_output(filepath) as part_path:
+        with PdfPages(part_path) as pdf:
+            for done, (fig, options) in enumerate(report_pages(report, well_info, raster_dpi, page_meters), 1):
+                with span("pdf.save_page", page=done):
+                    pdf.savefig(fig, **options)
+                if progress is not None:
+                    progress(done, total)
+                # Checked before the next page is built
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled()
+
+    return export_stats(filepath, report, total, raster_dpi, page_meters, start)
+
+
+@contextlib.contextmanager
+def atomic_output(filepath):
+    """
+    Path of a temporary file next to filepath, moved over filepath when
+    the block completes and removed when it raises, so filepath is never
+    left half-written, even if the process dies mid-export.
+    """
+    fd, part_path = tempfile.mkstemp(prefix=".", suffix=".part",
+                                     dir=os.path.dirname(os.path.abspath(filepath)))
+    os.close(fd)
+    try:
+        yield part_path
+        os.replace(part_path, filepath)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+
+def export_stats(filepath, report, pages, raster_dpi, page_meters, start, workers=1):
+    """Statistics of a finished export started at perf_counter() start"""
+    return {
+        "file": os.path.basename(filepath),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "samples": len(report.df),
+        "tracks": len(report.tracks),
+        "pages": pages,
+        "raster_dpi": raster_dpi,
+        "page_meters": page_meters,
+        "workers": workers,
+        "seconds": round(time.perf_counter() - start, 3),
+        "bytes": os.path.getsize(filepath),
+    }
+
+
+def record_export_stats(stats_path, stats):
+    """Append one export's statistics as a JSON line, to compare settings across exports"""
+    os.makedirs(os.path.dirname(stats_path) or ".", exist_ok=True)
+    with open(stats_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(stats) + "\n")
@@ -0,0 +1,272 @@
+# utils/tile_renderer.py - Rasterize a tall track figure one depth tile at a time
+"""
+A screen's track figure is laid out for its full virtual height
+(depth range x pixels per metre), but only the rows currently on screen
+are ever rasterized. Each tile is drawn by shrinking the figure to the
+tile height and shifting every axis so that the tile's rows land inside
+the figure; the result matches the same rows of the full-height figure (up
+to anti-aliasing at tile seams) without ever allocating it.
+
+Only the artists of the tile's own depth range are drawn: the y tick
+locators are narrowed to the tile's slice of the full-well ticks, and
+depth-anchored texts and polygons (interval shading, fills) outside it
+are left out of the draw. Otherwise every tile would lay out the ticks
+and markers of the whole well.
+
+With a TrackTileCache, the base tracks of a tile drawn before are
+rendered on their own and their columns cached; a tile then only
+rasterizes the remaining tracks and composites the cached columns over
+them. A tile drawn for the first time is rendered in one plain pass.
+"""
+import weakref
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.ticker import FixedFormatter, FixedLocator
+
+from utils.tracing import span
+
+TILE_HEIGHT = 512   # px
+CULL_MARGIN = 32    # px above and below a tile whose artists are still drawn
+
+
+class FigureTiler:
+    """Render fixed-height horizontal tiles of a figure of virtual size width x height"""
+
+    def __init__(self, figure, height_px, tile_height=TILE_HEIGHT, track_cache=None,
+                 shared_tracks=None):
+        self.figure = figure
+        self.height_px = int(height_px)
+        self.tile_height = int(tile_height)
+        self.width_px = int(round(figure.get_figwidth() * figure.dpi))
+        self.canvas = FigureCanvasAgg(figure)
+        # (axes, content key) of the tracks whose columns go through track_cache
+        self.track_cache = track_cache
+        self.shared_tracks = list(shared_tracks or [])
+
+        # Axis positions as fractions of the full virtual figure
+        self._positions = [(ax, ax.get_position().frozen()) for ax in figure.axes]
+        self._tickers = self._full_ticks()
+        # collection -> (its paths, their depth extents), filled on first use
+        self._extents = weakref.WeakKeyDictionary()
+
+    def tile_count(self):
+        return max(1, -(-self.height_px // self.tile_height))
+
+    def tile_span(self, index):
+        """(top row, height) of tile index, rows counted from the top of the figure"""
+        top = index * self.tile_height
+        return top, max(0, min(self.tile_height, self.height_px - top))
+
+    def tiles_between(self, row_top, row_bottom):
+        """Indices of the tiles covering rows [row_top, row_bottom)"""
+        row_top = max(0, int(row_top))
+        row_bottom = min(self.height_px, int(row_bottom))
+        if row_bottom <= row_top:
+            return []
+        return list(range(row_top // self.tile_height, (row_bottom - 1) // self.tile_height + 1))
+
+    def set_width(self, width_px):
+        """
+        Match the widget width; returns True when cached tiles are stale.
+        Call it from the thread that renders the tiles, never during render_tile.
+        """
+        width_px = int(width_px)
+        if width_px <= 0 or width_px == self.width_px:
+            return False
+        self.width_px = width_px
+        return True
+
+    def render_tile(self, index):
+        """Rasterize tile index; returns (rgba bytes, width, height) top row first"""
+        top, height = self.tile_span(index)
+        if height <= 0:
+            return None
+
+        fig = self.figure
+        dpi = fig.dpi
+        fig.set_size_inches(self.width_px / dpi, height / dpi, forward=False)
+
+        # Figure rows are counted from the top, figure fractions from the bottom
+        tile_bottom = self.height_px - top - height
+        for ax, pos in self._positions:
+            y0 = (pos.y0 * self.height_px - tile_bottom) / height
+            ax.set_position([pos.x0, y0, pos.width, pos.height * self.height_px / height])
+
+        with span("canvas.render_tile", tile=index):
+            undo = self._cull(height)
+            try:
+                columns = self._shared_columns(index)
+                if columns:
+                    tile = self._compose_tile(columns)
+                    return tile.tobytes(), tile.shape[1], tile.shape[0]
+                self.canvas.draw()
+            finally:
+                for restore in reversed(undo):
+                    restore()
+        width, height = self.canvas.get_width_height()
+        return bytes(self.canvas.buffer_rgba()), width, height
+
+    def _full_ticks(self):
+        """(ticker, locator, formatter, locs, labels) of every y ticker over the whole depth range"""
+        tickers = []
+        seen = set()
+        for ax in self.figure.axes:
+            # Shared y axes share their Ticker objects
+            for ticker in (ax.yaxis.major, ax.yaxis.minor):
+                if id(ticker) in seen:
+                    continue
+                seen.add(id(ticker))
+                locs = np.asarray(ticker.locator(), dtype=np.float64)
+                low, high = sorted(ax.get_ylim())
+                locs = locs[(locs >= low) & (locs <= high)]
+                labels = ticker.formatter.format_ticks(locs) if len(locs) else []
+                tickers.append((ticker, ticker.locator, ticker.formatter, locs, np.asarray(labels)))
+        return tickers
+
+    def _depth_range(self, ax, height):
+        """(low, high) depths of the tile rows, plus CULL_MARGIN, on ax"""
+        inverse = ax.transData.inverted()
+        x = ax.bbox.x0 + 1
+        (_, a), (_, b) = inverse.transform([(x, -CULL_MARGIN), (x, height + CULL_MARGIN)])
+        return min(a, b), max(a, b)
+
+    def _cull(self, height):
+        """Limit ticks, texts and polygons to the tile's depth range; returns undo callables"""
+        undo = []
+        axes = self.figure.axes
+        if not axes:
+            return undo
+        low, high = self._depth_range(axes[0], height)
+
+        for ticker, locator, formatter, locs, labels in self._tickers:
+            keep = (locs >= low) & (locs <= high)
+            ticker.locator = FixedLocator(locs[keep])
+            ticker.formatter = FixedFormatter(list(labels[keep]))
+            undo.append(lambda t=ticker, l=locator, f=formatter: (
+                setattr(t, "locator", l), setattr(t, "formatter", f)))
+
+        for ax in axes:
+            for text in ax.texts:
+                if text.get_transform() is not ax.transData or not text.get_visible():
+                    continue
+                if not low <= text.get_position()[1] <= high:
+                    text.set_visible(False)
+                    undo.append(lambda t=text: t.set_visible(True))
+
+            depth_transforms = (ax.transData, ax.get_yaxis_transform())
+            for collection in ax.collections:
+                if collection.get_transform() not in depth_transforms:
+                    continue
+                culled = self._culled_paths(collection, low, high)
+                if culled is not None:
+                    paths = collection.get_paths()
+                    collection._paths = culled
+                    undo.append(lambda c=collection, p=paths: setattr(c, "_paths", p))
+        return undo
+
+    def _culled_paths(self, collection, low, high):
+        """Paths of collection reaching into [low, high], or None when it cannot be culled"""
+        # Per-path colours, values or offsets would no longer line up with a subset
+        if (len(collection.get_facecolor()) > 1 or len(collection.get_edgecolor()) > 1
+                or collection.get_array() is not None or len(collection.get_offsets()) > 1):
+            return None
+        paths = collection.get_paths()
+        cached = self._extents.get(collection)
+        if cached is None or cached[0] is not paths:
+            extents = np.array([(p.vertices[:, 1].min(), p.vertices[:, 1].max())
+                                if len(p.vertices) else (np.inf, -np.inf) for p in paths])
+            cached = (paths, extents.reshape(-1, 2))
+            self._extents[collection] = cached
+        extents = cached[1]
+        keep = np.flatnonzero((extents[:, 1] >= low) & (extents[:, 0] <= high))
+        if len(keep) == len(paths):
+            return None
+        return [paths[i] for i in keep]
+
+    def _column(self, axes):
+        """(first, last + 1) pixel columns of axes, widened up to the neighbouring tracks"""
+        left = min(pos.x0 for ax, pos in self._positions if ax in axes) * self.width_px
+        right = max(pos.x1 for ax, pos in self._positions if ax in axes) * self.width_px
+        x0, x1 = 0, self.width_px
+        for ax, pos in self._positions:
+            if ax in axes:
+                continue
+            if pos.x1 * self.width_px <= left:
+                x0 = max(x0, int(pos.x1 * self.width_px))
+            elif pos.x0 * self.width_px >= right:
+                x1 = min(x1, int(np.ceil(pos.x0 * self.width_px)))
+        return x0, x1
+
+    def _tile_key(self, axes, content, index):
+        bounds = tuple(tuple(round(v, 6) for v in pos.bounds)
+                       for ax, pos in self._positions if ax in axes)
+        return content + (self._column(axes), bounds, self.figure.dpi, self.width_px,
+                          self.height_px, self.tile_height, index)
+
+    def _shared_columns(self, index):
+        """
+        [axes, pixel columns, key, cached RGBA or None] of the shared tracks
+        of tile index that are cached or asked for a second time
+        """
+        if self.track_cache is None:
+            return []
+        columns = []
+        for axes, content in self.shared_tracks:
+            key = self._tile_key(axes, content, index)
+            pixels = self.track_cache.get(key)
+            if pixels is not None or self.track_cache.wanted(key):
+                columns.append([axes, self._column(axes), key, pixels])
+        return columns
+
+    def _compose_tile(self, columns):
+        """RGBA array of the tile, with the columns' tracks taken from (or added to) the track cache"""
+        fig = self.figure
+        visible = [(ax, ax.get_visible()) for ax in fig.axes]
+        patch_visible = fig.patch.get_visible()
+
+        try:
+            # Screen-specific tracks on the usual background
+            for axes, _, _, _ in columns:
+                for ax in axes:
+                    ax.set_visible(False)
+            self.canvas.draw()
+            tile = np.array(self.canvas.buffer_rgba())
+
+            # Each base track missing from the cache alone, over a transparent background
+            missing = [column for column in columns if column[3] is None]
+            if missing:
+                fig.patch.set_visible(False)
+                for ax, _ in visible:
+                    ax.set_visible(False)
+                for column in missing:
+                    axes, (x0, x1), key, _ = column
+                    for ax in axes:
+                        ax.set_visible(True)
+                    self.canvas.draw()
+                    column[3] = np.asarray(self.canvas.buffer_rgba())[:, x0:x1].copy()
+                    self.track_cache.put(key, column[3])
+                    for ax in axes:
+                        ax.set_visible(False)
+        finally:
+            fig.patch.set_visible(patch_visible)
+            for ax, was_visible in visible:
+                ax.set_visible(was_visible)
+
+        for _, (x0, x1), _, pixels in columns:
+            composite_over(tile[:, x0:x1], pixels)
+        return tile
+
+    def restore(self):
+        """Put the figure back to its full virtual size and layout"""
+        fig = self.figure
+        fig.set_size_inches(self.width_px / fig.dpi, self.height_px / fig.dpi, forward=False)
+        for ax, pos in self._positions:
+            ax.set_position(pos)
+
+
+def composite_over(dst, src):
+    """Alpha-blend the RGBA pixels src over the opaque RGBA pixels dst, in place"""
+    alpha = src[..., 3:4].astype(np.uint16)
+    blended = src[..., :3] * alpha + dst[..., :3] * (255 - alpha) + 127
+    dst[..., :3] = (blended // 255).astype(np.uint8)
@@ -0,0 +1,201 @@
+# utils/tiled_view.py - Scroll-aware widget showing a tall figure as cached tiles
+from collections import OrderedDict
+
+from kivy.clock import Clock
+from kivy.graphics import Color, Rectangle
+from kivy.graphics.texture import Texture
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.widget import Widget
+
+from utils.tile_renderer import TILE_HEIGHT, FigureTiler
+from utils.tracing import span
+
+MAX_TILES = 12        # textures kept in the LRU cache
+PREFETCH_TILES = 1    # tiles rendered ahead above and below the viewport
+
+
+class TiledTrackView(Widget):
+    """
+    Drop-in replacement for a full-height FigureCanvasKivyAgg inside a
+    ScrollView. Only the tiles intersecting the viewport are rasterized;
+    their neighbours are prefetched, and at most MAX_TILES textures are
+    kept, so memory no longer grows with the well length. With a
+    RenderPipeline, tiles are rasterized on its worker and only turned
+    into textures on the main thread.
+    """
+
+    def __init__(self, figure, height_px, tile_height=TILE_HEIGHT, max_tiles=MAX_TILES,
+                 pipeline=None, track_cache=None, shared_tracks=None, **kwargs):
+        kwargs.setdefault("size_hint_y", None)
+        super().__init__(**kwargs)
+        self.height = height_px
+        self.figure = figure
+        with span("canvas.create", height_px=int(height_px)):
+            self.tiler = FigureTiler(figure, height_px, tile_height, track_cache=track_cache,
+                                     shared_tracks=shared_tracks)
+        self.max_tiles = max_tiles
+        self.pipeline = pipeline
+        self._textures = OrderedDict()
+        self._previous = {}
+        self._pending = {}   # tile index -> future of its render job
+        self._generation = 0
+        self._visible = []
+        self._scroll_view = None
+        self._update_event = None
+
+        self.bind(pos=self._schedule_update, size=self._on_size, parent=self._on_parent)
+
+    # ========== VIEWPORT TRACKING ==========
+
+    def _on_parent(self, *args):
+        if self._scroll_view is not None:
+            self._scroll_view.unbind(scroll_y=self._schedule_update, size=self._schedule_update)
+            self._scroll_view = None
+
+        widget = self.parent
+        while widget is not None and not isinstance(widget, ScrollView):
+            widget = widget.parent
+        if widget is not None:
+            widget.bind(scroll_y=self._schedule_update, size=self._schedule_update)
+            self._scroll_view = widget
+        self._schedule_update()
+
+    def _on_size(self, *args):
+        if self.pipeline is None:
+            self._resized(self.tiler.set_width(self.width))
+            return
+        # The worker may be drawing a tile with the figure: resize it there, between tiles
+        width = self.width
+        self.pipeline.submit(lambda: self.tiler.set_width(width), self._resized)
+
+    def _resized(self, stale):
+        if stale:
+            self.refresh()
+        else:
+            self._schedule_update()
+
+    def _schedule_update(self, *args):
+        if self._update_event is None:
+            self._update_event = Clock.schedule_once(self._update, 0)
+
+    def visible_rows(self):
+        """(top, bottom) rows of the figure inside the viewport, counted from the top"""
+        _, bottom = self.to_window(self.x, self.y)
+        view_bottom, view_top = bottom, bottom + self.height
+        if self._scroll_view is not None:
+            sv = self._scroll_view
+            _, sv_bottom = sv.to_window(sv.x, sv.y)
+            view_bottom = max(view_bottom, sv_bottom)
+            view_top = min(view_top, sv_bottom + sv.height)
+        return bottom + self.height - view_top, bottom + self.height - view_bottom
+
+    # ========== TILE CACHE ==========
+
+    def _request(self, index):
+        """Make sure tile index is cached or being rendered"""
+        if index in self._textures:
+            self._textures.move_to_end(index)
+            return
+        if index in self._pending:
+            return
+
+        if self.pipeline is None:
+            self._store(index, self.tiler.render_tile(index))
+            return
+
+        generation = self._generation
+        self._pending[index] = self.pipeline.submit(
+            lambda: self.tiler.render_tile(index),
+            lambda tile: self._tile_ready(index, generation, tile),
+            on_error=lambda error: self._tile_failed(index, generation))
+
+    def _tile_ready(self, index, generation, tile):
+        if generation != self._generation:
+            return
+        self._pending.pop(index, None)
+        self._store(index, tile)
+        if index in self._visible:
+            self._draw(self._visible)
+
+    def _tile_failed(self, index, generation):
+        # Requested again on the next viewport update
+        if generation == self._generation:
+            self._pending.pop(index, None)
+
+    def _cancel_queued(self, keep=()):
+        """Drop queued render jobs of tiles not in keep; jobs already running finish"""
+        for index, future in list(self._pending.items()):
+            if index not in keep and future.cancel():
+                del self._pending[index]
+
+    def _store(self, index, tile):
+        if tile is None:
+            return
+        data, width, height = tile
+        with span("canvas.upload_tile", tile=index):
+            texture = Texture.create(size=(width, height), colorfmt="rgba")
+            texture.blit_buffer(data, colorfmt="rgba", bufferfmt="ubyte")
+            texture.flip_vertical()
+
+        self._textures[index] = texture
+        while len(self._textures) > self.max_tiles:
+            self._textures.popitem(last=False)
+
+    def _update(self, *args):
+        self._update_event = None
+        if self.width <= 0:
+            return
+
+        row_top, row_bottom = self.visible_rows()
+        self._visible = self.tiler.tiles_between(row_top, row_bottom)
+        wanted = list(self._visible)
+
+        # Neighbours of the viewport, nearest first, queued after the visible tiles
+        if self._visible:
+            last = self.tiler.tile_count() - 1
+            for step in range(1, PREFETCH_TILES + 1):
+                for index in (self._visible[-1] + step, self._visible[0] - step):
+                    if 0 <= index <= last:
+                        wanted.append(index)
+
+        # Tiles scrolled past must not hold up the worker, shared with other screens
+        self._cancel_queued(wanted)
+        for index in wanted:
+            self._request(index)
+        self._draw(self._visible)
+
+    def _draw(self, indices):
+        self.canvas.clear()
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            for index in indices:
+                # Tiles from before a refresh stay up until their replacement arrives
+                texture = self._textures.get(index) or self._previous.get(index)
+                if texture is None:
+                    continue
+                top, height = self.tiler.tile_span(index)
+                Rectangle(texture=texture,
+                          pos=(self.x, self.y + self.height - top - height),
+                          size=(self.width, height))
+
+    def release(self):
+        """Drop every texture for good; tiles still rendering are discarded on arrival"""
+        self._generation += 1
+        self._cancel_queued()
+        self._textures = OrderedDict()
+        self._previous = {}
+        self._pending.clear()
+        self._visible = []
+        if self._update_event is not None:
+            self._update_event.cancel()
+            self._update_event = None
+        self.canvas.clear()
+
+    def refresh(self):
+        """Drop every tile after the figure changed and redraw the viewport"""
+        self._generation += 1
+        self._cancel_queued()
+        self._previous = self._textures
+        self._textures = OrderedDict()
+        self._pending.clear()
+        self._schedule_update()
@@ -0,0 +1,165 @@
+# utils/tracing.py - Lightweight tracing spans with Chrome trace export
+"""
+Timed spans around the hot paths (LAS read, interval detection,
+petrophysics, figure builds, tiles, PDF pages):
+
+    with span("las.parse", samples=n):
+        ...
+
+    @traced("petrophysics.archie_sw")
+    def archie_sw(...):
+
+Tracing is off unless WELLLOG_TRACE is set ("1", or the path of the
+trace file) or enable() is called; while on, the trace is written when
+the process exits. While off, span() returns a shared no-op context
+manager and traced functions cost one flag check.
+Recorded spans are written as Chrome trace-event JSON, which
+chrome://tracing and https://ui.perfetto.dev open directly.
+"""
+import atexit
+import contextlib
+import functools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+
+# Oldest spans are dropped beyond this, so a forgotten trace cannot grow unbounded
+MAX_EVENTS = 200_000
+DEFAULT_TRACE_FILE = "welllog_trace.json"
+
+_events = deque(maxlen=MAX_EVENTS)
+_thread_names = {}
+_start_ns = time.perf_counter_ns()
+_NO_SPAN = contextlib.nullcontext()
+
+_env = os.environ.get("WELLLOG_TRACE", "")
+_enabled = _env not in ("", "0")
+_trace_path = _env if _enabled and _env != "1" else None
+_default_path = DEFAULT_TRACE_FILE
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        thread = threading.get_ident()
+        if thread not in _thread_names:
+            _thread_names[thread] = threading.current_thread().name
+        if exc_type is not None:
+            self.args = dict(self.args, error=exc_type.__name__)
+        _events.append((self.name, self.start, end - self.start, thread, self.args))
+        return False
+
+
+def configure(default_path=None):
+    """Where the trace goes when WELLLOG_TRACE=1 or enable() named no file"""
+    global _default_path
+    if default_path is not None:
+        _default_path = default_path
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(path=None):
+    """Start recording spans; path (optional) is where write() puts the trace by default"""
+    global _enabled, _trace_path
+    _enabled = True
+    if path is not None:
+        _trace_path = path
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def clear():
+    _events.clear()
+
+
+def span(name, **args):
+    """Context manager timing its block as span name, with args shown in the trace viewer"""
+    if not _enabled:
+        return _NO_SPAN
+    return _Span(name, args)
+
+
+def traced(name=None):
+    """Decorator: record every call of the function as a span (name defaults to module.function)"""
+    def decorate(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def chrome_trace():
+    """Recorded spans as a Chrome trace-event document"""
+    pid = os.getpid()
+    events = [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": thread, "args": {"name": name}}
+        for thread, name in list(_thread_names.items())
+    ]
+    for name, start, duration, thread, args in list(_events):
+        events.append({
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": (start - _start_ns) / 1000,
+            "dur": duration / 1000,
+            "pid": pid,
+            "tid": thread,
+            "args": args,
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write(path=None):
+    """Write the recorded spans as Chrome trace JSON; returns the path"""
+    path = path or _trace_path or _default_path
+    with open(path, "w") as f:
+        json.dump(chrome_trace(), f)
+    return path
+
+
+def summary(limit=15):
+    """Total time, call count and name of the slowest span names, slowest first"""
+    totals = {}
+    for name, _, duration, _, _ in list(_events):
+        total, count = totals.get(name, (0, 0))
+        totals[name] = (total + duration, count + 1)
+    rows = sorted(((total / 1e9, count, name) for name, (total, count) in totals.items()),
+                  reverse=True)
+    return rows[:limit]
+
+
+def _write_at_exit():
+    # Spawned report workers inherit WELLLOG_TRACE; only the main process writes
+    if _enabled and _events and multiprocessing.parent_process() is None:
+        try:
+            print(f"Trace written to {write()}")
+        except OSError as e:
+            print(f"Could not write trace: {e}")
+
+
+atexit.register(_write_at_exit)
@@ -0,0 +1,110 @@
+# utils/track_cache.py - Shared cache of rendered base-track tiles
+"""
+The depth, Gamma Ray, Density/Neutron and Resistivity tracks are drawn
+from the same dataset on several screens and redrawn on every replot of
+a screen. FigureTiler renders such a track once per tile on its own,
+over a transparent background, and keeps the RGBA column here; later
+tiles with the same key are composited from the cache, so only the
+screen-specific tracks (porosity, Vshale, Sw) are rasterized again.
+
+A key holds the track's content (dataset, track, depth window, style,
+cut-off, intervals) and its exact pixel geometry, so a cached column is
+only reused where it would be drawn identically: by replots and scrolls
+of a screen, and by other screens whose layout and pixel scale put the
+track in the same columns.
+
+Rendering a column on its own costs an extra pass, so a tile is only
+split into columns the second time its key is asked for; a tile drawn
+once and never again is rendered in one plain pass.
+"""
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+
+# Tile keys remembered as asked for once, before their columns are cached
+SEEN_KEYS = 4096
+
+
+def intervals_key(intervals):
+    """Digest of the tops and bottoms of an interval list"""
+    if not intervals:
+        return ()
+    bounds = array("d", (float(v) for top, bottom, *_ in intervals for v in (top, bottom)))
+    return hashlib.sha1(bounds.tobytes()).hexdigest()
+
+
+class TrackTileCache:
+    """LRU of rendered track columns (uint8 RGBA arrays) with a memory cap"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            column = self._entries.get(key)
+            if column is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return column
+
+    def wanted(self, key):
+        """
+        True when key was asked for before: only then is rendering its
+        column on its own, to cache it, likely to pay off
+        """
+        with self._lock:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                return True
+            self._seen[key] = None
+            if len(self._seen) > SEEN_KEYS:
+                self._seen.popitem(last=False)
+            return False
+
+    def put(self, key, column):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = column
+            self._bytes += column.nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def evict_oldest(self):
+        """Drop the least recently used column; returns the bytes it held"""
+        with self._lock:
+            if not self._entries:
+                return 0
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            return evicted.nbytes
+
+    def total_bytes(self):
+        return self._bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._seen.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
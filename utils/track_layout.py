@@ -0,0 +1,104 @@
+# utils/track_layout.py - All tracks of a screen as axes of one figure
+from matplotlib.figure import Figure
+
+from utils.track_cache import intervals_key
+from utils.tracing import traced
+
+DEPTH_TRACK_WIDTH_INCHES = 1.5
+DATA_TRACK_WIDTH_INCHES = 3.5
+# Fixed margins for titles/legends on top and x tick labels below, so a
+# tall figure does not waste a growing fraction of its height on them
+TOP_MARGIN_INCHES = 1.2
+BOTTOM_MARGIN_INCHES = 0.5
+
+# Tracks every screen draws the same way from the same data; FigureTiler
+# can reuse their rendered tiles through utils.track_cache
+BASE_TRACKS = ("depth", "gamma_ray", "density_neutron", "resistivity")
+
+
+class TrackFigure:
+    """
+    One figure per screen with one axis per track and a shared depth axis.
+    Tracks are addressed by name ("depth", "gamma_ray", ...) and laid out
+    left to right with the given width ratios.
+    """
+
+    @traced("figure.layout")
+    def __init__(self, tracks, fig_height_inches):
+        names = [name for name, _ in tracks]
+        ratios = [ratio for _, ratio in tracks]
+        fig_width_inches = sum(
+            DEPTH_TRACK_WIDTH_INCHES if name == "depth" else DATA_TRACK_WIDTH_INCHES
+            for name in names
+        )
+
+        # A bare Figure rather than pyplot: it is built on the render worker
+        fig = Figure(figsize=(fig_width_inches, fig_height_inches))
+        axes = fig.subplots(
+            1, len(names), sharey=True,
+            gridspec_kw={
+                "width_ratios": ratios,
+                "wspace": 0.3,
+                "top": 1 - TOP_MARGIN_INCHES / fig_height_inches,
+                "bottom": BOTTOM_MARGIN_INCHES / fig_height_inches,
+            },
+            squeeze=False,
+        )
+
+        self.figure = fig
+        self.names = names
+        self.axes = dict(zip(names, axes[0]))
+        self.depth_window = None
+        # (axes, content key) of the base tracks, once share_base_tracks is called
+        self.shared_tracks = []
+
+        # Envelope decimation is sized to the figure's pixel height
+        self.lod_rows = int(fig_height_inches * fig.dpi)
+
+    def __getitem__(self, name):
+        return self.axes[name]
+
+    def twin_of(self, ax):
+        """The twin axis drawn on top of ax (e.g. Neutron over Density), if any"""
+        for other in self.figure.axes:
+            if other is not ax and other not in self.axes.values() \
+                    and other.get_position().bounds == ax.get_position().bounds:
+                return other
+        return None
+
+    def finish(self, depth_min, depth_max):
+        """Apply the shared depth range and keep depth labels on the first track only"""
+        first = self.axes[self.names[0]]
+        first.set_ylim(depth_max, depth_min)
+        self.depth_window = (float(depth_min), float(depth_max))
+        for name in self.names[1:]:
+            ax = self.axes[name]
+            ax.set_ylabel("")
+            ax.tick_params(axis='y', which='both', labelleft=False, labelright=False)
+
+    def share_base_tracks(self, *, dataset_key, style, cut_off=None, intervals=None,
+                          low_gr_fill=False):
+        """
+        Offer the base tracks to FigureTiler's track cache (call after finish).
+        The arguments name everything the base tracks were drawn from;
+        screens passing the same values, with the tracks at the same pixel
+        geometry, share their rendered tiles.
+        """
+        content = (dataset_key, style, cut_off, intervals_key(intervals), low_gr_fill)
+        shared = []
+        for name in self.names:
+            if name not in BASE_TRACKS:
+                continue
+            ax = self.axes[name]
+            twin = self.twin_of(ax)
+            axes = [ax] if twin is None else [ax, twin]
+            shared.append((axes, (name, self.depth_window) + content))
+        self.shared_tracks = shared
+
+    def data_tracks(self):
+        """(axis, twin axis or None) for every track except the depth track"""
+        return [(self.axes[name], self.twin_of(self.axes[name]))
+                for name in self.names if name != "depth"]
+
+    def all_axes(self):
+        return list(self.axes.values())
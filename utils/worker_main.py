@@ -0,0 +1,7 @@
+# utils/worker_main.py - Main module of spawned worker processes
+"""
+Worker processes started with spawn or forkserver first re-run the
+parent's main module. main.py points them here instead, so the batch CLI
+and parallel PDF export workers never import Kivy or build the app; the
+functions they run are imported from their own modules.
+"""